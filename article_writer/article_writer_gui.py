@@ -4,20 +4,28 @@ OpenAI GPT-4o를 활용 (이미지, PDF 등 다양한 파일 지원)
 """
 
 import os
+import sys
 import base64
 import customtkinter as ctk
 from tkinter import filedialog, messagebox, Frame
-from openai import OpenAI
 from dotenv import load_dotenv
 from datetime import datetime
 import threading
 import mimetypes
 
+# 저장소 루트의 공용 모듈(openai_common) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openai_common import UsageTracker, get_client
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# OpenAI 클라이언트 초기화 (연결 풀 공유, 일시적인 오류는 백오프 재시도)
+client = get_client(os.getenv("OPENAI_API_KEY"))
+
+# 토큰 예산 확인 및 사용량/비용/지연 시간 기록
+# (환경 변수 OPENAI_RUN_TOKEN_BUDGET, OPENAI_CALL_TOKEN_BUDGET으로 예산 지정)
+usage_tracker = UsageTracker.from_env()
 
 # 테마 설정
 ctk.set_appearance_mode("dark")
@@ -456,7 +464,9 @@ class ArticleWriterApp(ctk.CTk):
             result = self._call_api(keyword, user_additional)
             self.after(0, lambda: self._on_generation_complete(result))
         except Exception as e:
-            self.after(0, lambda: self._on_generation_error(str(e)))
+            # except 블록이 끝나면 e가 삭제되므로 메시지를 먼저 저장
+            error = str(e)
+            self.after(0, lambda: self._on_generation_error(error))
     
     def _call_api(self, keyword: str, user_additional: str) -> str:
         """OpenAI API 호출"""
@@ -578,14 +588,17 @@ class ArticleWriterApp(ctk.CTk):
         model = self.model_var.get()
         
         # GPT-5 계열은 max_completion_tokens 사용, 그 외는 max_tokens
+        # (요청 전에 토큰 예산을 확인하고, 넘으면 TokenBudgetExceeded 발생)
         if model.startswith("gpt-5"):
-            response = client.chat.completions.create(
+            response = usage_tracker.create_chat_completion(
+                client, "article",
                 model=model,
                 messages=messages,
                 max_completion_tokens=16000
             )
         else:
-            response = client.chat.completions.create(
+            response = usage_tracker.create_chat_completion(
+                client, "article",
                 model=model,
                 messages=messages,
                 max_tokens=4000
@@ -600,7 +613,14 @@ class ArticleWriterApp(ctk.CTk):
         """생성 완료 처리"""
         self.progress_bar.stop()
         self.progress_bar.set(1)
-        self.progress_label.configure(text="✅ 생성 완료!")
+        
+        # 이번 실행의 누적 토큰/비용/응답 시간 표시
+        usage = usage_tracker.summary()['total']
+        cost = f", 약 ${usage['cost_usd']:.4f}" if usage['cost_usd'] is not None else ""
+        self.progress_label.configure(
+            text=f"✅ 생성 완료! (누적 {usage['calls']}회 호출, 입력 {usage['prompt_tokens']:,} / "
+                 f"출력 {usage['completion_tokens']:,}토큰{cost}, 평균 {usage['avg_latency']:.1f}초)"
+        )
         
         self.result_textbox.delete("1.0", "end")
         self.result_textbox.insert("1.0", result)
@@ -1,14 +1,49 @@
+import argparse
+import os
 import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from gold_store import DEFAULT_STORE_PATH, GoldPriceStore, parse_date_arg
 
-def analyze_gold_prices(excel_file):
+def range_label(start_date=None, end_date=None):
+    """조회 기간을 파일명에 쓸 문자열로 만듭니다 (예: '20250101-20251129', '전체-20251129')."""
+    start = start_date.strftime('%Y%m%d') if start_date else '전체'
+    end = end_date.strftime('%Y%m%d') if end_date else '최신'
+    return f"{start}-{end}"
+
+def analyze_gold_prices(excel_file=None, store_path=None, start_date=None, end_date=None):
     """
-    엑셀 파일의 금 시세 데이터를 분석하고 통계값을 계산하여 엑셀에 기록합니다.
+    금 시세 데이터를 분석하고 통계값을 계산하여 엑셀에 기록합니다.
+    
+    Args:
+        excel_file: 분석할 금시세 엑셀 파일 (store_path가 없을 때 사용)
+        store_path: 금 시세 저장소 파일 (지정하면 저장소에서 기간을 조회해 분석)
+        start_date: 조회 시작 날짜 (date, 저장소 사용 시)
+        end_date: 조회 끝 날짜 (date, 저장소 사용 시)
+        
+    Returns:
+        통계값이 추가된 엑셀 파일명 (조회된 데이터가 없으면 None)
     """
-    # 엑셀 파일 읽기
-    print(f"엑셀 파일 읽는 중: {excel_file}")
-    df = pd.read_excel(excel_file)
+    if store_path:
+        # 저장소에서 기간만 조회해 원본 데이터 시트로 쓰고, 그 아래에 통계를 추가
+        print(f"저장소 조회 중: {store_path} ({start_date or '처음'} ~ {end_date or '최신'})")
+        store = GoldPriceStore(store_path)
+        try:
+            df = store.query(start_date, end_date)
+        finally:
+            store.close()
+        if df.empty:
+            print("조회된 데이터가 없습니다.")
+            return None
+        output_file = f"금시세_{range_label(start_date, end_date)}_통계분석.xlsx"
+        df.to_excel(output_file, index=False, engine='openpyxl')
+        workbook_file = output_file
+    else:
+        # 엑셀 파일 읽기
+        print(f"엑셀 파일 읽는 중: {excel_file}")
+        df = pd.read_excel(excel_file)
+        workbook_file = excel_file
+        output_file = excel_file.replace('.xlsx', '_통계분석.xlsx')
     
     print(f"\n데이터 정보:")
     print(f"총 행 수: {len(df)}")
@@ -52,7 +87,7 @@ def analyze_gold_prices(excel_file):
     print(f"\n엑셀 파일에 통계값 기록 중...")
     
     # openpyxl로 워크북 열기
-    wb = load_workbook(excel_file)
+    wb = load_workbook(workbook_file)
     ws = wb.active
     
     # 스타일 설정
@@ -151,7 +186,6 @@ def analyze_gold_prices(excel_file):
             ws.cell(row=analysis_row, column=3, value=f"({price_change:,.0f}원)")
     
     # 파일 저장
-    output_file = excel_file.replace('.xlsx', '_통계분석.xlsx')
     wb.save(output_file)
     
     print(f"\n통계값이 추가된 파일이 저장되었습니다: {output_file}")
@@ -160,8 +194,30 @@ def analyze_gold_prices(excel_file):
     
     return output_file
 
-if __name__ == "__main__":
-    # 가장 최근 파일 사용
+def main():
+    parser = argparse.ArgumentParser(description="금 시세 통계를 계산해 엑셀로 저장합니다.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help=f"금 시세 저장소 파일 (기본값: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--start-date", help="분석 시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="분석 끝 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--excel", help="저장소 대신 분석할 금시세 엑셀 파일")
+    args = parser.parse_args()
+    
+    try:
+        start_date = parse_date_arg(args.start_date)
+        end_date = parse_date_arg(args.end_date)
+    except ValueError:
+        print("날짜는 YYYY-MM-DD 형식으로 입력해주세요.")
+        return
+    
+    if args.excel:
+        analyze_gold_prices(args.excel)
+        return
+    if os.path.exists(args.store):
+        analyze_gold_prices(store_path=args.store, start_date=start_date, end_date=end_date)
+        return
+    
+    # 저장소가 없으면 가장 최근 엑셀 파일 사용
     import glob
     files = glob.glob("금시세_*.xlsx")
     if files:
@@ -175,3 +231,6 @@ if __name__ == "__main__":
     else:
         print("엑셀 파일을 찾을 수 없습니다.")
 
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,220 @@
+"""
+금 시세 기록 저장소
+스크래핑한 금 시세를 SQLite 파일 하나에 (고시날짜, 살 때 순금 가격) 키로 누적 저장합니다.
+스크래퍼는 새 행만 추가(같은 키는 갱신)하고, 분석/시각화는 날짜 범위로 바로 조회합니다.
+
+기존 엑셀 결과를 가져오려면:
+
+    python gold_store.py 금시세_20251129_233831.xlsx 금시세_20251130_101500.xlsx
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from datetime import date, datetime
+
+import pandas as pd
+
+DEFAULT_STORE_PATH = "gold_prices.sqlite3"
+
+DATE_COLUMN = '고시날짜'
+PRICE_COLUMNS = {
+    'buy_pure': '내가 살 때(3.75g) - 순금',
+    'sell_pure': '내가 팔 때(3.75g) - 순금',
+    'sell_18k': '내가 팔 때(3.75g) - 18K',
+    'sell_14k': '내가 팔 때(3.75g) - 14K',
+}
+
+
+def _to_price(value):
+    """'874,000', 874000, 874000.0 등을 정수 가격으로 변환합니다 (숫자가 없으면 None)."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    digits = re.sub(r'[^\d]', '', str(value))
+    return int(digits) if digits else None
+
+
+def _to_iso_date(value):
+    """고시날짜('2025.11.29', date, Timestamp)를 'YYYY-MM-DD' 문자열로 변환합니다 (형식이 다르면 None)."""
+    if isinstance(value, (date, datetime, pd.Timestamp)):
+        return value.strftime('%Y-%m-%d')
+    try:
+        return datetime.strptime(str(value).strip()[:10], '%Y.%m.%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+class GoldPriceStore:
+    """SQLite 기반 금 시세 기록 저장소"""
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        """
+        Args:
+            db_path: 저장소 SQLite 파일 경로
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS gold_prices (
+                   notice_date TEXT NOT NULL,
+                   buy_pure INTEGER NOT NULL,
+                   sell_pure INTEGER,
+                   sell_18k INTEGER,
+                   sell_14k INTEGER,
+                   first_seen REAL NOT NULL,
+                   updated_at REAL NOT NULL,
+                   PRIMARY KEY (notice_date, buy_pure)
+               )"""
+        )
+        self._conn.commit()
+
+    def count(self):
+        """저장된 행 수를 반환합니다."""
+        return self._conn.execute("SELECT COUNT(*) FROM gold_prices").fetchone()[0]
+
+    def max_date(self):
+        """
+        저장된 가장 최근 고시날짜를 반환합니다.
+
+        Returns:
+            date (저장된 행이 없으면 None)
+        """
+        value = self._conn.execute("SELECT MAX(notice_date) FROM gold_prices").fetchone()[0]
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+    def keys(self, since=None):
+        """
+        저장된 행의 중복 판단 키를 반환합니다 (스크래퍼의 record_key와 같은 형식).
+
+        Args:
+            since: 이 날짜(date) 이후의 행만 (None이면 전체)
+
+        Returns:
+            {('YYYY.MM.DD', '가격 숫자'), ...} 집합
+        """
+        sql = "SELECT notice_date, buy_pure FROM gold_prices"
+        params = ()
+        if since is not None:
+            sql += " WHERE notice_date >= ?"
+            params = (since.strftime('%Y-%m-%d'),)
+        return {(notice_date.replace('-', '.'), str(buy_pure))
+                for notice_date, buy_pure in self._conn.execute(sql, params)}
+
+    def upsert(self, records):
+        """
+        금 시세 행을 저장합니다. 같은 (고시날짜, 살 때 순금 가격) 행이 있으면 나머지 가격을 갱신합니다.
+
+        Args:
+            records: 스크래퍼가 만든 딕셔너리 리스트 (고시날짜와 가격 열 이름 사용)
+
+        Returns:
+            새로 추가된 행 수
+        """
+        now = time.time()
+        rows = []
+        for record in records:
+            notice_date = _to_iso_date(record.get(DATE_COLUMN))
+            prices = {key: _to_price(record.get(column)) for key, column in PRICE_COLUMNS.items()}
+            if notice_date is None or prices['buy_pure'] is None:
+                continue
+            rows.append((notice_date, prices['buy_pure'], prices['sell_pure'],
+                         prices['sell_18k'], prices['sell_14k'], now, now))
+
+        before = self.count()
+        with self._conn:
+            self._conn.executemany(
+                """INSERT INTO gold_prices
+                       (notice_date, buy_pure, sell_pure, sell_18k, sell_14k, first_seen, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (notice_date, buy_pure) DO UPDATE SET
+                       sell_pure = excluded.sell_pure,
+                       sell_18k = excluded.sell_18k,
+                       sell_14k = excluded.sell_14k,
+                       updated_at = excluded.updated_at""",
+                rows
+            )
+        return self.count() - before
+
+    def query(self, start_date=None, end_date=None):
+        """
+        날짜 범위의 금 시세를 엑셀 결과와 같은 열 구성의 데이터프레임으로 조회합니다.
+
+        Args:
+            start_date: 시작 날짜 (date, 포함, None이면 처음부터)
+            end_date: 끝 날짜 (date, 포함, None이면 마지막까지)
+
+        Returns:
+            최신 날짜부터 정렬된 데이터프레임 (고시날짜는 'YYYY.MM.DD' 문자열, 가격은 정수)
+        """
+        conditions, params = [], []
+        if start_date is not None:
+            conditions.append("notice_date >= ?")
+            params.append(start_date.strftime('%Y-%m-%d'))
+        if end_date is not None:
+            conditions.append("notice_date <= ?")
+            params.append(end_date.strftime('%Y-%m-%d'))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        # 같은 날짜 안에서는 사이트에 표시된 순서(저장된 순서)를 유지
+        df = pd.read_sql_query(
+            f"""SELECT notice_date, buy_pure, sell_pure, sell_18k, sell_14k FROM gold_prices
+                {where} ORDER BY notice_date DESC, rowid ASC""",
+            self._conn, params=params
+        )
+        df['notice_date'] = df['notice_date'].str.replace('-', '.')
+        return df.rename(columns={'notice_date': DATE_COLUMN, **PRICE_COLUMNS})
+
+    def import_excel(self, excel_file):
+        """
+        이전에 저장한 금시세 엑셀 파일을 저장소로 가져옵니다.
+
+        Args:
+            excel_file: 금시세 엑셀 파일 경로
+
+        Returns:
+            새로 추가된 행 수
+        """
+        df = pd.read_excel(excel_file)
+        columns = [DATE_COLUMN, *PRICE_COLUMNS.values()]
+        if not set(columns) <= set(df.columns):
+            print(f"금시세 열이 없는 파일입니다: {excel_file}")
+            return 0
+        return self.upsert(df[columns].to_dict('records'))
+
+    def close(self):
+        """데이터베이스 연결을 닫습니다."""
+        self._conn.close()
+
+
+def parse_date_arg(text):
+    """명령행의 'YYYY-MM-DD' 날짜를 date로 변환합니다 (None이면 None)."""
+    return datetime.strptime(text, '%Y-%m-%d').date() if text else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="금시세 엑셀 파일을 저장소로 가져옵니다.")
+    parser.add_argument("files", nargs="+", help="가져올 금시세 엑셀 파일")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help=f"저장소 파일 경로 (기본값: {DEFAULT_STORE_PATH})")
+    args = parser.parse_args()
+
+    store = GoldPriceStore(args.store)
+    try:
+        for excel_file in args.files:
+            added = store.import_excel(excel_file)
+            print(f"{excel_file}: {added}개 추가")
+        print(f"저장소 {args.store}: 총 {store.count()}개 ({store.max_date()}까지)")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,249 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 import pandas as pd
+import argparse
+import os
+import re
+import sys
 from datetime import datetime
-import time
+from gold_store import DEFAULT_STORE_PATH, GoldPriceStore
+from table_extract import extract_table
+from waits import (PageWaiter, all_of, any_of, attribute_changed, element_attribute, first_row_changed,
+                   first_row_text, network_idle, rows_present)
 
-def scrape_gold_prices():
+# Tabulator 테이블 행 / 현재 페이지 버튼 선택자
+ROW_SELECTOR = "#example-table .tabulator-row"
+ACTIVE_PAGE_SELECTOR = "#example-table .tabulator-page.active"
+
+# 처음 수집하거나 엑셀로만 저장할 때의 기본 최대 수집 개수
+DEFAULT_MAX_DATA = 100
+
+DATE_COLUMN = '고시날짜'
+BUY_PURE_COLUMN = '내가 살 때(3.75g) - 순금'
+
+def parse_gold_row(cells):
+    """
+    Tabulator 행 하나의 셀 텍스트를 금 시세 데이터로 변환합니다.
+    
+    Args:
+        cells: 셀 텍스트 리스트 (고시날짜, 살 때 순금, 팔 때 순금, 팔 때 18K, 팔 때 14K 순서)
+        
+    Returns:
+        금 시세 딕셔너리 (셀이 부족하면 None)
+    """
+    if len(cells) < 5:
+        return None
+    
+    return {
+        '고시날짜': cells[0],
+        '내가 살 때(3.75g) - 순금': cells[1],
+        '내가 팔 때(3.75g) - 순금': cells[2],
+        '내가 팔 때(3.75g) - 18K': cells[3],
+        '내가 팔 때(3.75g) - 14K': cells[4]
+    }
+
+def parse_gold_date(text):
+    """고시날짜 문자열('2025.11.29')을 date로 변환합니다 (형식이 다르면 None)."""
+    try:
+        return datetime.strptime(str(text).strip()[:10], '%Y.%m.%d').date()
+    except ValueError:
+        return None
+
+def record_key(date_text, buy_price):
+    """
+    중복 판단 키 (고시날짜, 살 때 순금 가격)를 만듭니다.
+    가격은 숫자만 남겨 '874,000'과 874000(엑셀에서 읽은 값)을 같은 값으로 봅니다.
+    """
+    return str(date_text).strip(), re.sub(r'[^\d]', '', str(buy_price))
+
+def load_existing_keys(excel_file):
+    """
+    이전에 저장한 금시세 엑셀 파일을 읽어 중복 판단 키와 데이터를 가져옵니다.
+    
+    Args:
+        excel_file: 이전 스크래핑 결과 엑셀 파일 경로
+        
+    Returns:
+        (키 집합, 데이터프레임) 튜플 (파일이 없거나 읽을 수 없으면 빈 집합과 None)
     """
-    한국금거래소 웹사이트에서 금 시세 데이터를 스크래핑하여 엑셀 파일로 저장합니다.
+    if not excel_file or not os.path.exists(excel_file):
+        return set(), None
+    try:
+        df = pd.read_excel(excel_file)
+    except Exception as e:
+        print(f"기존 파일을 읽을 수 없습니다: {e}")
+        return set(), None
+    keys = {record_key(date, price) for date, price in zip(df[DATE_COLUMN], df[BUY_PURE_COLUMN])}
+    return keys, df
+
+def collect_page_rows(rows, df_data, seen_keys, known_keys=frozenset(), max_data=None,
+                      start_date=None, end_date=None, stop_at_known=True):
+    """
+    한 페이지의 행을 중복 없이 df_data에 추가하고, 페이지 이동을 멈출지 알려 줍니다.
+    사이트의 행은 최신 날짜부터 나오므로 start_date보다 오래된 행이나
+    이미 저장된 행(stop_at_known일 때)이 나오면 그 뒤는 볼 필요가 없습니다.
+    
+    Args:
+        rows: 셀 텍스트 리스트의 리스트
+        df_data: 수집한 데이터 리스트 (새 행을 추가함)
+        seen_keys: 이번 실행에서 수집한 키 집합 (새 키를 추가함)
+        known_keys: 이미 저장된 키 집합
+        max_data: 최대 수집 개수 (None이면 제한 없음)
+        start_date: 수집할 가장 오래된 날짜 (date, None이면 제한 없음)
+        end_date: 수집할 가장 최근 날짜 (date, None이면 제한 없음)
+        stop_at_known: 이미 저장된 행이 나오면 멈출지 여부 (과거 구간을 채울 때는 False)
+        
+    Returns:
+        멈출 이유 문자열 (계속 진행하면 None)
+    """
+    for cells in rows:
+        if max_data is not None and len(df_data) >= max_data:
+            return f"최대 {max_data}개를 수집했습니다."
+        
+        try:
+            record = parse_gold_row(cells)
+            if record is None:
+                continue
+            
+            day = parse_gold_date(record[DATE_COLUMN])
+            if end_date and day and day > end_date:
+                continue
+            if start_date and day and day < start_date:
+                return f"{start_date} 이전 날짜에 도달했습니다."
+            
+            # 중복 체크 (같은 날짜와 가격이면 스킵)
+            key = record_key(record[DATE_COLUMN], record[BUY_PURE_COLUMN])
+            if key in known_keys:
+                if stop_at_known:
+                    return f"이미 저장된 데이터({key[0]})에 도달했습니다."
+                continue
+            if key in seen_keys:
+                continue
+            
+            seen_keys.add(key)
+            df_data.append(record)
+        except Exception as e:
+            print(f"행 처리 중 오류: {e}")
+            continue
+    return None
+
+class IncompleteCollectionError(Exception):
+    """증분 수집이 저장소의 마지막 날짜에 도달하기 전에 최대 개수에서 끊긴 경우 발생하는 예외"""
+
+def iter_table_pages(driver, waiter, bulk_extract=True):
+    """
+    Tabulator 테이블을 한 페이지씩 넘기며 행을 돌려줍니다 (다 읽으면 반복을 멈추면 됨).
+    
+    Args:
+        driver: Selenium WebDriver (테이블이 로드된 상태)
+        waiter: 페이지 이동을 기다릴 PageWaiter
+        bulk_extract: True이면 execute_script 한 번으로 테이블 전체를 가져옴
+        
+    Yields:
+        셀 텍스트 리스트의 리스트 (한 페이지)
     """
+    page = 1
+    while True:
+        # 현재 페이지의 행 가져오기 (셀 텍스트 리스트)
+        rows, elapsed = extract_table(driver, ROW_SELECTOR, ".tabulator-cell", bulk=bulk_extract)
+        
+        if not rows:
+            print(f"페이지 {page}에서 데이터를 찾을 수 없습니다.")
+            return
+        
+        print(f"페이지 {page}: {len(rows)}개의 행을 찾았습니다. ({elapsed * 1000:.0f}ms)")
+        yield rows
+        
+        # 다음 페이지로 이동
+        try:
+            # 다음 페이지 버튼 찾기
+            next_button = driver.find_element(By.CSS_SELECTOR, "button.tabulator-page[data-page='next']:not([disabled])")
+            if not next_button.is_enabled():
+                print("더 이상 페이지가 없습니다.")
+                return
+            # 현재 페이지 번호가 바뀌고 첫 행이 새 데이터로 바뀌면 로딩 완료
+            # (첫 행이 같을 수 있으므로 요청이 멈춘 경우도 완료로 봄)
+            previous_page = element_attribute(driver, ACTIVE_PAGE_SELECTOR, "data-page")
+            previous_first_row = first_row_text(driver, ROW_SELECTOR)
+            next_button.click()
+            if not waiter.wait('next_page', all_of(
+                    attribute_changed(ACTIVE_PAGE_SELECTOR, "data-page", previous_page),
+                    any_of(first_row_changed(ROW_SELECTOR, previous_first_row), network_idle(0.5))
+            ), "다음 페이지 로드"):
+                print("다음 페이지 데이터가 로드되지 않았습니다.")
+                return
+            page += 1
+        except Exception as e:
+            print(f"다음 페이지로 이동할 수 없습니다: {e}")
+            return
+
+def collect_rows(pages, known_keys=frozenset(), max_data=None, start_date=None, end_date=None,
+                 stop_at_known=True):
+    """
+    페이지별 행을 중복 없이 모읍니다.
+    
+    Args:
+        pages: 페이지별 셀 텍스트 리스트의 리스트를 돌려주는 반복자 (iter_table_pages)
+        known_keys, max_data, start_date, end_date, stop_at_known: collect_page_rows와 같음
+        
+    Returns:
+        (수집한 데이터 리스트, 끝까지 확인했는지 여부) 튜플
+        start_date나 저장된 행, 마지막 페이지에 도달하면 True, max_data에서 끊기면 False
+    """
+    df_data = []
+    seen_keys = set()
+    for rows in pages:
+        stop_reason = collect_page_rows(rows, df_data, seen_keys, known_keys, max_data,
+                                        start_date, end_date, stop_at_known)
+        # 날짜 범위/저장된 행으로 멈추는 경우는 최대 개수에 닿기 전이므로 개수로 구분
+        if max_data is not None and len(df_data) >= max_data:
+            print(f"최대 {max_data}개를 수집했습니다.")
+            return df_data, False
+        if stop_reason:
+            print(stop_reason)
+            return df_data, True
+    return df_data, True
+
+def scrape_gold_prices(bulk_extract=True, max_data=DEFAULT_MAX_DATA, start_date=None, end_date=None, existing_file=None,
+                       store=None, save_excel=True):
+    """
+    한국금거래소 웹사이트에서 금 시세 데이터를 스크래핑하여 저장소와 엑셀 파일에 저장합니다.
+    
+    Args:
+        bulk_extract: True이면 페이지마다 execute_script 한 번으로 테이블 전체를 가져옴
+            (False이면 셀마다 WebDriver 요청을 보내는 기존 방식)
+        max_data: 최대 수집 개수 (None이면 날짜 범위나 마지막 페이지까지)
+            저장소에 이어서 수집할 때 이 개수에서 끊기면 IncompleteCollectionError
+        start_date: 수집할 가장 오래된 날짜 (date, 과거 구간을 채울 때 사용)
+        end_date: 수집할 가장 최근 날짜 (date)
+        existing_file: 이전 결과 엑셀 파일 (이미 저장된 행은 건너뛰고 결과에 합쳐서 저장,
+            start_date가 없으면 저장된 행에 도달할 때 페이지 이동을 멈춤)
+        store: 금 시세 저장소 (GoldPriceStore, None이면 사용 안 함)
+            start_date가 없으면 저장된 가장 최근 날짜 이후의 새 행만 수집해 추가
+        save_excel: 수집 결과를 타임스탬프 엑셀 파일로도 저장할지 여부
+        
+    Returns:
+        저장한 엑셀 파일명 (엑셀을 저장하지 않으면 저장소 경로, 수집한 데이터가 없으면 None)
+        
+    Raises:
+        IncompleteCollectionError: 저장소의 마지막 날짜에 도달하기 전에 max_data에서 끊긴 경우 (저장하지 않음)
+    """
+    known_keys, existing_df = load_existing_keys(existing_file)
+    if existing_df is not None:
+        print(f"기존 데이터 {len(existing_df)}개를 불러왔습니다: {existing_file}")
+    
+    # 저장소가 있으면 증분 수집: 저장된 마지막 날짜보다 오래된 행에 도달하면 멈춤
+    # (과거 구간을 채울 때는 그 구간의 저장된 키만 건너뜀)
+    collect_start = start_date
+    if store is not None:
+        if start_date is None:
+            collect_start = store.max_date()
+            if collect_start:
+                print(f"저장소 {store.db_path}: {collect_start} 이후의 새 데이터만 수집합니다.")
+        known_keys |= store.keys(since=collect_start)
+    
     url = "https://www.koreagoldx.co.kr/price/gold"
     
     # Chrome 옵션 설정
@@ -23,92 +255,52 @@ def scrape_gold_prices():
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
     
     driver = None
+    waiter = None
     try:
         print("브라우저를 시작하는 중...")
         driver = webdriver.Chrome(options=chrome_options)
+        waiter = PageWaiter(driver)
         
         print(f"페이지 로딩 중: {url}")
         driver.get(url)
         
-        # 테이블이 로드될 때까지 대기
+        # Tabulator 테이블에 데이터 행이 그려지고 요청이 멈출 때까지 대기
         print("테이블 데이터 로딩 대기 중...")
-        wait = WebDriverWait(driver, 20)
+        waiter.wait('table', all_of(rows_present(ROW_SELECTOR), network_idle(0.3)), "테이블 로드")
         
-        # Tabulator 테이블이 로드될 때까지 대기
-        wait.until(EC.presence_of_element_located((By.ID, "example-table")))
-        time.sleep(3)  # 추가 대기 시간 (데이터 로딩 완료를 위해)
-        
-        # 데이터 추출 (여러 페이지에서 수집)
+        # 데이터 추출 (여러 페이지에서 수집, 날짜 범위 밖이나 저장된 행에 도달하면 중단)
         print("데이터 추출 중...")
-        df_data = []
-        max_data = 100
-        page = 1
+        df_data, complete = collect_rows(iter_table_pages(driver, waiter, bulk_extract), known_keys, max_data,
+                                         collect_start, end_date, stop_at_known=start_date is None)
         
-        while len(df_data) < max_data:
-            # 현재 페이지의 행 가져오기
-            rows = driver.find_elements(By.CSS_SELECTOR, "#example-table .tabulator-row")
-            
-            if not rows:
-                print(f"페이지 {page}에서 데이터를 찾을 수 없습니다.")
-                break
-            
-            print(f"페이지 {page}: {len(rows)}개의 행을 찾았습니다.")
-            
-            # 현재 페이지의 데이터 추출
-            for i, row in enumerate(rows):
-                if len(df_data) >= max_data:
-                    break
-                    
-                try:
-                    cells = row.find_elements(By.CSS_SELECTOR, ".tabulator-cell")
-                    if len(cells) >= 5:
-                        date = cells[0].text.strip()
-                        s_pure = cells[1].text.strip()  # 내가 살 때 - 순금
-                        p_pure = cells[2].text.strip()  # 내가 팔 때 - 순금
-                        p_18k = cells[3].text.strip()   # 내가 팔 때 - 18K
-                        p_14k = cells[4].text.strip()   # 내가 팔 때 - 14K
-                        
-                        # 중복 체크 (같은 날짜와 가격이면 스킵)
-                        is_duplicate = False
-                        for existing in df_data:
-                            if existing['고시날짜'] == date and existing['내가 살 때(3.75g) - 순금'] == s_pure:
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            df_data.append({
-                                '고시날짜': date,
-                                '내가 살 때(3.75g) - 순금': s_pure,
-                                '내가 팔 때(3.75g) - 순금': p_pure,
-                                '내가 팔 때(3.75g) - 18K': p_18k,
-                                '내가 팔 때(3.75g) - 14K': p_14k
-                            })
-                except Exception as e:
-                    print(f"행 처리 중 오류: {e}")
-                    continue
-            
-            # 다음 페이지로 이동
-            if len(df_data) < max_data:
-                try:
-                    # 다음 페이지 버튼 찾기
-                    next_button = driver.find_element(By.CSS_SELECTOR, "button.tabulator-page[data-page='next']:not([disabled])")
-                    if next_button.is_enabled():
-                        next_button.click()
-                        time.sleep(2)  # 페이지 로딩 대기
-                        page += 1
-                    else:
-                        print("더 이상 페이지가 없습니다.")
-                        break
-                except Exception as e:
-                    print(f"다음 페이지로 이동할 수 없습니다: {e}")
-                    break
+        # 증분 수집이 최대 개수에서 끊기면 저장된 마지막 날짜까지의 행이 빠진 채로 max_date가 앞당겨져
+        # 다음 실행에서도 그 구간을 다시 가져오지 않으므로 저장하지 않음
+        if store is not None and start_date is None and collect_start is not None and not complete:
+            raise IncompleteCollectionError(
+                f"최대 {max_data}개에서 멈춰 저장소의 마지막 날짜({collect_start})까지 도달하지 못했습니다. "
+                f"중간 데이터가 빠지지 않도록 저장하지 않습니다. --max-data 0으로 다시 실행하세요."
+            )
         
         if not df_data:
             print("추출된 데이터가 없습니다.")
-            return
+            return None
         
-        # 데이터프레임 생성
+        # 데이터프레임 생성 (기존 데이터가 있으면 합쳐서 최신 날짜 순으로 정렬)
         df = pd.DataFrame(df_data)
+        print(f"새 데이터 {len(df)}개를 수집했습니다.")
+        
+        if store is not None:
+            added = store.upsert(df_data)
+            print(f"저장소에 {added}개를 추가했습니다: {store.db_path} (총 {store.count()}개)")
+            if not save_excel:
+                print(f"\n저장된 데이터 미리보기:")
+                print(df.head(10))
+                return store.db_path
+        
+        if existing_df is not None:
+            df = pd.concat([df, existing_df[df.columns.intersection(existing_df.columns)]], ignore_index=True)
+            order = pd.to_datetime(df[DATE_COLUMN].astype(str), format='%Y.%m.%d', errors='coerce')
+            df = df.loc[order.sort_values(ascending=False, kind='stable').index].reset_index(drop=True)
         
         # 엑셀 파일로 저장
         filename = f"금시세_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
@@ -118,16 +310,64 @@ def scrape_gold_prices():
         print(f"총 {len(df)}개의 데이터가 저장되었습니다.")
         print(f"\n저장된 데이터 미리보기:")
         print(df.head(10))
+        return filename
         
+    except IncompleteCollectionError:
+        raise
     except Exception as e:
         print(f"오류 발생: {e}")
         import traceback
         traceback.print_exc()
+        return None
     finally:
         if driver:
             driver.quit()
             print("\n브라우저를 종료했습니다.")
+        if waiter:
+            waiter.report()
+
+def main():
+    parser = argparse.ArgumentParser(description="한국금거래소 금 시세를 수집해 저장소(SQLite)와 엑셀에 저장합니다.")
+    parser.add_argument("--max-data", type=int,
+                        help=f"최대 수집 개수 (0이면 날짜 범위나 마지막 페이지까지, 기본값: 저장소에 이어서 "
+                             f"수집할 때는 제한 없음, 그 밖에는 {DEFAULT_MAX_DATA})")
+    parser.add_argument("--start-date", help="수집할 가장 오래된 날짜 (YYYY-MM-DD, 과거 구간 채우기)")
+    parser.add_argument("--end-date", help="수집할 가장 최근 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--existing", help="이전 결과 엑셀 파일 (저장된 행은 건너뛰고 결과에 합침)")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help=f"금 시세 저장소 파일 (기본값: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--no-store", action="store_true",
+                        help="저장소를 사용하지 않고 엑셀 파일로만 저장")
+    parser.add_argument("--excel", action="store_true",
+                        help="저장소와 함께 타임스탬프 엑셀 파일로도 저장")
+    args = parser.parse_args()
+    
+    try:
+        start_date = datetime.strptime(args.start_date, '%Y-%m-%d').date() if args.start_date else None
+        end_date = datetime.strptime(args.end_date, '%Y-%m-%d').date() if args.end_date else None
+    except ValueError:
+        print("날짜는 YYYY-MM-DD 형식으로 입력해주세요.")
+        return
+    
+    store = None if args.no_store else GoldPriceStore(args.store)
+    try:
+        if args.max_data is not None:
+            max_data = args.max_data or None
+        elif store is not None and start_date is None and store.max_date() is not None:
+            # 저장된 마지막 날짜까지 빠짐없이 채워야 하므로 개수 제한 없이 수집
+            max_data = None
+        else:
+            max_data = DEFAULT_MAX_DATA
+        scrape_gold_prices(max_data=max_data, start_date=start_date, end_date=end_date,
+                           existing_file=args.existing, store=store,
+                           save_excel=store is None or args.excel or bool(args.existing))
+    except IncompleteCollectionError as e:
+        print(f"⚠️ {e}")
+        sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
 
 if __name__ == "__main__":
-    scrape_gold_prices()
+    main()
 
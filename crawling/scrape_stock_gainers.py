@@ -5,13 +5,16 @@ import pandas as pd
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import time
 import re
+import argparse
+from table_extract import extract_table
+from waits import PageWaiter, all_of, first_row_changed, first_row_text, network_idle, rows_present
+from yahoo_http import YahooGainersFetcher
+
+# 상승 종목 테이블 행 선택자
+ROW_SELECTOR = "table tbody tr"
 
 def setup_driver():
     """Chrome 드라이버 설정"""
@@ -23,6 +26,8 @@ def setup_driver():
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     
+    # Selenium 경로에서만 필요하므로 여기서 가져옴 (HTTP 수집은 webdriver-manager 없이 동작)
+    from webdriver_manager.chrome import ChromeDriverManager
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
@@ -82,11 +87,90 @@ def parse_pe(pe_text):
     except:
         return None
 
-def scrape_stock_gainers(target_count=50):
-    """주식 상승 종목 스크래핑"""
+def parse_stock_row(cells):
+    """
+    테이블 행 하나의 셀 텍스트를 종목 데이터로 변환합니다.
+    
+    Args:
+        cells: 셀 텍스트 리스트 (Symbol, 회사명, ..., 52주 범위 순서)
+        
+    Returns:
+        종목 데이터 딕셔너리 (셀이 부족하거나 심볼이 없으면 None)
+    """
+    if len(cells) < 10 or not cells[0]:
+        return None
+    
+    return {
+        'Symbol': cells[0],
+        'Company Name': cells[1],
+        'Price': parse_price_data(cells[3]),       # 현재가 + 변동 셀에서 현재가
+        'Change': parse_change(cells[4]),
+        'Change %': parse_percent(cells[5]),
+        'Volume': parse_volume(cells[6]),
+        'Avg Volume': parse_volume(cells[7]),
+        'Market Cap': parse_market_cap(cells[8]),
+        'P/E Ratio': parse_pe(cells[9]),
+        'YTD Change %': parse_percent(cells[10]) if len(cells) > 10 else None,   # 52주 변동률
+        '52 Week Range': cells[11] if len(cells) > 11 else ""
+    }
+
+def scrape_stock_gainers_http(target_count=50, base_url=None):
+    """
+    브라우저 없이 HTTP로 주식 상승 종목을 수집합니다 (스크리너 JSON, 실패하면 페이지 HTML).
+    
+    Args:
+        target_count: 수집할 종목 수
+        base_url: 요청을 보낼 서버 주소 (None이면 Yahoo Finance, 기록해 둔 응답을 로컬 서버로 제공할 때 사용)
+        
+    Returns:
+        종목 데이터 리스트 (수집하지 못하면 빈 리스트)
+    """
+    print("⚡ HTTP로 주식 상승 종목 수집 중...")
+    
+    fetcher = YahooGainersFetcher(base_url)
+    try:
+        rows, source, elapsed = fetcher.fetch_rows(target_count)
+    finally:
+        fetcher.close()
+    
+    stocks_data = []
+    seen_symbols = set()  # 중복 방지
+    for cells in rows:
+        if len(stocks_data) >= target_count:
+            break
+        stock_info = parse_stock_row(cells)
+        if stock_info is None or stock_info['Symbol'] in seen_symbols:
+            continue
+        seen_symbols.add(stock_info['Symbol'])
+        stocks_data.append(stock_info)
+        print(f"  ✅ {len(stocks_data)}. {stock_info['Symbol']}: {stock_info['Company Name']} - "
+              f"${stock_info['Price']} ({stock_info['Change %']}%)")
+    
+    if stocks_data:
+        print(f"   {source.upper()} 응답에서 {len(stocks_data)}개 수집 ({elapsed:.2f}초)")
+    return stocks_data
+
+def scrape_stock_gainers(target_count=50, bulk_extract=True, use_http=True, http_base_url=None):
+    """
+    주식 상승 종목 스크래핑
+    
+    Args:
+        target_count: 수집할 종목 수
+        bulk_extract: True이면 페이지마다 execute_script 한 번으로 테이블 전체를 가져옴
+            (False이면 셀마다 WebDriver 요청을 보내는 기존 방식)
+        use_http: True이면 먼저 HTTP로 수집하고, 실패했을 때만 Selenium(Chrome)으로 수집
+        http_base_url: HTTP 수집에 사용할 서버 주소 (None이면 Yahoo Finance)
+    """
+    if use_http:
+        stocks_data = scrape_stock_gainers_http(target_count, http_base_url)
+        if stocks_data:
+            return stocks_data
+        print("   HTTP로 수집하지 못해 Selenium으로 다시 시도합니다.\n")
+    
     print("🚀 Yahoo Finance 주식 상승 종목 스크래핑 시작...")
     
     driver = setup_driver()
+    waiter = PageWaiter(driver)
     stocks_data = []
     seen_symbols = set()  # 중복 방지
     
@@ -94,21 +178,19 @@ def scrape_stock_gainers(target_count=50):
         url = "https://finance.yahoo.com/markets/stocks/gainers/"
         driver.get(url)
         
-        # 페이지 로드 대기
-        time.sleep(4)
+        # 페이지 로드 대기 (추가 요청이 멈출 때까지)
+        waiter.wait('page_load', network_idle(), "페이지 로드")
         
         # 쿠키/팝업 닫기 시도
         try:
             consent_btn = driver.find_element(By.CSS_SELECTOR, "button.accept-all, button[name='agree']")
             consent_btn.click()
-            time.sleep(1)
+            waiter.wait('consent', network_idle(), "동의 후 페이지 로드")
         except:
             pass
         
-        # 테이블 로드 대기
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
-        )
+        # 테이블 데이터가 그려질 때까지 대기
+        waiter.wait('table', all_of(rows_present(ROW_SELECTOR), network_idle(0.3)), "테이블 로드")
         
         collected = 0
         page = 1
@@ -117,86 +199,33 @@ def scrape_stock_gainers(target_count=50):
         while collected < target_count and page <= max_pages:
             print(f"\n📄 페이지 {page} 스크래핑 중...")
             
-            # 잠시 대기 (데이터 로드)
-            time.sleep(2)
-            
-            # 테이블 행 찾기
-            rows = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
+            # 테이블 행 가져오기 (셀 텍스트 리스트)
+            rows, elapsed = extract_table(driver, ROW_SELECTOR, "td", bulk=bulk_extract)
             
             if not rows:
                 print("❌ 테이블 행을 찾을 수 없습니다.")
                 break
             
+            print(f"   {len(rows)}개 행 추출 ({elapsed * 1000:.0f}ms)")
+            
             page_items = 0
-            for row in rows:
+            for cells in rows:
                 if collected >= target_count:
                     break
                     
                 try:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    if len(cells) < 10:
-                        continue
+                    stock_info = parse_stock_row(cells)
                     
-                    # 각 셀에서 데이터 추출
-                    symbol = cells[0].text.strip()
-                    
-                    # 중복 확인
-                    if symbol in seen_symbols:
+                    # 유효한 데이터만, 중복 없이 추가
+                    if stock_info is None or stock_info['Symbol'] in seen_symbols:
                         continue
                     
-                    company_name = cells[1].text.strip()
-                    
-                    # 가격 정보 (현재가 + 변동)
-                    price_cell = cells[3].text.strip()
-                    current_price = parse_price_data(price_cell)
-                    
-                    # 변동값
-                    change = parse_change(cells[4].text.strip())
-                    
-                    # 변동률
-                    change_pct = parse_percent(cells[5].text.strip())
-                    
-                    # 거래량
-                    volume = parse_volume(cells[6].text.strip())
-                    
-                    # 평균 거래량
-                    avg_volume = parse_volume(cells[7].text.strip())
-                    
-                    # 시가총액
-                    market_cap = parse_market_cap(cells[8].text.strip())
-                    
-                    # P/E 비율
-                    pe_ratio = parse_pe(cells[9].text.strip())
-                    
-                    # 52주 변동률
-                    ytd_change = None
-                    if len(cells) > 10:
-                        ytd_change = parse_percent(cells[10].text.strip())
-                    
-                    # 52주 범위
-                    week52_range = ""
-                    if len(cells) > 11:
-                        week52_range = cells[11].text.strip()
-                    
-                    if symbol:  # 유효한 데이터만 추가
-                        seen_symbols.add(symbol)
-                        stock_info = {
-                            'Symbol': symbol,
-                            'Company Name': company_name,
-                            'Price': current_price,
-                            'Change': change,
-                            'Change %': change_pct,
-                            'Volume': volume,
-                            'Avg Volume': avg_volume,
-                            'Market Cap': market_cap,
-                            'P/E Ratio': pe_ratio,
-                            'YTD Change %': ytd_change,
-                            '52 Week Range': week52_range
-                        }
-                        stocks_data.append(stock_info)
-                        collected += 1
-                        page_items += 1
-                        print(f"  ✅ {collected}. {symbol}: {company_name} - ${current_price} ({change_pct}%)")
+                    seen_symbols.add(stock_info['Symbol'])
+                    stocks_data.append(stock_info)
+                    collected += 1
+                    page_items += 1
+                    print(f"  ✅ {collected}. {stock_info['Symbol']}: {stock_info['Company Name']} - "
+                          f"${stock_info['Price']} ({stock_info['Change %']}%)")
                         
                 except Exception as e:
                     print(f"  ⚠️ 행 파싱 오류: {e}")
@@ -250,8 +279,13 @@ def scrape_stock_gainers(target_count=50):
                         # disabled 체크
                         is_disabled = next_btn.get_attribute("disabled")
                         if not is_disabled:
+                            # 첫 행이 바뀌면 다음 페이지 데이터가 그려진 것
+                            previous_first_row = first_row_text(driver, ROW_SELECTOR)
                             driver.execute_script("arguments[0].click();", next_btn)
-                            time.sleep(3)
+                            if not waiter.wait('next_page', first_row_changed(ROW_SELECTOR, previous_first_row),
+                                               "다음 페이지 로드"):
+                                print("   다음 페이지 데이터가 로드되지 않았습니다.")
+                                break
                             page += 1
                         else:
                             print("   다음 버튼이 비활성화 상태입니다.")
@@ -270,6 +304,7 @@ def scrape_stock_gainers(target_count=50):
         traceback.print_exc()
     finally:
         driver.quit()
+        waiter.report()
     
     return stocks_data
 
@@ -378,12 +413,21 @@ def save_to_excel(data, filename=None):
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Yahoo Finance 주식 상승 종목을 수집해 엑셀로 저장합니다.")
+    parser.add_argument("--count", type=int, default=50, help="수집할 종목 수 (기본값: 50)")
+    parser.add_argument("--selenium", action="store_true",
+                        help="HTTP 수집을 건너뛰고 처음부터 Selenium(Chrome)으로 수집")
+    parser.add_argument("--http-base-url", default=None,
+                        help="HTTP 수집에 사용할 서버 주소 (기록해 둔 응답을 로컬 서버로 제공할 때)")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Yahoo Finance 주식 상승 종목 스크래핑")
     print("=" * 60)
     
     # 스크래핑 실행
-    data = scrape_stock_gainers(target_count=50)
+    data = scrape_stock_gainers(target_count=args.count, use_http=not args.selenium,
+                                http_base_url=args.http_base_url)
     
     if data:
         # 엑셀 저장
@@ -0,0 +1,77 @@
+"""
+테이블 일괄 추출 모듈
+WebDriver로 셀마다 .text를 읽으면 셀 하나당 HTTP 왕복이 한 번씩 생겨 페이지 하나에 수백 번을 주고받습니다.
+execute_script 한 번으로 테이블 전체를 [행][셀] 문자열 배열(JSON)로 가져와 왕복을 한 번으로 줄입니다.
+"""
+
+import time
+
+from selenium.webdriver.common.by import By
+
+# arguments[0]: 행 선택자, arguments[1]: 행 안의 셀 선택자
+# innerText는 WebElement.text처럼 화면에 보이는 텍스트(줄바꿈 포함)를 돌려줌
+TABLE_ROWS_SCRIPT = """
+const rows = document.querySelectorAll(arguments[0]);
+return Array.from(rows, row =>
+    Array.from(row.querySelectorAll(arguments[1]), cell => (cell.innerText || '').trim())
+);
+"""
+
+
+def read_table_rows(driver, row_selector, cell_selector):
+    """
+    execute_script 한 번으로 테이블의 모든 행을 셀 문자열 리스트로 가져옵니다.
+
+    Args:
+        driver: Selenium WebDriver
+        row_selector: 행 CSS 선택자 (예: "table tbody tr")
+        cell_selector: 행 안의 셀 CSS 선택자 (예: "td")
+
+    Returns:
+        [[셀 텍스트, ...], ...] 형태의 리스트 (행이 없으면 빈 리스트)
+    """
+    return driver.execute_script(TABLE_ROWS_SCRIPT, row_selector, cell_selector) or []
+
+
+def read_table_rows_per_element(driver, row_selector, cell_selector):
+    """
+    셀마다 WebElement.text를 읽어 테이블 행을 가져옵니다 (기존 방식, 셀 수만큼 왕복).
+
+    Args:
+        driver: Selenium WebDriver
+        row_selector: 행 CSS 선택자
+        cell_selector: 행 안의 셀 CSS 선택자
+
+    Returns:
+        [[셀 텍스트, ...], ...] 형태의 리스트
+    """
+    rows = []
+    for row in driver.find_elements(By.CSS_SELECTOR, row_selector):
+        try:
+            rows.append([cell.text.strip() for cell in row.find_elements(By.CSS_SELECTOR, cell_selector)])
+        except Exception as e:
+            print(f"  ⚠️ 행 읽기 오류: {e}")
+    return rows
+
+
+def extract_table(driver, row_selector, cell_selector, bulk=True):
+    """
+    테이블 행을 가져오고 걸린 시간을 함께 돌려줍니다.
+    일괄 추출이 실패하면(스크립트 실행 불가 등) 셀 단위 방식으로 다시 읽습니다.
+
+    Args:
+        driver: Selenium WebDriver
+        row_selector: 행 CSS 선택자
+        cell_selector: 행 안의 셀 CSS 선택자
+        bulk: True이면 execute_script 한 번으로 일괄 추출, False이면 셀 단위로 추출
+
+    Returns:
+        (행 리스트, 걸린 시간(초)) 튜플
+    """
+    started = time.perf_counter()
+    if bulk:
+        try:
+            return read_table_rows(driver, row_selector, cell_selector), time.perf_counter() - started
+        except Exception as e:
+            print(f"  ⚠️ 일괄 추출 실패, 셀 단위로 다시 읽습니다: {e}")
+    return read_table_rows_per_element(driver, row_selector, cell_selector), time.perf_counter() - started
@@ -0,0 +1,146 @@
+"""
+금 시세 증분 수집 테스트
+Tabulator 페이지를 흉내 내는 가짜 WebDriver로 저장소에 이어서 수집할 때
+저장된 마지막 날짜까지 빠짐없이 채우는지, 최대 개수에서 끊기면 저장하지 않는지 확인합니다.
+
+    python -m pytest crawling
+"""
+
+import sys
+from datetime import date, timedelta
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+import scrape_gold_price
+from gold_store import GoldPriceStore
+from table_extract import TABLE_ROWS_SCRIPT
+from waits import ATTRIBUTE_SCRIPT, FIRST_ROW_TEXT_SCRIPT, NETWORK_STATE_SCRIPT
+
+ROWS_PER_PAGE = 20
+
+
+def gold_row(day, buy_price):
+    """사이트 테이블 행 하나의 셀 텍스트 (고시날짜, 살 때 순금, 팔 때 순금, 18K, 14K)"""
+    return [day.strftime('%Y.%m.%d'), f"{buy_price:,}", f"{buy_price - 120000:,}",
+            f"{buy_price - 320000:,}", f"{buy_price - 440000:,}"]
+
+
+class FakeButton:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.driver.page += 1
+
+
+class FakeGoldDriver:
+    """최신 날짜부터 ROWS_PER_PAGE개씩 나누어 보여 주는 Tabulator 테이블 흉내"""
+
+    def __init__(self, rows):
+        self.pages = [rows[i:i + ROWS_PER_PAGE] for i in range(0, len(rows), ROWS_PER_PAGE)]
+        self.page = 0
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        pass
+
+    def execute_script(self, script, *args):
+        if script == TABLE_ROWS_SCRIPT:
+            return self.pages[self.page]
+        if script == FIRST_ROW_TEXT_SCRIPT:
+            return "\t".join(self.pages[self.page][0])
+        if script == ATTRIBUTE_SCRIPT:
+            return str(self.page + 1)
+        if script == NETWORK_STATE_SCRIPT:
+            return ['complete', 0]
+        raise AssertionError(f"예상하지 못한 스크립트: {script}")
+
+    def find_element(self, by, selector):
+        if self.page + 1 >= len(self.pages):
+            raise NoSuchElementException("마지막 페이지")
+        return FakeButton(self)
+
+
+@pytest.fixture
+def seeded_store(tmp_path):
+    """2025-01-09 ~ 2025-01-10의 3개 행이 저장된 저장소"""
+    path = str(tmp_path / "gold.sqlite3")
+    store = GoldPriceStore(path)
+    rows = [gold_row(date(2025, 1, 10), 870000), gold_row(date(2025, 1, 10), 868000),
+            gold_row(date(2025, 1, 9), 865000)]
+    store.upsert([scrape_gold_price.parse_gold_row(cells) for cells in rows])
+    store.close()
+    return path, rows
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path, seeded_store):
+    """저장된 날짜 이후 새 행 150개, 저장된 행, 그보다 오래된 행 순서로 보여 주는 가짜 사이트"""
+    _, stored_rows = seeded_store
+    new_rows = [gold_row(date(2025, 1, 11) + timedelta(days=(149 - n) // 2), 900000 + n * 1000)
+                for n in range(150)]
+    older_rows = [gold_row(date(2025, 1, 8) - timedelta(days=n), 860000 - n * 1000) for n in range(30)]
+    driver = FakeGoldDriver(new_rows + stored_rows + older_rows)
+
+    monkeypatch.setattr(scrape_gold_price.webdriver, "Chrome", lambda options=None: driver)
+    monkeypatch.chdir(tmp_path)
+    return new_rows
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["scrape_gold_price.py", *args])
+    scrape_gold_price.main()
+
+
+def test_incremental_run_fills_every_new_row_past_default_limit(monkeypatch, seeded_store, site):
+    path, _ = seeded_store
+
+    run_main(monkeypatch, "--store", path)
+
+    store = GoldPriceStore(path)
+    try:
+        assert store.count() == 3 + len(site)
+        assert store.max_date() == scrape_gold_price.parse_gold_date(site[0][0])
+        expected = {scrape_gold_price.record_key(cells[0], cells[1]) for cells in site}
+        assert expected <= store.keys(since=date(2025, 1, 11))
+        # 저장된 날짜보다 오래된 행은 가져오지 않음
+        assert store.query(end_date=date(2025, 1, 8)).empty
+    finally:
+        store.close()
+
+
+def test_limit_hit_before_stored_date_stores_nothing(monkeypatch, seeded_store, site):
+    path, _ = seeded_store
+
+    with pytest.raises(SystemExit) as exc_info:
+        run_main(monkeypatch, "--store", path, "--max-data", "100")
+
+    assert exc_info.value.code == 1
+    store = GoldPriceStore(path)
+    try:
+        assert store.count() == 3
+        assert store.max_date() == date(2025, 1, 10)
+    finally:
+        store.close()
+
+
+def test_collect_rows_reports_whether_it_reached_the_stored_rows(seeded_store, site):
+    path, stored_rows = seeded_store
+    store = GoldPriceStore(path)
+    try:
+        known_keys = store.keys(since=store.max_date())
+        pages = [site[i:i + ROWS_PER_PAGE] for i in range(0, len(site), ROWS_PER_PAGE)] + [stored_rows]
+
+        rows, complete = scrape_gold_price.collect_rows(iter(pages), known_keys, None, store.max_date())
+        assert complete and len(rows) == len(site)
+
+        rows, complete = scrape_gold_price.collect_rows(iter(pages), known_keys, 100, store.max_date())
+        assert not complete and len(rows) == 100
+    finally:
+        store.close()
@@ -0,0 +1,117 @@
+"""
+상승 종목 HTTP 수집 테스트
+fixtures/에 기록해 둔 스크리너 JSON과 상승 종목 페이지 HTML을 로컬 http.server로 제공하고
+scrape_stock_gainers_http의 결과를 확인합니다.
+
+    python -m pytest crawling
+"""
+
+import shutil
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from scrape_stock_gainers import scrape_stock_gainers_http
+from yahoo_http import YahooGainersFetcher
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(directory):
+    """directory를 제공하는 로컬 HTTP 서버를 띄우고 (서버, base_url)을 반환합니다."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def fixture_server():
+    server, base_url = _serve(FIXTURES_DIR)
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def html_only_server(tmp_path):
+    """스크리너 JSON이 없는(404) 서버 - 페이지 HTML로 대체되는지 확인용"""
+    shutil.copytree(FIXTURES_DIR / "markets", tmp_path / "markets")
+    server, base_url = _serve(tmp_path)
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+def test_screener_json_rows(fixture_server):
+    stocks = scrape_stock_gainers_http(target_count=50, base_url=fixture_server)
+
+    assert [s['Symbol'] for s in stocks] == ['ACME', 'BOLT', 'CRUX']
+    acme, bolt, crux = stocks
+    assert acme == {
+        'Symbol': 'ACME',
+        'Company Name': 'Acme Robotics Inc.',
+        'Price': 6.96,
+        'Change': 1.13,
+        'Change %': 19.38,
+        'Volume': pytest.approx(12_346_000),
+        'Avg Volume': pytest.approx(3_456_000),
+        'Market Cap': pytest.approx(1_230_000_000),
+        'P/E Ratio': 15.2,
+        'YTD Change %': 45.1,
+        '52 Week Range': '3.1\n8.25'
+    }
+    # shortName이 없으면 longName, P/E가 없으면 None
+    assert bolt['Company Name'] == 'Bolt Energy Holdings Corp.'
+    assert bolt['Price'] == 1234.5
+    assert bolt['Avg Volume'] == pytest.approx(850_000)
+    assert bolt['P/E Ratio'] is None
+    assert bolt['YTD Change %'] == -12.5
+    # 52주 정보가 없는 종목
+    assert crux['Market Cap'] == pytest.approx(78_900_000)
+    assert crux['YTD Change %'] is None
+    assert crux['52 Week Range'] == ''
+
+
+def test_target_count_limits_rows(fixture_server):
+    stocks = scrape_stock_gainers_http(target_count=2, base_url=fixture_server)
+
+    assert [s['Symbol'] for s in stocks] == ['ACME', 'BOLT']
+
+
+def test_html_fallback_when_screener_fails(html_only_server):
+    fetcher = YahooGainersFetcher(html_only_server, retries=0)
+    try:
+        rows, source, _ = fetcher.fetch_rows(50)
+    finally:
+        fetcher.close()
+    assert source == 'html'
+    assert len(rows) == 2
+
+    stocks = scrape_stock_gainers_http(target_count=50, base_url=html_only_server)
+
+    assert [s['Symbol'] for s in stocks] == ['ACME', 'BOLT']
+    acme, bolt = stocks
+    assert acme['Price'] == 6.96
+    assert acme['Change %'] == 19.38
+    assert acme['Volume'] == pytest.approx(12_346_000)
+    assert acme['52 Week Range'] == '3.10\n8.25'
+    assert bolt['Price'] == 1234.5
+    assert bolt['Volume'] == 987_654
+    assert bolt['P/E Ratio'] is None
+
+
+def test_no_rows_when_server_has_nothing(tmp_path):
+    server, base_url = _serve(tmp_path)
+    try:
+        assert scrape_stock_gainers_http(target_count=50, base_url=base_url) == []
+    finally:
+        server.shutdown()
+        server.server_close()
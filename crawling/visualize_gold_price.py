@@ -3,7 +3,9 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import seaborn as sns
 from datetime import datetime
+import argparse
 import glob
+from gold_store import DEFAULT_STORE_PATH, GoldPriceStore, parse_date_arg
 
 # 한글 폰트 설정 (Windows)
 import platform
@@ -61,8 +63,18 @@ if platform.system() == 'Windows':
 
 def load_data(excel_file):
     """엑셀 파일에서 데이터 로드"""
-    df = pd.read_excel(excel_file)
-    
+    return prepare_data(pd.read_excel(excel_file))
+
+def load_data_from_store(store_path, start_date=None, end_date=None):
+    """저장소에서 기간(date, 양 끝 포함)의 데이터 로드"""
+    store = GoldPriceStore(store_path)
+    try:
+        return prepare_data(store.query(start_date, end_date))
+    finally:
+        store.close()
+
+def prepare_data(df):
+    """가격을 숫자로, 고시날짜를 날짜로 변환하고 날짜순으로 정렬"""
     # 숫자 데이터 전처리
     numeric_columns = ['내가 살 때(3.75g) - 순금', '내가 팔 때(3.75g) - 순금', 
                       '내가 팔 때(3.75g) - 18K', '내가 팔 때(3.75g) - 14K']
@@ -72,7 +84,7 @@ def load_data(excel_file):
             df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
     
     # 날짜 변환
-    df['고시날짜'] = pd.to_datetime(df['고시날짜'], format='%Y.%m.%d', errors='coerce')
+    df['고시날짜'] = pd.to_datetime(df['고시날짜'].astype(str), format='%Y.%m.%d', errors='coerce')
     df = df.sort_values('고시날짜').reset_index(drop=True)
     
     return df
@@ -338,25 +350,51 @@ def create_statistics_summary(df, output_dir='.'):
     plt.close()
     print(f"✓ 생성 완료: {filename}")
 
-def main():
-    """메인 함수"""
-    # 가장 최근 엑셀 파일 찾기
+def find_latest_excel():
+    """가장 최근 금시세 엑셀 파일 찾기 (없으면 None)"""
     files = glob.glob("금시세_*.xlsx")
     if not files:
         print("엑셀 파일을 찾을 수 없습니다.")
-        return
+        return None
     
     # 통계 분석 파일 제외
     files = [f for f in files if '_통계분석' not in f]
     if not files:
         print("분석할 파일을 찾을 수 없습니다.")
+        return None
+    return max(files)
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="금 시세를 그래프 이미지로 저장합니다.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help=f"금 시세 저장소 파일 (기본값: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--start-date", help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="끝 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--excel", help="저장소 대신 사용할 금시세 엑셀 파일")
+    args = parser.parse_args()
+    
+    try:
+        start_date = parse_date_arg(args.start_date)
+        end_date = parse_date_arg(args.end_date)
+    except ValueError:
+        print("날짜는 YYYY-MM-DD 형식으로 입력해주세요.")
         return
     
-    excel_file = max(files)
-    print(f"데이터 파일: {excel_file}\n")
-    
-    # 데이터 로드
-    df = load_data(excel_file)
+    # 데이터 로드 (엑셀 파일 지정 > 저장소 > 가장 최근 엑셀 파일 순)
+    if not args.excel and os.path.exists(args.store):
+        print(f"데이터 저장소: {args.store} ({start_date or '처음'} ~ {end_date or '최신'})\n")
+        df = load_data_from_store(args.store, start_date, end_date)
+    else:
+        excel_file = args.excel or find_latest_excel()
+        if not excel_file:
+            return
+        print(f"데이터 파일: {excel_file}\n")
+        df = load_data(excel_file)
+    
+    if df.empty:
+        print("조회된 데이터가 없습니다.")
+        return
     print(f"총 {len(df)}개의 데이터 로드 완료\n")
     
     # 시각화 생성
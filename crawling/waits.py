@@ -0,0 +1,212 @@
+"""
+이벤트 기반 대기 모듈
+고정된 time.sleep 대신 실제 DOM 조건(첫 행 텍스트 변경, 페이지 속성 변경, 네트워크 유휴 등)이
+만족될 때까지만 기다리고, 단계별 대기 시간을 기록해 다음 대기의 제한 시간을 조정합니다.
+"""
+
+import statistics
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 행 선택자에 해당하는 첫 행의 텍스트 (행이 없으면 null)
+FIRST_ROW_TEXT_SCRIPT = """
+const row = document.querySelector(arguments[0]);
+return row ? (row.innerText || '').trim() : null;
+"""
+
+# 선택자에 해당하는 요소의 속성 값 (요소가 없으면 null)
+ATTRIBUTE_SCRIPT = """
+const el = document.querySelector(arguments[0]);
+return el ? el.getAttribute(arguments[1]) : null;
+"""
+
+# 문서 로딩 상태와 지금까지 요청한 리소스 수
+NETWORK_STATE_SCRIPT = """
+return [document.readyState, performance.getEntriesByType('resource').length];
+"""
+
+
+def first_row_text(driver, row_selector):
+    """
+    첫 행의 텍스트를 반환합니다 (페이지 이동 전 기준값을 잡을 때 사용).
+
+    Args:
+        driver: Selenium WebDriver
+        row_selector: 행 CSS 선택자
+
+    Returns:
+        첫 행 텍스트 (행이 없으면 None)
+    """
+    return driver.execute_script(FIRST_ROW_TEXT_SCRIPT, row_selector)
+
+
+def element_attribute(driver, selector, attribute):
+    """
+    요소의 속성 값을 반환합니다 (요소가 없으면 None).
+
+    Args:
+        driver: Selenium WebDriver
+        selector: 요소 CSS 선택자
+        attribute: 속성 이름
+    """
+    return driver.execute_script(ATTRIBUTE_SCRIPT, selector, attribute)
+
+
+def rows_present(row_selector):
+    """행이 하나 이상 있고 첫 행에 텍스트가 채워지면 만족하는 조건"""
+    def condition(driver):
+        return bool(first_row_text(driver, row_selector))
+    return condition
+
+
+def first_row_changed(row_selector, previous_text):
+    """첫 행의 텍스트가 이전 값과 달라지면(새 페이지 데이터가 그려지면) 만족하는 조건"""
+    def condition(driver):
+        text = first_row_text(driver, row_selector)
+        return bool(text) and text != previous_text
+    return condition
+
+
+def attribute_changed(selector, attribute, previous_value):
+    """요소의 속성 값이 이전 값과 달라지면 만족하는 조건 (예: Tabulator 현재 페이지 번호)"""
+    def condition(driver):
+        value = element_attribute(driver, selector, attribute)
+        return value is not None and value != previous_value
+    return condition
+
+
+def network_idle(quiet_seconds=0.5):
+    """문서 로딩이 끝나고 quiet_seconds 동안 새 리소스 요청이 없으면 만족하는 조건"""
+    state = {'count': None, 'since': None}
+
+    def condition(driver):
+        ready_state, count = driver.execute_script(NETWORK_STATE_SCRIPT)
+        now = time.monotonic()
+        if ready_state != 'complete' or count != state['count']:
+            state['count'], state['since'] = count, now
+            return False
+        return now - state['since'] >= quiet_seconds
+    return condition
+
+
+def all_of(*conditions):
+    """모든 조건이 만족되면 만족하는 조건"""
+    def condition(driver):
+        return all(check(driver) for check in conditions)
+    return condition
+
+
+def any_of(*conditions):
+    """조건 중 하나라도 만족되면 만족하는 조건"""
+    def condition(driver):
+        return any(check(driver) for check in conditions)
+    return condition
+
+
+class PageWaiter:
+    """조건 기반 대기와 단계별 대기 시간 통계를 관리하는 클래스"""
+
+    def __init__(self, driver, max_timeout=20.0, min_timeout=2.0, poll_interval=0.05,
+                 timeout_factor=3.0):
+        """
+        Args:
+            driver: Selenium WebDriver
+            max_timeout: 최대 대기 시간(초), 기록이 없는 단계의 제한 시간
+            min_timeout: 조정된 제한 시간의 하한(초)
+            poll_interval: 조건을 확인하는 간격(초)
+            timeout_factor: 단계별 p95 대기 시간에 곱해 제한 시간으로 쓸 배수
+        """
+        self.driver = driver
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.poll_interval = poll_interval
+        self.timeout_factor = timeout_factor
+        self.latencies = {}   # {단계: [대기 시간(초), ...]}
+        self.timeouts = {}    # {단계: 제한 시간 초과 횟수}
+
+    def timeout_for(self, label):
+        """
+        단계의 제한 시간을 정합니다.
+        기록이 3번 이상 쌓이면 p95 대기 시간의 timeout_factor배 (min_timeout~max_timeout 범위)를 사용합니다.
+
+        Args:
+            label: 대기 단계 이름
+
+        Returns:
+            제한 시간(초)
+        """
+        samples = self.latencies.get(label, [])
+        if len(samples) < 3:
+            return self.max_timeout
+        p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) >= 20 else max(samples)
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.timeout_factor))
+
+    def _until(self, condition, timeout):
+        WebDriverWait(self.driver, timeout, poll_frequency=self.poll_interval,
+                      ignored_exceptions=(WebDriverException,)).until(condition)
+
+    def wait(self, label, condition, description=""):
+        """
+        조건이 만족될 때까지 기다리고 걸린 시간을 기록합니다.
+        조정된 제한 시간 안에 끝나지 않으면 한 번만 max_timeout까지 더 기다립니다 (느린 페이지 대비).
+
+        Args:
+            label: 대기 단계 이름 (통계 구분용, 예: 'page_load', 'next_page')
+            condition: driver를 받아 만족 여부를 돌려주는 함수
+            description: 로그에 표시할 설명
+
+        Returns:
+            조건이 만족되면 True, 최대 대기 시간을 넘기면 False
+        """
+        timeout = self.timeout_for(label)
+        started = time.perf_counter()
+        try:
+            self._until(condition, timeout)
+        except TimeoutException:
+            remaining = self.max_timeout - (time.perf_counter() - started)
+            try:
+                if remaining <= 0:
+                    raise
+                print(f"   ⏳ {description or label}: {timeout:.1f}초를 넘겨 최대 {self.max_timeout:.0f}초까지 기다립니다.")
+                self._until(condition, remaining)
+            except TimeoutException:
+                self.timeouts[label] = self.timeouts.get(label, 0) + 1
+                print(f"   ⚠️ {description or label}: {self.max_timeout:.0f}초 안에 조건이 만족되지 않았습니다.")
+                return False
+
+        elapsed = time.perf_counter() - started
+        self.latencies.setdefault(label, []).append(elapsed)
+        print(f"   ⏱️ {description or label}: {elapsed * 1000:.0f}ms")
+        return True
+
+    def summary(self):
+        """
+        단계별 대기 시간 통계를 반환합니다.
+
+        Returns:
+            {단계: {'count', 'mean', 'p50', 'max', 'timeouts'}} 딕셔너리 (시간 단위: 초)
+        """
+        result = {}
+        for label in sorted(set(self.latencies) | set(self.timeouts)):
+            samples = self.latencies.get(label, [])
+            result[label] = {
+                'count': len(samples),
+                'mean': statistics.mean(samples) if samples else 0.0,
+                'p50': statistics.median(samples) if samples else 0.0,
+                'max': max(samples) if samples else 0.0,
+                'timeouts': self.timeouts.get(label, 0)
+            }
+        return result
+
+    def report(self):
+        """단계별 대기 시간 통계를 출력합니다."""
+        stats = self.summary()
+        if not stats:
+            return
+        print("\n⏱️ 대기 시간 통계:")
+        for label, stat in stats.items():
+            print(f"   {label}: {stat['count']}회, 평균 {stat['mean'] * 1000:.0f}ms, "
+                  f"중앙값 {stat['p50'] * 1000:.0f}ms, 최대 {stat['max'] * 1000:.0f}ms, "
+                  f"시간 초과 {stat['timeouts']}회")
@@ -0,0 +1,255 @@
+"""
+Yahoo Finance 상승 종목 HTTP 수집 모듈
+Chrome을 띄우지 않고 스크리너 JSON(실패하면 상승 종목 페이지 HTML)을 HTTP로 직접 받아
+Selenium 테이블과 같은 셀 텍스트 리스트로 변환합니다.
+연결은 urllib3 연결 풀로 재사용하고, 일시적인 오류(429, 5xx)는 재시도합니다.
+"""
+
+import json
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlencode
+
+import urllib3
+from urllib3.util.retry import Retry
+
+SCREENER_URL = "https://query1.finance.yahoo.com/v1/finance/screener/predefined/saved"
+GAINERS_PAGE_URL = "https://finance.yahoo.com/markets/stocks/gainers/"
+
+# 기록해 둔 응답을 로컬 HTTP 서버로 제공할 때의 경로 (base_url 뒤에 붙음)
+SCREENER_PATH = "/v1/finance/screener/predefined/saved"
+GAINERS_PAGE_PATH = "/markets/stocks/gainers/"
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+# 요청 한 번에 가져올 종목 수 (스크리너 최대 250개, 페이지 최대 100개)
+SCREENER_PAGE_SIZE = 250
+HTML_PAGE_SIZE = 100
+
+
+class YahooHttpError(Exception):
+    """HTTP 응답이 실패했거나 예상한 형식이 아닌 경우 발생하는 예외"""
+
+
+def _fmt(quote, key):
+    """스크리너 값({'raw', 'fmt'} 또는 숫자)을 화면에 보이는 문자열로 바꿉니다 (없으면 빈 문자열)."""
+    value = quote.get(key)
+    if isinstance(value, dict):
+        value = value.get('fmt', value.get('raw'))
+    return "" if value is None else str(value)
+
+
+def _raw(quote, key):
+    """스크리너 값의 원래 숫자를 문자열로 돌려줍니다 (쉼표 없는 형식, 없으면 빈 문자열)."""
+    value = quote.get(key)
+    if isinstance(value, dict):
+        value = value.get('raw')
+    return "" if value is None else str(value)
+
+
+def quote_to_cells(quote):
+    """
+    스크리너 JSON의 종목 하나를 상승 종목 테이블과 같은 순서의 셀 텍스트 리스트로 변환합니다.
+    (Symbol, 회사명, 차트, 가격, 변동, 변동률, 거래량, 평균 거래량, 시가총액, P/E, 52주 변동률, 52주 범위)
+
+    Args:
+        quote: 스크리너 응답의 quotes 항목
+
+    Returns:
+        셀 텍스트 리스트 (parse_stock_row에 그대로 넘길 수 있음)
+    """
+    change_pct = _fmt(quote, 'regularMarketChangePercent')
+    if change_pct and not change_pct.endswith('%'):
+        change_pct += '%'
+    week52_change = _fmt(quote, 'fiftyTwoWeekChangePercent')
+    if week52_change and not week52_change.endswith('%'):
+        week52_change += '%'
+    week52_range = ""
+    if _raw(quote, 'fiftyTwoWeekLow') and _raw(quote, 'fiftyTwoWeekHigh'):
+        week52_range = f"{_raw(quote, 'fiftyTwoWeekLow')}\n{_raw(quote, 'fiftyTwoWeekHigh')}"
+
+    return [
+        quote.get('symbol', ''),
+        quote.get('shortName') or quote.get('longName') or '',
+        '',
+        _fmt(quote, 'regularMarketPrice'),
+        _fmt(quote, 'regularMarketChange'),
+        change_pct,
+        _fmt(quote, 'regularMarketVolume'),
+        _fmt(quote, 'averageDailyVolume3Month'),
+        _fmt(quote, 'marketCap'),
+        _fmt(quote, 'trailingPE') or '--',
+        week52_change,
+        week52_range
+    ]
+
+
+class _TableRowParser(HTMLParser):
+    """HTML에서 <tbody> 안 <tr>의 <td> 텍스트를 모읍니다 (셀 안의 텍스트 조각은 줄바꿈으로 연결)."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._in_tbody = False
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tbody':
+            self._in_tbody = True
+        elif tag == 'tr' and self._in_tbody:
+            self._row = []
+        elif tag == 'td' and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag == 'td' and self._cell is not None:
+            self._row.append("\n".join(self._cell))
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+        elif tag == 'tbody':
+            self._in_tbody = False
+
+    def handle_data(self, data):
+        if self._cell is not None and data.strip():
+            self._cell.append(data.strip())
+
+
+def parse_gainers_html(html):
+    """
+    상승 종목 페이지 HTML에서 테이블 행을 셀 텍스트 리스트로 추출합니다.
+
+    Args:
+        html: 페이지 HTML 문자열
+
+    Returns:
+        [[셀 텍스트, ...], ...] 리스트
+    """
+    parser = _TableRowParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+class YahooGainersFetcher:
+    """연결 풀을 공유하며 상승 종목 데이터를 HTTP로 가져오는 클래스"""
+
+    def __init__(self, base_url=None, timeout=10.0, retries=3):
+        """
+        Args:
+            base_url: 요청을 보낼 서버 주소 (예: "http://127.0.0.1:8000", 기록해 둔 응답으로 시험할 때 사용)
+                None이면 Yahoo Finance 주소
+            timeout: 요청 하나의 제한 시간(초)
+            retries: 429/5xx/연결 오류 재시도 횟수
+        """
+        if base_url:
+            base_url = base_url.rstrip('/')
+            self.screener_url = base_url + SCREENER_PATH
+            self.page_url = base_url + GAINERS_PAGE_PATH
+        else:
+            self.screener_url = SCREENER_URL
+            self.page_url = GAINERS_PAGE_URL
+
+        self.http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=4,
+            headers={'User-Agent': USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'},
+            timeout=urllib3.Timeout(total=timeout),
+            retries=Retry(total=retries, backoff_factor=0.5,
+                          status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+        )
+
+    def _get(self, url, params):
+        """GET 요청을 보내고 응답 본문을 문자열로 반환합니다."""
+        response = self.http.request('GET', f"{url}?{urlencode(params)}")
+        if response.status != 200:
+            raise YahooHttpError(f"HTTP {response.status}: {url}")
+        return response.data.decode('utf-8', errors='replace')
+
+    def fetch_screener_rows(self, target_count):
+        """
+        스크리너 JSON으로 상승 종목을 가져옵니다.
+
+        Args:
+            target_count: 가져올 종목 수
+
+        Returns:
+            셀 텍스트 리스트의 리스트
+
+        Raises:
+            YahooHttpError: 응답이 실패했거나 형식이 다른 경우
+        """
+        rows = []
+        start = 0
+        while len(rows) < target_count:
+            body = self._get(self.screener_url, {
+                'scrIds': 'day_gainers',
+                'count': min(SCREENER_PAGE_SIZE, target_count - len(rows)),
+                'start': start,
+                'formatted': 'true'
+            })
+            try:
+                result = json.loads(body)['finance']['result'][0]
+                quotes = result['quotes']
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                raise YahooHttpError(f"스크리너 응답 형식이 다릅니다: {e}") from e
+
+            rows.extend(quote_to_cells(quote) for quote in quotes)
+            start += len(quotes)
+            if not quotes or start >= result.get('total', start):
+                break
+        return rows
+
+    def fetch_page_rows(self, target_count):
+        """
+        상승 종목 페이지 HTML을 받아 테이블 행을 가져옵니다 (스크리너 JSON을 쓸 수 없을 때).
+
+        Args:
+            target_count: 가져올 종목 수
+
+        Returns:
+            셀 텍스트 리스트의 리스트
+
+        Raises:
+            YahooHttpError: 응답이 실패한 경우
+        """
+        rows = []
+        start = 0
+        while len(rows) < target_count:
+            page_rows = parse_gainers_html(self._get(self.page_url, {'start': start, 'count': HTML_PAGE_SIZE}))
+            if not page_rows:
+                break
+            rows.extend(page_rows)
+            start += len(page_rows)
+            if len(page_rows) < HTML_PAGE_SIZE:
+                break
+        return rows
+
+    def fetch_rows(self, target_count):
+        """
+        스크리너 JSON을 먼저 시도하고, 실패하거나 비어 있으면 페이지 HTML로 가져옵니다.
+
+        Args:
+            target_count: 가져올 종목 수
+
+        Returns:
+            (셀 텍스트 리스트의 리스트, 사용한 방식 'json'/'html', 걸린 시간(초)) 튜플 (둘 다 실패하면 빈 리스트)
+        """
+        started = time.perf_counter()
+        for source, fetch in (('json', self.fetch_screener_rows), ('html', self.fetch_page_rows)):
+            try:
+                rows = fetch(target_count)
+            except (YahooHttpError, urllib3.exceptions.HTTPError) as e:
+                print(f"  ⚠️ HTTP 수집 실패 ({source}): {e}")
+                continue
+            if rows:
+                return rows, source, time.perf_counter() - started
+            print(f"  ⚠️ HTTP 수집 결과가 비어 있습니다 ({source}).")
+        return [], None, time.perf_counter() - started
+
+    def close(self):
+        """연결 풀을 닫습니다."""
+        self.http.clear()
@@ -0,0 +1,33 @@
+"""
+여러 도구(review_report, pdfsummarizer, article_writer, youtube_st_extractor)가 함께 쓰는 OpenAI 호출 공용 모듈
+각 도구는 저장소 루트를 sys.path에 추가한 뒤 `from openai_common import ...`로 가져옵니다.
+"""
+
+from .batch import BatchJobError, BatchRequestError, BatchRunner
+from .client import ClientMetrics, RetryPolicy, get_client, is_retryable
+from .structured import (StructuredOutputError, parse_structured_response, repair_messages,
+                         response_format, strict_json_schema)
+from .tokens import count_tokens, count_message_tokens, truncate_to_tokens
+from .usage import MODEL_PRICES, TokenBudgetExceeded, UsageTracker, model_price
+
+__all__ = [
+    'BatchJobError',
+    'BatchRequestError',
+    'BatchRunner',
+    'ClientMetrics',
+    'RetryPolicy',
+    'get_client',
+    'is_retryable',
+    'StructuredOutputError',
+    'parse_structured_response',
+    'repair_messages',
+    'response_format',
+    'strict_json_schema',
+    'count_tokens',
+    'count_message_tokens',
+    'truncate_to_tokens',
+    'MODEL_PRICES',
+    'TokenBudgetExceeded',
+    'UsageTracker',
+    'model_price',
+]
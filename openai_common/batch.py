@@ -0,0 +1,276 @@
+"""
+OpenAI Batch API 실행 모듈
+대기 시간이 중요하지 않은 대량 작업(야간 보고서 등)을 위해 요청을 JSONL 배치 파일로 기록해 제출하고,
+완료될 때까지 상태를 확인한 뒤 결과를 원래 요청 순서대로 돌려줍니다.
+Batch API는 동기 호출과 별도의 (더 큰) 처리 한도를 쓰고 비용이 절반입니다.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import openai
+from openai.types.chat import ChatCompletion
+
+from .client import RetryPolicy
+from .tokens import count_message_tokens
+from .usage import UsageTracker
+
+CHAT_COMPLETIONS_ENDPOINT = '/v1/chat/completions'
+
+# 배치 하나의 최대 요청 수 / 입력 파일 크기 (API 한도 50,000건 / 200MB보다 약간 작게)
+MAX_REQUESTS_PER_BATCH = 50000
+MAX_BATCH_FILE_BYTES = 190 * 1024 * 1024
+
+# 더 이상 상태가 바뀌지 않는 배치 상태
+TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+
+class BatchJobError(Exception):
+    """배치 작업 전체가 실패했거나 최대 대기 시간을 넘긴 경우 발생하는 예외"""
+
+
+class BatchRequestError(Exception):
+    """배치 안의 요청 하나가 실패한 경우 결과 자리에 담기는 오류"""
+
+
+class BatchRunner:
+    """Chat Completion 요청 묶음을 Batch API로 실행하는 클래스"""
+
+    def __init__(self, client, usage_tracker: Optional[UsageTracker] = None,
+                 work_dir: str = 'batch_jobs', poll_interval: float = 30.0,
+                 completion_window: str = '24h', max_wait: Optional[float] = None,
+                 max_requests_per_batch: int = MAX_REQUESTS_PER_BATCH,
+                 max_file_bytes: int = MAX_BATCH_FILE_BYTES):
+        """
+        Args:
+            client: OpenAI 클라이언트 (base_url로 로컬 대역 서버를 지정할 수 있음)
+            usage_tracker: 토큰 예산 확인 및 사용량 기록기 (None이면 새로 생성)
+            work_dir: 배치 입력 파일과 제출 상태를 저장할 폴더
+            poll_interval: 배치 상태를 확인하는 간격(초)
+            completion_window: 배치 완료 기한 (현재 API는 '24h'만 지원)
+            max_wait: 최대 대기 시간(초), 넘으면 BatchJobError (None이면 완료될 때까지 대기)
+            max_requests_per_batch: 배치 하나에 담을 최대 요청 수
+            max_file_bytes: 배치 입력 파일 하나의 최대 크기(바이트)
+        """
+        self.client = client
+        self.usage = usage_tracker or UsageTracker()
+        self.work_dir = work_dir
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+        self.max_wait = max_wait
+        self.max_requests_per_batch = max(1, max_requests_per_batch)
+        self.max_file_bytes = max_file_bytes
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """파일 업로드/배치 생성/상태 확인에 사용할 재시도 정책"""
+        return self.usage.retry_policy
+
+    def _split(self, lines: List[str]) -> List[List[int]]:
+        """JSONL 줄을 요청 수와 파일 크기 한도에 맞춰 배치별 인덱스로 나눕니다."""
+        parts = []
+        current = []
+        current_bytes = 0
+        for i, line in enumerate(lines):
+            size = len(line.encode('utf-8')) + 1
+            if current and (len(current) >= self.max_requests_per_batch
+                            or current_bytes + size > self.max_file_bytes):
+                parts.append(current)
+                current = []
+                current_bytes = 0
+            current.append(i)
+            current_bytes += size
+        if current:
+            parts.append(current)
+        return parts
+
+    def _submit(self, label: str, lines: List[str]) -> Dict[str, Any]:
+        """
+        배치 입력 파일을 저장하고 제출합니다.
+        같은 내용의 배치를 이미 제출했다면(중단 후 재실행) 새로 제출하지 않고 기존 배치를 이어서 기다립니다.
+
+        Returns:
+            {'batch_id', 'input_path', 'state_path'} 딕셔너리
+        """
+        content = "\n".join(lines) + "\n"
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        os.makedirs(self.work_dir, exist_ok=True)
+        input_path = os.path.join(self.work_dir, f"{label}_{digest}.jsonl")
+        state_path = os.path.join(self.work_dir, f"{label}_{digest}.state.json")
+
+        if os.path.exists(state_path):
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            try:
+                batch = self.retry_policy.call(self.client.batches.retrieve, state['batch_id'])
+            except openai.NotFoundError:
+                batch = None  # 다른 계정/서버에서 만든 배치는 새로 제출
+            if batch is not None and batch.status not in ('failed', 'expired', 'cancelled'):
+                print(f"  이전에 제출한 배치 {batch.id}를 이어서 기다립니다 (상태: {batch.status}).")
+                return {'batch_id': batch.id, 'input_path': input_path, 'state_path': state_path}
+
+        with open(input_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        with open(input_path, 'rb') as f:
+            uploaded = self.retry_policy.call(self.client.files.create, file=f, purpose='batch')
+        batch = self.retry_policy.call(
+            self.client.batches.create,
+            input_file_id=uploaded.id,
+            endpoint=CHAT_COMPLETIONS_ENDPOINT,
+            completion_window=self.completion_window,
+            metadata={'label': label}
+        )
+
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump({'batch_id': batch.id, 'input_file_id': uploaded.id,
+                       'submitted_at': time.time()}, f)
+        print(f"  배치 {batch.id} 제출 ({len(lines):,}개 요청)")
+        return {'batch_id': batch.id, 'input_path': input_path, 'state_path': state_path}
+
+    def _wait(self, batch_ids: List[str]) -> Dict[str, Any]:
+        """
+        모든 배치가 끝날 때까지 상태를 확인합니다.
+
+        Returns:
+            {배치 ID: 마지막 배치 객체}
+
+        Raises:
+            BatchJobError: max_wait를 넘긴 경우 (같은 요청으로 다시 실행하면 이어서 기다림)
+        """
+        started = time.monotonic()
+        finished: Dict[str, Any] = {}
+        last_progress = None
+
+        while True:
+            completed = failed = total = 0
+            for batch_id in batch_ids:
+                batch = finished.get(batch_id)
+                if batch is None:
+                    batch = self.retry_policy.call(self.client.batches.retrieve, batch_id)
+                    if batch.status in TERMINAL_STATUSES:
+                        finished[batch_id] = batch
+                counts = batch.request_counts
+                if counts is not None:
+                    completed += counts.completed
+                    failed += counts.failed
+                    total += counts.total
+
+            progress = (len(finished), completed, failed)
+            if progress != last_progress:
+                print(f"  배치 진행: {len(finished)}/{len(batch_ids)}개 종료, "
+                      f"요청 {completed + failed:,}/{total:,} (실패 {failed:,})")
+                last_progress = progress
+
+            if len(finished) == len(batch_ids):
+                return finished
+
+            if self.max_wait is not None and time.monotonic() - started > self.max_wait:
+                raise BatchJobError(
+                    f"배치가 {self.max_wait:.0f}초 안에 끝나지 않았습니다. "
+                    f"같은 작업을 다시 실행하면 제출한 배치를 이어서 기다립니다."
+                )
+            time.sleep(self.poll_interval)
+
+    def _download(self, file_id: Optional[str]) -> List[Dict[str, Any]]:
+        """배치 출력/오류 파일을 내려받아 JSONL 줄을 파싱합니다."""
+        if not file_id:
+            return []
+        content = self.retry_policy.call(self.client.files.content, file_id)
+        lines = []
+        for line in content.text.splitlines():
+            if line.strip():
+                lines.append(json.loads(line))
+        return lines
+
+    @staticmethod
+    def _parse_line(line: Dict[str, Any]) -> Union[ChatCompletion, BatchRequestError]:
+        """출력 파일의 한 줄을 응답 객체 또는 오류로 변환합니다."""
+        response = line.get('response') or {}
+        body = response.get('body') or {}
+        if response.get('status_code') == 200 and not line.get('error'):
+            return ChatCompletion.model_validate(body)
+
+        error = line.get('error') or body.get('error') or {}
+        message = error.get('message') if isinstance(error, dict) else str(error)
+        status = response.get('status_code')
+        return BatchRequestError(f"{message or '알 수 없는 오류'}" + (f" (HTTP {status})" if status else ""))
+
+    def run(self, label: str, model: str,
+            requests: List[Dict[str, Any]]) -> List[Union[ChatCompletion, BatchRequestError]]:
+        """
+        Chat Completion 요청 목록을 Batch API로 실행하고 결과를 요청 순서대로 반환합니다.
+        제출 전에 모든 요청의 토큰 예산을 확인하므로, 예산을 넘으면 아무것도 제출하지 않습니다.
+
+        Args:
+            label: 작업 이름 (입력 파일명, 사용량 보고서에 사용)
+            model: 모델명
+            requests: chat.completions.create 인자 목록 (각 항목에 messages 필수, model 제외)
+
+        Returns:
+            요청 순서대로 정렬된 결과 리스트 (성공하면 ChatCompletion, 실패하면 BatchRequestError)
+
+        Raises:
+            TokenBudgetExceeded: 토큰 예산을 넘는 경우 (제출하지 않음)
+            BatchJobError: 배치 작업 전체가 실패했거나 최대 대기 시간을 넘긴 경우
+        """
+        if not requests:
+            return []
+
+        estimates = []
+        try:
+            for request in requests:
+                prompt_tokens = count_message_tokens(request['messages'], model)
+                max_tokens = request.get('max_tokens') or request.get('max_completion_tokens') or 0
+                self.usage.reserve(prompt_tokens, max_tokens)
+                estimates.append((prompt_tokens, max_tokens))
+        except Exception:
+            for prompt_tokens, max_tokens in estimates:
+                self.usage.release(prompt_tokens, max_tokens)
+            raise
+
+        lines = [
+            json.dumps({
+                'custom_id': f"{label}-{i}",
+                'method': 'POST',
+                'url': CHAT_COMPLETIONS_ENDPOINT,
+                'body': {'model': model, **request}
+            }, ensure_ascii=False)
+            for i, request in enumerate(requests)
+        ]
+
+        started = time.perf_counter()
+        results: List[Union[ChatCompletion, BatchRequestError, None]] = [None] * len(requests)
+        try:
+            parts = self._split(lines)
+            print(f"Batch API로 {len(requests):,}개 요청을 {len(parts)}개 배치로 제출합니다...")
+            submitted = [self._submit(label if len(parts) == 1 else f"{label}_{n}", [lines[i] for i in part])
+                         for n, part in enumerate(parts)]
+            finished = self._wait([job['batch_id'] for job in submitted])
+
+            for job in submitted:
+                batch = finished[job['batch_id']]
+                if batch.status == 'failed' and not batch.output_file_id:
+                    errors = getattr(batch.errors, 'data', None) or []
+                    reason = "; ".join(str(getattr(error, 'message', error)) for error in errors[:3])
+                    raise BatchJobError(f"배치 {batch.id}가 실패했습니다: {reason or batch.status}")
+
+                for line in self._download(batch.output_file_id) + self._download(batch.error_file_id):
+                    custom_id = str(line.get('custom_id', ''))
+                    index = custom_id.rsplit('-', 1)[-1]
+                    if custom_id.startswith(f"{label}-") and index.isdigit() and int(index) < len(results):
+                        results[int(index)] = self._parse_line(line)
+        finally:
+            # 요청별 지연 시간은 없으므로 실행 전체의 대기 시간을 한 번만 기록
+            self.usage.record_batch_run(label, len(requests), time.perf_counter() - started)
+            for i, (prompt_tokens, max_tokens) in enumerate(estimates):
+                result = results[i]
+                response = result if isinstance(result, ChatCompletion) else None
+                self.usage.record(label, model, prompt_tokens, max_tokens, response, None, batch=True)
+
+        # 만료/취소된 배치에서 처리되지 않은 요청
+        return [result if result is not None else BatchRequestError("배치가 끝날 때까지 처리되지 않았습니다")
+                for result in results]
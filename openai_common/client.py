@@ -0,0 +1,207 @@
+"""
+공용 OpenAI 클라이언트 모듈
+HTTP 연결 풀(keep-alive)을 가진 클라이언트를 도구 전체에서 하나만 만들어 재사용하고, 일시적인 오류(429, 5xx, 연결 오류)는
+Retry-After 헤더를 존중하는 지수 백오프(jitter 포함)로 재시도하며, 성공/재시도/실패 횟수를 기록합니다.
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import openai
+from openai import OpenAI
+
+# 재시도할 HTTP 상태 코드 (5xx는 모두 재시도)
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+_clients: Dict[Tuple[Optional[str], Optional[str]], OpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: Optional[str] = None, base_url: Optional[str] = None,
+               timeout: float = 120.0) -> OpenAI:
+    """
+    같은 API 키/주소에 대해 하나의 OpenAI 클라이언트를 만들어 재사용합니다.
+    SDK 클라이언트는 내부 HTTP 연결 풀(keep-alive)을 가지므로, 인스턴스를 공유하면
+    도구 안의 모든 요청(여러 스레드 포함)이 같은 연결을 재사용합니다.
+    재시도는 RetryPolicy가 담당하므로 SDK 자체 재시도는 끕니다.
+
+    Args:
+        api_key: OpenAI API 키 (None이면 환경 변수 OPENAI_API_KEY)
+        base_url: API 주소 (None이면 환경 변수 OPENAI_BASE_URL 또는 기본 주소)
+        timeout: 요청 하나의 최대 대기 시간(초)
+
+    Returns:
+        연결 풀을 공유하는 OpenAI 클라이언트
+    """
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = OpenAI(api_key=api_key, base_url=base_url,
+                            timeout=timeout, max_retries=0)
+            _clients[key] = client
+        return client
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """오류 응답의 retry-after-ms / retry-after 헤더에서 대기 시간(초)을 읽습니다."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get('retry-after')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    다시 시도하면 성공할 수 있는 오류인지 판단합니다.
+    사용 한도 초과(insufficient_quota)처럼 429여도 기다려서 해결되지 않는 오류는 제외합니다.
+    """
+    if isinstance(error, openai.APIConnectionError):  # 연결 오류, 시간 초과
+        return True
+    if isinstance(error, openai.APIStatusError):
+        if getattr(error, 'code', None) == 'insufficient_quota':
+            return False
+        status = error.status_code
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    return False
+
+
+def _error_name(error: Exception) -> str:
+    """지표에 기록할 오류 이름 (HTTP 상태 코드가 있으면 함께 표시)"""
+    status = getattr(error, 'status_code', None)
+    return f"{type(error).__name__}({status})" if status else type(error).__name__
+
+
+class ClientMetrics:
+    """OpenAI 호출의 성공/재시도/실패 횟수를 기록하는 클래스"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.retry_wait = 0.0
+        self.errors: Counter = Counter()
+
+    def record_success(self):
+        """성공한 호출을 기록합니다."""
+        with self._lock:
+            self.successes += 1
+
+    def record_retry(self, error: Exception, delay: float):
+        """재시도한 오류와 대기 시간을 기록합니다."""
+        with self._lock:
+            self.retries += 1
+            self.retry_wait += delay
+            self.errors[_error_name(error)] += 1
+
+    def record_failure(self, error: Exception):
+        """재시도 후에도 실패한(또는 재시도할 수 없는) 호출을 기록합니다."""
+        with self._lock:
+            self.failures += 1
+            self.errors[_error_name(error)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재까지의 지표를 반환합니다.
+
+        Returns:
+            successes, failures, retries, retry_wait, errors를 담은 딕셔너리
+        """
+        with self._lock:
+            return {
+                'successes': self.successes,
+                'failures': self.failures,
+                'retries': self.retries,
+                'retry_wait': round(self.retry_wait, 3),
+                'errors': dict(self.errors)
+            }
+
+
+class RetryPolicy:
+    """일시적인 OpenAI 오류를 지수 백오프로 재시도하는 정책"""
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 0.5,
+                 max_delay: float = 30.0, metrics: Optional[ClientMetrics] = None):
+        """
+        Args:
+            max_retries: 최대 재시도 횟수
+            base_delay: 첫 재시도의 최대 대기 시간(초), 재시도마다 두 배씩 증가
+            max_delay: 백오프 대기 시간의 상한(초) (Retry-After 헤더가 있으면 그 값을 우선)
+            metrics: 성공/재시도/실패를 기록할 지표 (None이면 새로 생성)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.metrics = metrics or ClientMetrics()
+
+    def delay_for(self, attempt: int, error: Exception) -> float:
+        """
+        재시도 전 대기 시간을 계산합니다.
+        서버가 Retry-After를 알려주면 그만큼 기다리고, 아니면 full jitter 지수 백오프를 사용합니다.
+
+        Args:
+            attempt: 지금까지 실패한 횟수 (0부터)
+            error: 발생한 오류
+
+        Returns:
+            대기 시간(초)
+        """
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            # 여러 스레드가 동시에 다시 몰리지 않도록 약간의 jitter 추가
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        함수를 호출하고, 재시도할 수 있는 오류면 기다렸다가 다시 호출합니다.
+
+        Args:
+            func: 호출할 함수 (예: client.chat.completions.create)
+            *args, **kwargs: 함수에 전달할 인자
+
+        Returns:
+            함수 반환값
+
+        Raises:
+            마지막 시도의 오류 (재시도할 수 없는 오류는 즉시)
+        """
+        attempt = 0
+        while True:
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self.metrics.record_failure(e)
+                    raise
+                delay = self.delay_for(attempt, e)
+                self.metrics.record_retry(e, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.metrics.record_success()
+            return result
@@ -0,0 +1,332 @@
+"""
+Batch API 로컬 대역 서버
+OpenAI의 파일/배치 엔드포인트(/v1/files, /v1/batches)를 흉내 내는 작은 HTTP 서버입니다.
+API 키와 비용 없이 배치 모드를 시험할 때 클라이언트의 base_url을 이 서버로 지정합니다.
+
+    python -m openai_common.local_batch_server --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python review_report_generator.py 리뷰.xlsx --batch-api
+
+응답 내용은 responder 함수가 만듭니다. 기본값은 요청의 response_format에 JSON 스키마가 있으면
+스키마에 맞는 예시 JSON을, 없으면 마지막 사용자 메시지를 그대로 돌려줍니다.
+"""
+
+import argparse
+import email
+import email.policy
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+Responder = Callable[[Dict[str, Any]], str]
+
+
+def echo_responder(body: Dict[str, Any]) -> str:
+    """마지막 사용자 메시지의 텍스트를 그대로 응답으로 돌려줍니다."""
+    for message in reversed(body.get('messages', [])):
+        if message.get('role') == 'user':
+            content = message.get('content')
+            if isinstance(content, list):
+                return "\n".join(part.get('text', '') for part in content if part.get('type') == 'text')
+            return str(content)
+    return ''
+
+
+def example_from_schema(schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    JSON 스키마에 맞는 가장 단순한 예시 값을 만듭니다.
+    enum/const는 첫 번째 값, 배열은 항목 하나, 객체는 모든 속성을 채우고 $ref와 anyOf는 따라갑니다.
+
+    Args:
+        schema: JSON 스키마 (또는 그 일부)
+        root: $ref를 찾을 최상위 스키마 (None이면 schema)
+
+    Returns:
+        스키마에 맞는 예시 값
+    """
+    root = root if root is not None else schema
+    if '$ref' in schema:
+        target: Any = root
+        for part in schema['$ref'].lstrip('#/').split('/'):
+            target = target[part]
+        return example_from_schema(target, root)
+    if 'const' in schema:
+        return schema['const']
+    if schema.get('enum'):
+        return schema['enum'][0]
+    for key in ('anyOf', 'oneOf', 'allOf'):
+        if schema.get(key):
+            return example_from_schema(schema[key][0], root)
+
+    schema_type = schema.get('type', 'object')
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != 'null'), 'null')
+    if schema_type == 'object':
+        return {name: example_from_schema(prop, root) for name, prop in schema.get('properties', {}).items()}
+    if schema_type == 'array':
+        return [example_from_schema(schema.get('items', {}), root)]
+    if schema_type == 'string':
+        return 'local'
+    if schema_type in ('integer', 'number'):
+        return 0
+    if schema_type == 'boolean':
+        return False
+    return None
+
+
+def schema_responder(body: Dict[str, Any]) -> str:
+    """
+    response_format의 JSON 스키마에 맞는 예시 JSON을 응답으로 돌려줍니다.
+    json_object 형식이면 빈 객체, 형식 지정이 없으면 echo_responder와 같이 동작합니다.
+    """
+    fmt = body.get('response_format') or {}
+    if fmt.get('type') == 'json_schema':
+        schema = (fmt.get('json_schema') or {}).get('schema') or {}
+        return json.dumps(example_from_schema(schema), ensure_ascii=False)
+    if fmt.get('type') == 'json_object':
+        return '{}'
+    return echo_responder(body)
+
+
+class LocalBatchServer:
+    """파일 업로드, 배치 생성/조회/취소, 결과 파일 다운로드를 메모리에서 처리하는 대역 서버"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 responder: Optional[Responder] = None, processing_delay: float = 0.0):
+        """
+        Args:
+            host: 바인딩할 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            responder: 요청 body를 받아 응답 텍스트를 돌려주는 함수 (예외를 던지면 해당 요청은 실패 처리,
+                None이면 schema_responder)
+            processing_delay: 배치를 제출한 뒤 완료 상태가 되기까지의 시간(초)
+        """
+        self.responder = responder or schema_responder
+        self.processing_delay = processing_delay
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()  # 배치 처리 중 결과 파일 저장에서 다시 잡음
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI 클라이언트의 base_url로 쓸 주소"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'LocalBatchServer':
+        """백그라운드 스레드에서 서버를 시작합니다."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """현재 스레드에서 서버를 실행합니다 (Ctrl+C로 종료)."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        """서버를 종료합니다."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _store_file(self, filename: str, data: bytes, purpose: str) -> Dict[str, Any]:
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        record = {
+            'id': file_id,
+            'object': 'file',
+            'bytes': len(data),
+            'created_at': int(time.time()),
+            'filename': filename,
+            'purpose': purpose,
+            'status': 'processed'
+        }
+        with self._lock:
+            self.files[file_id] = {'meta': record, 'data': data}
+        return record
+
+    def _process(self, batch: Dict[str, Any]):
+        """입력 파일의 요청을 responder로 처리하고 출력/오류 파일을 만듭니다."""
+        outputs, errors = [], []
+        data = self.files[batch['input_file_id']]['data'].decode('utf-8')
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            body = request.get('body', {})
+            try:
+                content = self.responder(body)
+            except Exception as e:
+                errors.append({
+                    'id': f"batch_req_{uuid.uuid4().hex[:16]}",
+                    'custom_id': request.get('custom_id'),
+                    'response': {'status_code': 500, 'body': {'error': {'message': str(e), 'type': 'server_error'}}},
+                    'error': None
+                })
+                continue
+            prompt_tokens = sum(len(str(message.get('content', ''))) // 4 for message in body.get('messages', []))
+            completion_tokens = len(content) // 4
+            outputs.append({
+                'id': f"batch_req_{uuid.uuid4().hex[:16]}",
+                'custom_id': request.get('custom_id'),
+                'response': {
+                    'status_code': 200,
+                    'request_id': uuid.uuid4().hex,
+                    'body': {
+                        'id': f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                        'object': 'chat.completion',
+                        'created': int(time.time()),
+                        'model': body.get('model', 'local'),
+                        'choices': [{
+                            'index': 0,
+                            'message': {'role': 'assistant', 'content': content},
+                            'finish_reason': 'stop'
+                        }],
+                        'usage': {
+                            'prompt_tokens': prompt_tokens,
+                            'completion_tokens': completion_tokens,
+                            'total_tokens': prompt_tokens + completion_tokens
+                        }
+                    }
+                },
+                'error': None
+            })
+
+        def to_jsonl(lines):
+            return ("\n".join(json.dumps(line, ensure_ascii=False) for line in lines) + "\n").encode('utf-8')
+
+        if outputs:
+            batch['output_file_id'] = self._store_file('batch_output.jsonl', to_jsonl(outputs), 'batch_output')['id']
+        if errors:
+            batch['error_file_id'] = self._store_file('batch_errors.jsonl', to_jsonl(errors), 'batch_output')['id']
+        batch['request_counts'] = {'total': len(outputs) + len(errors),
+                                   'completed': len(outputs), 'failed': len(errors)}
+        batch['status'] = 'completed'
+        batch['completed_at'] = int(time.time())
+
+    def _refresh(self, batch: Dict[str, Any]):
+        """제출 후 processing_delay가 지난 배치를 완료 처리합니다."""
+        if batch['status'] == 'in_progress' and time.time() - batch['created_at'] >= self.processing_delay:
+            self._process(batch)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, payload: Any = None, raw: Optional[bytes] = None):
+                data = raw if raw is not None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/octet-stream' if raw is not None else 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _not_found(self):
+                self._send(404, {'error': {'message': f"not found: {self.path}", 'type': 'invalid_request_error'}})
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+            def do_POST(self):
+                path = self.path.split('?')[0].rstrip('/')
+                if path == '/v1/files':
+                    message = email.message_from_bytes(
+                        f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode('utf-8') + self._body(),
+                        policy=email.policy.HTTP
+                    )
+                    fields = {part.get_param('name', header='content-disposition'): part
+                              for part in message.iter_parts()}
+                    upload = fields.get('file')
+                    if upload is None:
+                        return self._send(400, {'error': {'message': 'file is required'}})
+                    purpose = fields['purpose'].get_content().strip() if 'purpose' in fields else 'batch'
+                    record = server._store_file(upload.get_filename() or 'upload.jsonl',
+                                                upload.get_payload(decode=True), purpose)
+                    return self._send(200, record)
+
+                if path == '/v1/batches':
+                    request = json.loads(self._body() or b'{}')
+                    if request.get('input_file_id') not in server.files:
+                        return self._send(400, {'error': {'message': 'unknown input_file_id'}})
+                    batch = {
+                        'id': f"batch_{uuid.uuid4().hex[:24]}",
+                        'object': 'batch',
+                        'endpoint': request.get('endpoint'),
+                        'input_file_id': request['input_file_id'],
+                        'completion_window': request.get('completion_window', '24h'),
+                        'status': 'in_progress',
+                        'created_at': int(time.time()),
+                        'output_file_id': None,
+                        'error_file_id': None,
+                        'errors': None,
+                        'request_counts': {'total': 0, 'completed': 0, 'failed': 0},
+                        'metadata': request.get('metadata')
+                    }
+                    with server._lock:
+                        server.batches[batch['id']] = batch
+                        server._refresh(batch)
+                    return self._send(200, batch)
+
+                if path.startswith('/v1/batches/') and path.endswith('/cancel'):
+                    batch = server.batches.get(path.split('/')[3])
+                    if batch is None:
+                        return self._not_found()
+                    with server._lock:
+                        if batch['status'] not in ('completed', 'failed', 'expired'):
+                            batch['status'] = 'cancelled'
+                    return self._send(200, batch)
+
+                return self._not_found()
+
+            def do_GET(self):
+                path = self.path.split('?')[0].rstrip('/')
+                parts = path.split('/')
+                if path.startswith('/v1/batches/') and len(parts) == 4:
+                    batch = server.batches.get(parts[3])
+                    if batch is None:
+                        return self._not_found()
+                    with server._lock:
+                        server._refresh(batch)
+                    return self._send(200, batch)
+
+                if path.startswith('/v1/files/') and path.endswith('/content'):
+                    stored = server.files.get(parts[3])
+                    if stored is None:
+                        return self._not_found()
+                    return self._send(200, raw=stored['data'])
+
+                if path.startswith('/v1/files/') and len(parts) == 4:
+                    stored = server.files.get(parts[3])
+                    if stored is None:
+                        return self._not_found()
+                    return self._send(200, stored['meta'])
+
+                return self._not_found()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OpenAI Batch API 로컬 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1', help='바인딩할 주소 (기본값: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='포트 (기본값: 8765)')
+    parser.add_argument('--delay', type=float, default=0.0, help='배치가 완료되기까지의 시간(초)')
+    args = parser.parse_args()
+
+    server = LocalBatchServer(args.host, args.port, processing_delay=args.delay)
+    print(f"Batch API 대역 서버 실행 중: {server.base_url} (Ctrl+C로 종료)")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+구조화된 출력(Structured Outputs) 모듈
+pydantic 모델로 응답 형식을 정의해 strict JSON 스키마 response_format으로 보내고,
+응답을 같은 모델로 검증합니다. 검증에 실패한 응답은 한 번만 수정 요청을 보낼 수 있도록 메시지를 만들어 줍니다.
+"""
+
+import copy
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+class StructuredOutputError(Exception):
+    """응답이 요청한 스키마에 맞지 않거나 모델이 응답을 거부한 경우 발생하는 예외"""
+
+    def __init__(self, message: str, content: str = '', truncated: bool = False,
+                 refusal: Optional[str] = None):
+        """
+        Args:
+            message: 오류 설명
+            content: 검증에 실패한 응답 원문
+            truncated: 응답이 최대 토큰에서 잘렸는지 여부
+            refusal: 모델이 응답을 거부한 경우 거부 메시지
+        """
+        super().__init__(message)
+        self.content = content
+        self.truncated = truncated
+        self.refusal = refusal
+
+
+def _make_strict(node: Any):
+    """스키마의 모든 객체를 strict 모드 규칙(모든 필드 필수, 추가 필드 금지, 기본값 없음)에 맞춥니다."""
+    if isinstance(node, dict):
+        node.pop('default', None)
+        if node.get('type') == 'object' and 'properties' in node:
+            node['additionalProperties'] = False
+            node['required'] = list(node['properties'])
+        for value in node.values():
+            _make_strict(value)
+    elif isinstance(node, list):
+        for value in node:
+            _make_strict(value)
+
+
+def strict_json_schema(model_cls: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    pydantic 모델을 Structured Outputs의 strict JSON 스키마로 변환합니다.
+
+    Args:
+        model_cls: 응답 형식을 정의한 pydantic 모델
+
+    Returns:
+        JSON 스키마 딕셔너리
+    """
+    schema = copy.deepcopy(model_cls.model_json_schema())
+    _make_strict(schema)
+    return schema
+
+
+def response_format(model_cls: Type[BaseModel], name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    chat.completions.create의 response_format 인자를 만듭니다.
+
+    Args:
+        model_cls: 응답 형식을 정의한 pydantic 모델
+        name: 스키마 이름 (None이면 모델 이름)
+
+    Returns:
+        {'type': 'json_schema', 'json_schema': {...}} 딕셔너리
+    """
+    return {
+        'type': 'json_schema',
+        'json_schema': {
+            'name': name or model_cls.__name__,
+            'strict': True,
+            'schema': strict_json_schema(model_cls)
+        }
+    }
+
+
+def parse_structured_response(model_cls: Type[ModelT], response: Any) -> ModelT:
+    """
+    Chat Completion 응답을 pydantic 모델로 검증합니다.
+
+    Args:
+        model_cls: 응답 형식을 정의한 pydantic 모델
+        response: OpenAI 응답 객체
+
+    Returns:
+        검증된 모델 인스턴스
+
+    Raises:
+        StructuredOutputError: 모델이 응답을 거부했거나 응답이 스키마에 맞지 않는 경우
+    """
+    choice = response.choices[0]
+    message = choice.message
+    refusal = getattr(message, 'refusal', None)
+    if refusal:
+        raise StructuredOutputError(f"모델이 응답을 거부했습니다: {refusal}", refusal=refusal)
+
+    content = message.content or ''
+    truncated = choice.finish_reason == 'length'
+    try:
+        return model_cls.model_validate_json(content)
+    except ValidationError as e:
+        reason = "응답이 최대 토큰에서 잘렸습니다" if truncated else "응답이 스키마에 맞지 않습니다"
+        errors = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or '(전체)'}: {error['msg']}"
+            for error in e.errors()[:5]
+        )
+        raise StructuredOutputError(f"{reason} ({errors})", content=content, truncated=truncated) from e
+
+
+def repair_messages(messages: List[Dict[str, Any]], error: StructuredOutputError) -> List[Dict[str, Any]]:
+    """
+    스키마 검증에 실패한 응답을 고쳐 달라는 수정 요청 메시지를 만듭니다.
+
+    Args:
+        messages: 원래 요청 메시지 목록
+        error: parse_structured_response가 발생시킨 오류
+
+    Returns:
+        원래 메시지 뒤에 실패한 응답과 수정 요청을 덧붙인 메시지 목록
+    """
+    return messages + [
+        {'role': 'assistant', 'content': error.content},
+        {'role': 'user', 'content': f"직전 응답을 사용할 수 없습니다: {error}. "
+                                    f"같은 내용을 요구한 JSON 스키마에 맞게 다시 작성하고 JSON만 반환하세요."}
+    ]
@@ -0,0 +1,136 @@
+"""
+BatchRunner 테스트
+로컬 대역 서버(LocalBatchServer)에 배치를 제출하고, 순서가 뒤섞인 출력 파일과 오류 파일의 결과가
+원래 요청 순서로 돌아오는지, 중단 후 다시 실행하면 제출한 배치를 이어서 기다리는지 확인합니다.
+
+    python -m pytest openai_common
+"""
+
+import json
+import os
+from typing import List, Literal
+
+import openai
+import pytest
+from pydantic import BaseModel
+
+from openai_common import (BatchJobError, BatchRequestError, BatchRunner, UsageTracker,
+                           parse_structured_response, response_format)
+from openai_common.local_batch_server import LocalBatchServer, echo_responder
+
+
+class ShuffledOutputServer(LocalBatchServer):
+    """출력 파일의 줄 순서를 뒤집어 저장하는 대역 서버 (실제 API도 요청 순서를 보장하지 않음)"""
+
+    def _store_file(self, filename, data, purpose):
+        if filename == 'batch_output.jsonl':
+            lines = data.decode('utf-8').splitlines()
+            data = ("\n".join(reversed(lines)) + "\n").encode('utf-8')
+        return super()._store_file(filename, data, purpose)
+
+
+def failing_echo(body):
+    """'fail'이 들어간 요청은 실패시키고 나머지는 그대로 돌려주는 responder"""
+    text = echo_responder(body)
+    if 'fail' in text:
+        raise RuntimeError(f"거부된 요청: {text}")
+    return text
+
+
+def requests_for(prompts: List[str]):
+    return [{'messages': [{'role': 'user', 'content': prompt}], 'max_tokens': 10} for prompt in prompts]
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(server_cls=LocalBatchServer, **kwargs):
+        server = server_cls(**kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def make_runner(server, work_dir, **kwargs):
+    client = openai.OpenAI(api_key='test-key', base_url=server.base_url, max_retries=0)
+    return BatchRunner(client, UsageTracker(), work_dir=str(work_dir), poll_interval=0.01, **kwargs)
+
+
+def test_results_follow_request_order_with_shuffled_output_and_errors(tmp_path, start_server):
+    server = start_server(ShuffledOutputServer, responder=failing_echo)
+    runner = make_runner(server, tmp_path)
+    prompts = ['zero', 'one', 'fail two', 'three', 'four', 'fail five']
+
+    results = runner.run('echo', 'gpt-4o-mini', requests_for(prompts))
+
+    assert len(results) == len(prompts)
+    for prompt, result in zip(prompts, results):
+        if prompt.startswith('fail'):
+            assert isinstance(result, BatchRequestError)
+            assert prompt in str(result) and 'HTTP 500' in str(result)
+        else:
+            assert result.choices[0].message.content == prompt
+
+    (batch,) = server.batches.values()
+    assert batch['output_file_id'] and batch['error_file_id']
+    summary = runner.usage.summary()['total']
+    assert summary['calls'] == len(prompts)
+    assert summary['batch_runs'] == 1
+
+
+def test_requests_split_across_batches_keep_their_order(tmp_path, start_server):
+    server = start_server(ShuffledOutputServer)
+    runner = make_runner(server, tmp_path, max_requests_per_batch=2)
+    prompts = [f"prompt {n}" for n in range(5)]
+
+    results = runner.run('echo', 'gpt-4o-mini', requests_for(prompts))
+
+    assert len(server.batches) == 3
+    assert [result.choices[0].message.content for result in results] == prompts
+
+
+def test_rerun_resumes_submitted_batch_from_state_file(tmp_path, start_server):
+    server = start_server(processing_delay=3600)
+    prompts = ['first', 'second']
+
+    with pytest.raises(BatchJobError):
+        make_runner(server, tmp_path, max_wait=0).run('echo', 'gpt-4o-mini', requests_for(prompts))
+
+    (state_name,) = [name for name in os.listdir(tmp_path) if name.endswith('.state.json')]
+    with open(tmp_path / state_name, encoding='utf-8') as f:
+        submitted_id = json.load(f)['batch_id']
+    files_before = len(server.files)
+
+    server.processing_delay = 0
+    results = make_runner(server, tmp_path).run('echo', 'gpt-4o-mini', requests_for(prompts))
+
+    assert [result.choices[0].message.content for result in results] == prompts
+    assert list(server.batches) == [submitted_id]
+    # 입력 파일을 다시 올리지 않았고, 새로 생긴 파일은 출력 파일뿐
+    assert len(server.files) == files_before + 1
+
+
+class Finding(BaseModel):
+    label: Literal['good', 'bad']
+    score: int
+
+
+class Report(BaseModel):
+    title: str
+    findings: List[Finding]
+
+
+def test_default_responder_returns_schema_valid_json(tmp_path, start_server):
+    server = start_server()
+    runner = make_runner(server, tmp_path)
+    request = requests_for(['보고서를 만들어 주세요'])[0]
+    request['response_format'] = response_format(Report)
+
+    (response,) = runner.run('report', 'gpt-4o-mini', [request])
+
+    report = parse_structured_response(Report, response)
+    assert report.findings[0].label == 'good'
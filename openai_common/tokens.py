@@ -0,0 +1,137 @@
+"""
+토큰 계산 모듈
+요청을 보내기 전에 프롬프트의 토큰 수를 로컬에서 계산하고, 토큰 단위로 텍스트를 자릅니다.
+tiktoken이 설치되어 있으면 모델의 실제 토크나이저를 사용하고, 없으면 글자 종류별 근사치를 사용합니다.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+
+# 메시지 하나에 붙는 역할/구분자 토큰, 응답 시작 토큰
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+# 이미지 한 장의 기본 토큰 수 (고해상도 타일 기준 근사치)
+IMAGE_TOKENS = 765
+
+# 첨부 파일(PDF 등)은 추출 전이라 정확히 알 수 없으므로 원본 바이트 수로 근사
+FILE_BYTES_PER_TOKEN = 8
+
+_HANGUL_OR_CJK = re.compile(r'[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7a3]')
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """모델에 맞는 tiktoken 인코딩을 반환합니다 (tiktoken이 없으면 None)."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # 아직 tiktoken에 등록되지 않은 최신 모델은 최신 인코딩 사용
+            return tiktoken.get_encoding('o200k_base')
+    except Exception as e:
+        # 인코딩 파일을 내려받지 못한 경우(오프라인 등) 근사치 사용
+        print(f"tiktoken 인코딩을 불러오지 못해 근사치로 토큰 수를 계산합니다: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = 'gpt-4o-mini') -> int:
+    """
+    텍스트의 토큰 수를 계산합니다.
+
+    Args:
+        text: 계산할 텍스트
+        model: 토크나이저를 고를 모델명
+
+    Returns:
+        토큰 수 (tiktoken이 없으면 근사치)
+    """
+    if not text:
+        return 0
+
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    # 근사치: 한글/한자/가나는 글자당 약 1토큰, 그 밖의 문자는 4글자당 약 1토큰
+    wide = len(_HANGUL_OR_CJK.findall(text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+def _count_content_tokens(content: Any, model: str) -> int:
+    """메시지 content(문자열 또는 멀티모달 파트 리스트)의 토큰 수를 계산합니다."""
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return count_tokens(content, model)
+
+    total = 0
+    for part in content:
+        part_type = part.get('type')
+        if part_type == 'text':
+            total += count_tokens(part.get('text', ''), model)
+        elif part_type == 'image_url':
+            total += IMAGE_TOKENS
+        elif part_type == 'file':
+            file_data = part.get('file', {}).get('file_data', '')
+            # base64 4글자 = 원본 3바이트
+            total += len(file_data) * 3 // 4 // FILE_BYTES_PER_TOKEN
+    return total
+
+
+def count_message_tokens(messages: List[Dict[str, Any]], model: str = 'gpt-4o-mini') -> int:
+    """
+    Chat Completion 요청 메시지 목록의 입력 토큰 수를 계산합니다.
+
+    Args:
+        messages: 전송할 메시지 목록
+        model: 토크나이저를 고를 모델명
+
+    Returns:
+        입력 토큰 수
+    """
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        total += TOKENS_PER_MESSAGE
+        total += _count_content_tokens(message.get('content'), model)
+    return total
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = 'gpt-4o-mini') -> Tuple[str, bool]:
+    """
+    텍스트를 최대 토큰 수 이하로 자릅니다.
+
+    Args:
+        text: 자를 텍스트
+        max_tokens: 최대 토큰 수
+        model: 토크나이저를 고를 모델명
+
+    Returns:
+        (잘린 텍스트, 잘렸는지 여부)
+    """
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        token_ids = encoding.encode(text, disallowed_special=())
+        if len(token_ids) <= max_tokens:
+            return text, False
+        return encoding.decode(token_ids[:max_tokens]), True
+
+    if count_tokens(text, model) <= max_tokens:
+        return text, False
+
+    # 근사 토큰 수가 예산 안에 들어오는 가장 긴 앞부분을 이진 탐색
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle], model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low], True
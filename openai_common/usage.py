@@ -0,0 +1,331 @@
+"""
+토큰 사용량/비용/지연 시간 기록 모듈
+요청 전에 호출별/실행별 토큰 예산을 확인하고, 응답의 실제 사용량과 지연 시간을 모아
+실행이 끝났을 때 작업별 비용/지연 시간 보고서를 만듭니다.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .client import RetryPolicy
+from .tokens import count_message_tokens
+
+
+# 모델별 100만 토큰당 가격 (USD, 입력/출력). 모델명 앞부분이 가장 길게 일치하는 항목을 사용
+MODEL_PRICES = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4.1-nano': (0.10, 0.40),
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1': (2.00, 8.00),
+    'gpt-5-nano': (0.05, 0.40),
+    'gpt-5-mini': (0.25, 2.00),
+    'gpt-5': (1.25, 10.00),
+}
+
+# Batch API 요청의 가격 비율 (동기 호출 대비)
+BATCH_PRICE_RATIO = 0.5
+
+
+class TokenBudgetExceeded(Exception):
+    """요청이 호출별 또는 실행별 토큰 예산을 넘을 때 발생하는 예외"""
+
+
+def model_price(model: str) -> Optional[tuple]:
+    """
+    모델의 100만 토큰당 (입력, 출력) 가격을 반환합니다.
+
+    Args:
+        model: 모델명 (예: 'gpt-4o-mini-2024-07-18')
+
+    Returns:
+        (입력 가격, 출력 가격), 가격표에 없으면 None
+    """
+    matches = [name for name in MODEL_PRICES if model.startswith(name)]
+    if not matches:
+        return None
+    return MODEL_PRICES[max(matches, key=len)]
+
+
+class UsageTracker:
+    """OpenAI 호출의 토큰 예산을 관리하고 사용량/비용/지연 시간을 기록하는 클래스"""
+
+    def __init__(self, run_token_budget: Optional[int] = None,
+                 call_token_budget: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Args:
+            run_token_budget: 한 번의 실행에서 사용할 최대 토큰 수 (입력 + 최대 출력, None이면 제한 없음)
+            call_token_budget: 요청 하나의 최대 입력 토큰 수 (None이면 제한 없음)
+            retry_policy: 일시적인 오류의 재시도 정책 (None이면 기본 정책)
+        """
+        self.run_token_budget = run_token_budget
+        self.call_token_budget = call_token_budget
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._lock = threading.Lock()
+        self._reserved = 0  # 응답을 기다리는 요청이 예약한 토큰 수
+        self._used = 0      # 응답이 끝난 요청이 실제로 사용한 토큰 수
+        self._records: List[Dict[str, Any]] = []
+        self._batch_runs: List[Dict[str, Any]] = []  # Batch API 실행별 {'label', 'requests', 'elapsed'}
+
+    @classmethod
+    def from_env(cls) -> 'UsageTracker':
+        """
+        환경 변수 OPENAI_RUN_TOKEN_BUDGET, OPENAI_CALL_TOKEN_BUDGET에서 예산을 읽어 생성합니다.
+        값이 없거나 0이면 제한하지 않습니다.
+        """
+        def read(name: str) -> Optional[int]:
+            try:
+                return int(os.getenv(name, '0')) or None
+            except ValueError:
+                return None
+
+        return cls(read('OPENAI_RUN_TOKEN_BUDGET'), read('OPENAI_CALL_TOKEN_BUDGET'))
+
+    @property
+    def used_tokens(self) -> int:
+        """지금까지 사용한 토큰 수"""
+        return self._used
+
+    def reserve(self, prompt_tokens: int, max_tokens: int = 0):
+        """
+        요청을 보내기 전에 예산을 확인하고 토큰을 예약합니다.
+
+        Args:
+            prompt_tokens: 로컬에서 계산한 입력 토큰 수
+            max_tokens: 응답 최대 토큰 수
+
+        Raises:
+            TokenBudgetExceeded: 호출별 또는 실행별 예산을 넘는 경우
+        """
+        if self.call_token_budget is not None and prompt_tokens > self.call_token_budget:
+            raise TokenBudgetExceeded(
+                f"요청 입력이 {prompt_tokens:,}토큰으로 호출별 예산 {self.call_token_budget:,}토큰을 넘습니다."
+            )
+
+        with self._lock:
+            requested = prompt_tokens + max_tokens
+            if (self.run_token_budget is not None
+                    and self._used + self._reserved + requested > self.run_token_budget):
+                raise TokenBudgetExceeded(
+                    f"실행별 토큰 예산 {self.run_token_budget:,}토큰을 넘습니다 "
+                    f"(사용 {self._used:,}, 진행 중 {self._reserved:,}, 요청 {requested:,})."
+                )
+            self._reserved += requested
+
+    def release(self, prompt_tokens: int, max_tokens: int = 0):
+        """
+        보내지 않기로 한 요청의 예약을 취소합니다.
+
+        Args:
+            prompt_tokens: reserve에 전달한 입력 토큰 수
+            max_tokens: reserve에 전달한 응답 최대 토큰 수
+        """
+        with self._lock:
+            self._reserved = max(0, self._reserved - (prompt_tokens + max_tokens))
+
+    def record(self, label: str, model: str, estimated_prompt_tokens: int, max_tokens: int,
+               response: Any, latency: Optional[float], batch: bool = False):
+        """
+        응답의 실제 사용량과 지연 시간을 기록하고 예약한 토큰을 정산합니다.
+
+        Args:
+            label: 작업 이름 (보고서에서 작업별로 묶는 기준)
+            model: 모델명
+            estimated_prompt_tokens: 로컬에서 계산한 입력 토큰 수
+            max_tokens: 응답 최대 토큰 수
+            response: OpenAI 응답 객체 (실패한 요청이면 None)
+            latency: 요청 지연 시간(초, 요청별 지연 시간이 없는 Batch API 요청은 None)
+            batch: Batch API로 처리한 요청인지 여부 (비용을 배치 가격으로 계산)
+        """
+        usage = getattr(response, 'usage', None)
+        prompt_tokens = getattr(usage, 'prompt_tokens', None)
+        completion_tokens = getattr(usage, 'completion_tokens', None)
+        if prompt_tokens is None:
+            # 사용량이 없는 응답(또는 실패)은 입력 토큰 계산값으로 대신함
+            prompt_tokens = estimated_prompt_tokens if response is not None else 0
+            completion_tokens = completion_tokens or 0
+
+        finish_reason = None
+        choices = getattr(response, 'choices', None)
+        if choices:
+            finish_reason = getattr(choices[0], 'finish_reason', None)
+
+        with self._lock:
+            self._reserved = max(0, self._reserved - (estimated_prompt_tokens + max_tokens))
+            self._used += prompt_tokens + completion_tokens
+            self._records.append({
+                'label': label,
+                'model': model,
+                'estimated_prompt_tokens': estimated_prompt_tokens,
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'latency': latency,
+                'ok': response is not None,
+                'batch': batch,
+                # 응답이 최대 토큰에서 잘린 경우
+                'truncated': finish_reason == 'length'
+            })
+
+    def record_batch_run(self, label: str, requests: int, elapsed: float):
+        """
+        Batch API 실행 한 번의 전체 대기 시간을 기록합니다.
+        배치 안의 요청은 함께 처리되므로 요청별 지연 시간 대신 실행 단위로 한 번만 기록합니다.
+
+        Args:
+            label: 작업 이름
+            requests: 실행에 포함된 요청 수
+            elapsed: 제출부터 결과를 받을 때까지 걸린 시간(초)
+        """
+        with self._lock:
+            self._batch_runs.append({'label': label, 'requests': requests, 'elapsed': elapsed})
+
+    def create_chat_completion(self, client, label: str, messages: List[Dict[str, Any]],
+                               model: str, before_attempt: Optional[Callable[[], None]] = None,
+                               **kwargs):
+        """
+        예산을 확인한 뒤 Chat Completion API를 호출하고 사용량을 기록합니다.
+        일시적인 오류는 재시도 정책에 따라 다시 시도하며, 지연 시간에는 재시도 대기 시간도 포함됩니다.
+
+        Args:
+            client: OpenAI 클라이언트
+            label: 작업 이름
+            messages: 전송할 메시지 목록
+            model: 모델명
+            before_attempt: 재시도를 포함한 매 시도 직전에 호출할 함수 (예: 속도 제한기의 acquire)
+            **kwargs: chat.completions.create에 그대로 전달할 인자
+                (max_tokens 또는 max_completion_tokens는 예산 계산에도 사용)
+
+        Returns:
+            OpenAI 응답 객체
+
+        Raises:
+            TokenBudgetExceeded: 예산을 넘는 경우 (요청을 보내지 않음)
+            openai.OpenAIError: 재시도 후에도 실패한 경우
+        """
+        prompt_tokens = count_message_tokens(messages, model)
+        max_tokens = kwargs.get('max_tokens') or kwargs.get('max_completion_tokens') or 0
+        self.reserve(prompt_tokens, max_tokens)
+
+        def attempt():
+            if before_attempt is not None:
+                before_attempt()
+            return client.chat.completions.create(model=model, messages=messages, **kwargs)
+
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self.retry_policy.call(attempt)
+            return response
+        finally:
+            self.record(label, model, prompt_tokens, max_tokens, response,
+                        time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        작업별/전체 사용량, 비용, 지연 시간을 집계합니다.
+
+        Returns:
+            {'total': {...}, 'by_label': {작업 이름: {...}}, 'client': 재시도 지표}
+        """
+        with self._lock:
+            records = list(self._records)
+            batch_runs = list(self._batch_runs)
+
+        def aggregate(items: List[Dict[str, Any]], runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+            # 지연 시간 통계는 요청별로 잰 동기 호출만 사용 (Batch API는 실행별 대기 시간으로 따로 집계)
+            latencies = sorted(item['latency'] for item in items if item['latency'] is not None)
+            cost = 0.0
+            priced = True
+            for item in items:
+                price = model_price(item['model'])
+                if price is None:
+                    priced = False
+                    continue
+                ratio = BATCH_PRICE_RATIO if item['batch'] else 1.0
+                cost += (item['prompt_tokens'] * price[0]
+                         + item['completion_tokens'] * price[1]) * ratio / 1_000_000
+
+            return {
+                'calls': len(items),
+                'batch_calls': sum(1 for item in items if item['batch']),
+                'failed_calls': sum(1 for item in items if not item['ok']),
+                'truncated_responses': sum(1 for item in items if item['truncated']),
+                'estimated_prompt_tokens': sum(item['estimated_prompt_tokens'] for item in items),
+                'prompt_tokens': sum(item['prompt_tokens'] for item in items),
+                'completion_tokens': sum(item['completion_tokens'] for item in items),
+                'cost_usd': round(cost, 6) if priced else None,
+                'timed_calls': len(latencies),
+                'total_latency': round(sum(latencies), 3),
+                'avg_latency': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                # 가장 가까운 순위(nearest-rank) 방식: 값의 95%가 이 값 이하
+                'p95_latency': round(latencies[math.ceil(0.95 * len(latencies)) - 1], 3) if latencies else 0.0,
+                'batch_runs': len(runs),
+                'batch_wall_time': round(sum(run['elapsed'] for run in runs), 3)
+            }
+
+        by_label: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_label.setdefault(record['label'], []).append(record)
+
+        return {
+            'total': aggregate(records, batch_runs),
+            'by_label': {label: aggregate(items, [run for run in batch_runs if run['label'] == label])
+                         for label, items in by_label.items()},
+            'client': self.retry_policy.metrics.snapshot()
+        }
+
+    def report(self) -> str:
+        """
+        실행별 비용/지연 시간 보고서를 문자열로 만듭니다.
+
+        Returns:
+            보고서 문자열
+        """
+        summary = self.summary()
+        lines = ["OpenAI 사용량 보고서", "-" * 60]
+
+        def describe(name: str, stats: Dict[str, Any]) -> str:
+            cost = f"${stats['cost_usd']:.4f}" if stats['cost_usd'] is not None else "가격 정보 없음"
+            line = (f"{name}: 호출 {stats['calls']}회, 입력 {stats['prompt_tokens']:,}토큰 "
+                    f"(예상 {stats['estimated_prompt_tokens']:,}), 출력 {stats['completion_tokens']:,}토큰, "
+                    f"비용 {cost}")
+            if stats['timed_calls']:
+                line += f", 평균 {stats['avg_latency']:.2f}초 / p95 {stats['p95_latency']:.2f}초"
+            if stats['batch_calls']:
+                line += (f", Batch API {stats['batch_calls']}건 "
+                         f"(실행 {stats['batch_runs']}회, 대기 {stats['batch_wall_time']:.1f}초)")
+            if stats['failed_calls']:
+                line += f", 실패 {stats['failed_calls']}회"
+            if stats['truncated_responses']:
+                line += f", 응답 잘림 {stats['truncated_responses']}회"
+            return line
+
+        for label, stats in summary['by_label'].items():
+            lines.append(describe(label, stats))
+        lines.append("-" * 60)
+        lines.append(describe("전체", summary['total']))
+
+        client = summary['client']
+        if client['retries'] or client['failures']:
+            errors = ", ".join(f"{name} {count}회" for name, count in client['errors'].items())
+            lines.append(f"재시도 {client['retries']}회 (대기 {client['retry_wait']:.1f}초), "
+                         f"최종 실패 {client['failures']}회 [{errors}]")
+        return "\n".join(lines)
+
+    def save_report(self, path: str):
+        """
+        사용량 집계를 JSON 파일로 저장합니다.
+
+        Args:
+            path: 저장할 파일 경로
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
@@ -5,49 +5,192 @@ PDF 텍스트 추출 프로그램
 
 import fitz  # PyMuPDF
 import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 
+# 콘솔에 미리 보여줄 최대 글자 수
+PREVIEW_CHARS = 2000
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+# 병렬 추출 설정: 작업 프로세스 하나가 맡을 최소 페이지 수 (이보다 작은 문서는 한 프로세스로 추출)
+PAGES_PER_WORKER = 100
+# 작업 프로세스마다 나눌 페이지 구간 수 (페이지별 처리 시간 차이를 고르게 분산)
+SHARDS_PER_WORKER = 4
+
+
+def auto_workers(page_count: int, max_workers: Optional[int] = None) -> int:
     """
-    PDF 파일에서 텍스트를 추출합니다.
+    페이지 수에 맞는 추출 프로세스 수를 정합니다.
+    프로세스를 띄우고 문서를 다시 여는 비용이 있으므로 PAGES_PER_WORKER 페이지마다 하나씩만 늘립니다.
     
     Args:
-        pdf_path: PDF 파일 경로
+        page_count: 문서의 페이지 수
+        max_workers: 최대 프로세스 수 (None이면 CPU 코어 수)
         
     Returns:
-        추출된 텍스트
+        추출 프로세스 수 (1이면 현재 프로세스에서 추출)
     """
-    text_content = []
-    
+    max_workers = max_workers or os.cpu_count() or 1
+    return max(1, min(max_workers, page_count // PAGES_PER_WORKER))
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """작업 프로세스에서 문서를 따로 열어 [start, stop) 구간 페이지의 텍스트를 추출합니다."""
+    pages = []
+    doc = fitz.open(pdf_path)
     try:
-        doc = fitz.open(pdf_path)
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            
+        for page_num in range(start, stop):
+            text = doc[page_num].get_text()
             if text.strip():
-                text_content.append(f"--- 페이지 {page_num + 1} ---")
-                text_content.append(text)
+                pages.append((page_num + 1, text))
+    finally:
+        doc.close()
+    return pages
+
+
+def iter_pdf_pages(pdf_path: str, workers: Optional[int] = 1) -> Iterator[Tuple[int, str]]:
+    """
+    PDF 파일의 페이지 텍스트를 한 페이지씩 돌려줍니다.
+    문서 전체를 메모리에 모으지 않으므로 수천 페이지 문서도 한 페이지 분량의 메모리로 처리합니다.
+    
+    workers가 2 이상이면 페이지 범위를 구간으로 나누어 여러 프로세스에서 동시에 추출하고
+    (각 프로세스가 문서를 따로 엶), 결과는 페이지 순서대로 돌려줍니다.
+    이때 메모리에는 처리 중인 구간의 텍스트만 올라갑니다.
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        workers: 추출 프로세스 수 (1이면 현재 프로세스에서 추출, None이면 페이지 수에 맞춰 자동 설정)
         
+    Yields:
+        (페이지 번호(1부터), 페이지 텍스트) 튜플 (텍스트가 없는 페이지는 건너뜀)
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        page_count = len(doc)
+        if workers is None:
+            workers = auto_workers(page_count)
+        workers = min(workers, page_count)
+        if workers <= 1:
+            for page_num in range(page_count):
+                text = doc[page_num].get_text()
+                if text.strip():
+                    yield page_num + 1, text
+            return
+    finally:
         doc.close()
+    
+    shard_size = -(-page_count // (workers * SHARDS_PER_WORKER))
+    shards = iter(range(0, page_count, shard_size))
+    pending = []  # 제출 순서(= 페이지 순서)대로 쌓인 future
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def fill():
+            # 구간 결과가 메모리에 쌓이지 않도록 프로세스 수의 두 배까지만 미리 제출
+            while len(pending) < workers * 2:
+                start = next(shards, None)
+                if start is None:
+                    return
+                pending.append(pool.submit(_extract_page_range, pdf_path, start,
+                                           min(start + shard_size, page_count)))
+        
+        fill()
+        while pending:
+            pages = pending.pop(0).result()
+            fill()
+            yield from pages
+
+
+def iter_pdf_text(pdf_path: str, workers: Optional[int] = 1) -> Iterator[str]:
+    """
+    페이지 표시('--- 페이지 N ---')가 붙은 추출 텍스트를 조각 단위로 돌려줍니다.
+    돌려준 조각을 이어 붙이면 extract_text_from_pdf의 결과와 같습니다.
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        workers: 추출 프로세스 수 (iter_pdf_pages 참고)
+        
+    Yields:
+        텍스트 조각
+    """
+    separator = ""
+    for page_num, text in iter_pdf_pages(pdf_path, workers):
+        yield f"{separator}--- 페이지 {page_num} ---\n"
+        yield text
+        separator = "\n"
+
+
+def extract_text_from_pdf(pdf_path: str, workers: Optional[int] = 1) -> str:
+    """
+    PDF 파일에서 텍스트를 추출합니다.
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        workers: 추출 프로세스 수 (1이면 현재 프로세스, None이면 페이지 수에 맞춰 자동 설정)
         
+    Returns:
+        추출된 텍스트
+    """
+    try:
+        return "".join(iter_pdf_text(pdf_path, workers))
     except Exception as e:
         return f"오류 발생: {str(e)}"
+
+
+def extract_pdf_to_file(pdf_path: str, output_file: str, workers: Optional[int] = 1) -> dict:
+    """
+    PDF 파일의 텍스트를 페이지마다 바로 파일에 기록합니다.
+    임시 파일에 쓴 뒤 끝나면 교체하므로, 도중에 실패해도 일부만 쓴 파일이 남지 않습니다
+    (실패하면 기존 동작처럼 오류 메시지를 파일에 저장).
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        output_file: 저장할 텍스트 파일 경로
+        workers: 추출 프로세스 수 (1이면 현재 프로세스, None이면 페이지 수에 맞춰 자동 설정)
+        
+    Returns:
+        {'pages': 텍스트가 있는 페이지 수, 'chars': 전체 글자 수, 'preview': 앞부분 텍스트} 딕셔너리
+    """
+    temp_file = f"{output_file}.part"
+    pages = chars = 0
+    preview = []
     
-    return "\n".join(text_content)
+    try:
+        with open(temp_file, "w", encoding="utf-8") as f:
+            for page_num, text in iter_pdf_pages(pdf_path, workers):
+                header = f"--- 페이지 {page_num} ---\n"
+                for piece in ("\n" + header if pages else header, text):
+                    f.write(piece)
+                    if chars < PREVIEW_CHARS:
+                        preview.append(piece[:PREVIEW_CHARS - chars])
+                    chars += len(piece)
+                pages += 1
+        os.replace(temp_file, output_file)
+    except Exception as e:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        error = f"오류 발생: {str(e)}"
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(error)
+        return {'pages': 0, 'chars': len(error), 'preview': error}
+    
+    return {'pages': pages, 'chars': chars, 'preview': "".join(preview)}
 
 
-def extract_all_pdfs(folder_path: str = ".") -> dict:
+def extract_all_pdfs(folder_path: str = ".", output_folder: str = "extracted_texts",
+                     workers: Optional[int] = None) -> dict:
     """
-    폴더 내 모든 PDF 파일에서 텍스트를 추출합니다.
+    폴더 내 모든 PDF 파일에서 텍스트를 추출해 파일별 텍스트 파일로 바로 저장합니다.
+    한 번에 한 페이지씩 기록하므로 폴더 전체나 문서 전체의 텍스트를 메모리에 모으지 않습니다.
     
     Args:
         folder_path: 검색할 폴더 경로 (기본값: 현재 폴더)
+        output_folder: 출력 폴더명
+        workers: 문서 하나를 나누어 추출할 프로세스 수 (None이면 페이지 수에 맞춰 자동 설정)
         
     Returns:
-        {파일명: 추출된 텍스트} 형태의 딕셔너리
+        {파일명: {'path', 'pages', 'chars', 'preview'}} 형태의 딕셔너리 (preview는 앞부분 텍스트만 포함)
     """
     results = {}
     folder = Path(folder_path)
@@ -60,62 +203,110 @@ def extract_all_pdfs(folder_path: str = ".") -> dict:
     
     print(f"총 {len(pdf_files)}개의 PDF 파일을 발견했습니다.\n")
     
+    output_path = Path(output_folder)
+    output_path.mkdir(exist_ok=True)
+    
     for pdf_file in sorted(pdf_files):
         print(f"처리 중: {pdf_file.name}")
-        text = extract_text_from_pdf(str(pdf_file))
-        results[pdf_file.name] = text
+        output_file = output_path / f"{pdf_file.stem}.txt"
+        info = extract_pdf_to_file(str(pdf_file), str(output_file), workers)
+        info['path'] = str(output_file)
+        results[pdf_file.name] = info
+        print(f"저장됨: {output_file} ({info['pages']}페이지, {info['chars']:,}자)")
     
     return results
 
 
-def save_extracted_text(results: dict, output_folder: str = "extracted_texts"):
+def benchmark_extraction(pdf_path: str, worker_counts: Optional[List[int]] = None) -> List[dict]:
     """
-    추출된 텍스트를 파일로 저장합니다.
+    추출 프로세스 수별 추출 시간을 측정해 속도 향상 곡선을 출력합니다.
+    모든 결과가 한 프로세스로 추출한 텍스트와 같은지도 확인합니다.
     
     Args:
-        results: {파일명: 텍스트} 딕셔너리
-        output_folder: 출력 폴더명
+        pdf_path: 측정할 PDF 파일 경로
+        worker_counts: 측정할 프로세스 수 목록 (None이면 1, 2, 4, ...부터 CPU 코어 수까지)
+        
+    Returns:
+        [{'workers', 'seconds', 'speedup', 'pages_per_second', 'identical'}] 리스트
     """
-    output_path = Path(output_folder)
-    output_path.mkdir(exist_ok=True)
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
     
-    for filename, text in results.items():
-        output_file = output_path / f"{Path(filename).stem}.txt"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(text)
-        print(f"저장됨: {output_file}")
+    if worker_counts is None:
+        cpu_count = os.cpu_count() or 1
+        worker_counts = [1]
+        while worker_counts[-1] * 2 < cpu_count:
+            worker_counts.append(worker_counts[-1] * 2)
+        if cpu_count > 1:
+            worker_counts.append(cpu_count)
+    
+    print(f"벤치마크: {Path(pdf_path).name} ({page_count:,}페이지, "
+          f"자동 설정 시 {auto_workers(page_count)}개 프로세스)\n")
+    print(f"{'프로세스':>8} {'시간(초)':>10} {'속도 향상':>10} {'페이지/초':>10}  결과 일치")
+    
+    rows = []
+    baseline_text = baseline_seconds = None
+    for workers in worker_counts:
+        started = time.perf_counter()
+        text = "".join(iter_pdf_text(pdf_path, workers))
+        seconds = time.perf_counter() - started
+        if baseline_text is None:
+            baseline_text, baseline_seconds = text, seconds
+        row = {
+            'workers': workers,
+            'seconds': seconds,
+            'speedup': baseline_seconds / seconds if seconds else 0.0,
+            'pages_per_second': page_count / seconds if seconds else 0.0,
+            'identical': text == baseline_text
+        }
+        rows.append(row)
+        print(f"{workers:>8} {seconds:>10.2f} {row['speedup']:>9.2f}x {row['pages_per_second']:>10.1f}  "
+              f"{'✅' if row['identical'] else '❌'}")
+    return rows
 
 
 def main():
+    parser = argparse.ArgumentParser(description="폴더 안의 PDF 파일에서 텍스트를 추출합니다.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="문서 하나를 페이지 구간으로 나누어 추출할 프로세스 수 (기본값: 페이지 수에 맞춰 자동 설정)"
+    )
+    parser.add_argument(
+        "--benchmark",
+        metavar="PDF",
+        help="지정한 PDF로 프로세스 수별 추출 속도를 측정하고 종료"
+    )
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark_extraction(args.benchmark, sorted({1, args.workers}) if args.workers else None)
+        return
+    
     print("=" * 60)
     print("PDF 텍스트 추출 프로그램")
     print("=" * 60)
     print()
     
-    # 현재 폴더의 PDF 파일들에서 텍스트 추출
-    results = extract_all_pdfs(".")
+    # 현재 폴더의 PDF 파일들에서 텍스트를 추출해 바로 텍스트 파일로 저장
+    results = extract_all_pdfs(".", workers=args.workers)
     
     if not results:
         return
     
-    print()
-    print("-" * 60)
-    
-    # 결과를 텍스트 파일로 저장
-    save_extracted_text(results)
-    
     print()
     print("-" * 60)
     print()
     
-    # 콘솔에 결과 출력
-    for filename, text in results.items():
+    # 콘솔에 결과 출력 (처음 2000자만)
+    for filename, info in results.items():
         print(f"\n{'=' * 60}")
         print(f"파일: {filename}")
         print("=" * 60)
-        print(text[:2000] if len(text) > 2000 else text)  # 처음 2000자만 출력
-        if len(text) > 2000:
-            print(f"\n... (총 {len(text)}자, 나머지는 저장된 파일에서 확인)")
+        print(info['preview'])
+        if info['chars'] > PREVIEW_CHARS:
+            print(f"\n... (총 {info['chars']}자, 나머지는 저장된 파일에서 확인)")
     
     print()
     print("=" * 60)
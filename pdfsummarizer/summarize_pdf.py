@@ -3,56 +3,130 @@ PDF 요약 프로그램
 추출된 텍스트를 OpenAI GPT API로 요약합니다.
 """
 
+import hashlib
 import os
+import re
+import sys
+import time
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
-from openai import OpenAI
-import fitz  # PyMuPDF
+
+# 저장소 루트의 공용 모듈(openai_common) 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from openai_common import (BatchJobError, BatchRunner, TokenBudgetExceeded, UsageTracker, count_tokens,
+                           get_client, truncate_to_tokens)
+from extract_pdf_text import extract_text_from_pdf
+from summary_cache import PdfManifest, SummaryCache
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
-# OpenAI 클라이언트 생성
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# OpenAI 클라이언트 (연결 풀을 공유하는 공용 클라이언트)
+client = get_client(os.getenv("OPENAI_API_KEY"))
 
+MODEL = "gpt-4o-mini"
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """PDF 파일에서 텍스트를 추출합니다."""
-    text_content = []
-    
-    try:
-        doc = fitz.open(pdf_path)
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            if text.strip():
-                text_content.append(text)
-        doc.close()
-    except Exception as e:
-        return f"오류 발생: {str(e)}"
+# 한 번의 요청으로 요약할 문서 본문의 최대 토큰 수 (넘으면 조각별로 나누어 요약)
+MAX_INPUT_TOKENS = 25000
+
+# 긴 문서 조각 요약(map-reduce) 설정
+CHUNK_TOKENS = 6000             # 조각 하나의 최대 토큰 수
+CHUNK_SUMMARY_TOKENS = 700      # 조각 요약의 최대 출력 토큰 수
+REDUCE_INPUT_TOKENS = 12000     # 합치기 요청 하나에 넣을 조각 요약의 최대 토큰 수
+CHUNK_CONCURRENCY = 4           # 문서 하나에서 동시에 요약할 최대 조각 수
+
+# 요약 프롬프트 버전 (프롬프트를 바꾸면 올려서 조각 요약 캐시를 무효화)
+SUMMARY_PROMPT_VERSION = "pdf-summary-v1"
+
+# 조각 요약 캐시 파일 (None이면 캐시 사용 안 함)
+SUMMARY_CACHE_PATH = os.path.join("summaries", ".cache", "summary_cache.sqlite3")
+SUMMARY_CACHE_MAX_ENTRIES = 20000   # 초과하면 오래 사용하지 않은 조각 요약부터 삭제
+SUMMARY_CACHE_MAX_AGE_DAYS = 90     # 마지막으로 사용한 지 이 일수가 지난 조각 요약은 삭제
+
+# 파일별 내용 해시/추출 텍스트/요약 매니페스트 파일 (None이면 모든 파일을 다시 처리)
+MANIFEST_PATH = os.path.join("summaries", ".cache", "manifest.sqlite3")
+
+# extract_text_from_pdf가 각 페이지 앞에 붙이는 표시
+PAGE_MARKER = re.compile(r'^--- 페이지 (\d+) ---$', re.MULTILINE)
+
+# 토큰 예산 확인 및 사용량/비용/지연 시간 기록
+# (환경 변수 OPENAI_RUN_TOKEN_BUDGET, OPENAI_CALL_TOKEN_BUDGET으로 예산 지정)
+usage_tracker = UsageTracker.from_env()
+
+# 파일별 요약과 조각 요약이 동시에 진행되어도 전체 동시 요청 수를 제한
+_request_slots = threading.BoundedSemaphore(4)
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+
+def set_request_concurrency(concurrency: int):
+    """
+    동시에 보낼 최대 OpenAI 요청 수를 설정합니다 (파일별 요약과 조각 요약을 합친 수).
     
-    return "\n".join(text_content)
+    Args:
+        concurrency: 최대 동시 요청 수
+    """
+    global _request_slots
+    _request_slots = threading.BoundedSemaphore(max(1, concurrency))
 
 
-def summarize_text(text: str, filename: str) -> str:
+def get_summary_cache() -> Optional[SummaryCache]:
+    """조각 요약 캐시를 처음 사용할 때 엽니다 (SUMMARY_CACHE_PATH가 None이면 None)."""
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None and SUMMARY_CACHE_PATH:
+            _summary_cache = SummaryCache(SUMMARY_CACHE_PATH, SUMMARY_CACHE_MAX_ENTRIES,
+                                          SUMMARY_CACHE_MAX_AGE_DAYS)
+        return _summary_cache
+
+
+def open_manifest() -> Optional[PdfManifest]:
+    """파일별 처리 결과 매니페스트를 엽니다 (MANIFEST_PATH가 None이면 None)."""
+    return PdfManifest(MANIFEST_PATH) if MANIFEST_PATH else None
+
+
+def _create_summary(label: str, request: dict) -> str:
     """
-    텍스트를 GPT API로 요약합니다.
+    동시 요청 수 제한 안에서 요약 요청을 보내고 응답 텍스트를 반환합니다.
+    일시적인 오류(429, 5xx)는 공용 클라이언트의 재시도 정책으로 다시 시도합니다.
+    """
+    with _request_slots:
+        response = usage_tracker.create_chat_completion(client, label, model=MODEL, **request)
+    return response.choices[0].message.content
+
+
+def build_summary_request(text: str, filename: str, from_sections: bool = False) -> dict:
+    """
+    최종 요약(📋/🔑/💡 형식) 요청의 메시지와 생성 옵션을 만듭니다.
     
     Args:
-        text: 요약할 텍스트
+        text: 요약할 텍스트 (from_sections가 True이면 부분별 요약을 이어 붙인 텍스트)
         filename: 파일명 (컨텍스트 제공용)
+        from_sections: 원문 대신 부분별 요약을 합쳐 최종 요약을 만드는지 여부
         
     Returns:
-        요약된 텍스트
+        chat.completions.create에 전달할 인자 딕셔너리 (model 제외)
     """
-    # 텍스트가 너무 길면 앞부분만 사용 (토큰 제한 고려)
-    max_chars = 100000  # 약 25,000 토큰
-    if len(text) > max_chars:
-        text = text[:max_chars] + "\n\n... (텍스트가 길어 일부만 요약)"
+    # 한 번의 요청에 넣을 수 있는 길이를 넘으면 앞부분만 사용 (조각 요약을 쓸 수 없는 Batch API 모드)
+    text, truncated = truncate_to_tokens(text, MAX_INPUT_TOKENS, MODEL)
+    if truncated:
+        print(f"  - {filename}: 텍스트가 {MAX_INPUT_TOKENS:,}토큰을 넘어 앞부분만 요약합니다.")
+        text += "\n\n... (텍스트가 길어 일부만 요약)"
     
-    prompt = f"""다음은 PDF 문서 "{filename}"에서 추출한 텍스트입니다.
-
-이 내용을 다음 형식으로 요약해주세요:
+    if from_sections:
+        source = (f'다음은 PDF 문서 "{filename}"을 앞에서부터 부분별로 요약한 내용입니다.\n'
+                  f'부분 요약을 모두 종합하여 문서 전체를')
+        label = "부분별 요약"
+    else:
+        source = f'다음은 PDF 문서 "{filename}"에서 추출한 텍스트입니다.\n\n이 내용을'
+        label = "문서 내용"
+    
+    prompt = f"""{source} 다음 형식으로 요약해주세요:
 
 ## 📋 문서 개요
 (문서가 무엇에 관한 것인지 1-2문장으로)
@@ -65,45 +139,486 @@ def summarize_text(text: str, filename: str) -> str:
 
 ---
 
-문서 내용:
+{label}:
 {text}
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "당신은 문서 요약 전문가입니다. 핵심을 파악하고 명확하게 요약해주세요. 한국어로 답변합니다."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,  # 일관성 있는 요약을 위해 낮은 온도
-            max_tokens=2000
-        )
-        return response.choices[0].message.content
+    return {
+        "messages": [
+            {
+                "role": "system",
+                "content": "당신은 문서 요약 전문가입니다. 핵심을 파악하고 명확하게 요약해주세요. 한국어로 답변합니다."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": 0.3,  # 일관성 있는 요약을 위해 낮은 온도
+        "max_tokens": 2000
+    }
+
+
+def _is_chunk_boundary(page: str, tokens: int, target_tokens: int) -> bool:
+    """
+    페이지 내용만으로 이 페이지 뒤에서 조각을 끊을지 정합니다 (content-defined chunking).
+    페이지 해시를 0~1 값으로 바꿔 tokens / target_tokens보다 작으면 끊으므로
+    조각 하나의 평균 크기가 target_tokens 정도가 되고, 다른 페이지가 바뀌어도 결과가 같습니다.
+    페이지 번호 표시는 해시에서 제외합니다.
+    """
+    body = PAGE_MARKER.sub('', page, count=1).strip()
+    digest = hashlib.blake2b(body.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2 ** 64 < tokens / max(target_tokens, 1)
+
+
+def split_into_chunks(text: str, max_tokens: int = CHUNK_TOKENS) -> List[str]:
+    """
+    페이지 표시가 붙은 텍스트를 토큰 수 한도 안의 조각으로 나눕니다.
+    조각은 페이지 경계에서만 나누고, 어느 페이지 뒤에서 끊을지는 그 페이지의 내용으로 정합니다
+    (한 페이지가 한도를 넘으면 줄 단위로 나눔). 한 페이지를 고쳐도 그 페이지가 들어 있는 조각만 바뀌고
+    나머지 조각은 글자 하나까지 같게 유지되어 캐시된 요약을 재사용합니다.
+    
+    Args:
+        text: extract_text_from_pdf가 추출한 텍스트
+        max_tokens: 조각 하나의 최대 토큰 수
+        
+    Returns:
+        조각 텍스트 리스트 (문서 순서)
+    """
+    # 페이지 표시 앞에서 나누어 각 페이지가 자기 표시를 포함하도록 함
+    starts = [m.start() for m in PAGE_MARKER.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    pages = [text[a:b].strip() for a, b in zip(starts, starts[1:] + [len(text)])]
+    
+    # (텍스트, 토큰 수, 뒤에서 끊을지 여부) - 평균 조각 크기를 한도의 절반으로 잡아 한도에 걸려 끊기는 일을 줄임
+    pieces = []
+    for page in pages:
+        if not page:
+            continue
+        tokens = count_tokens(page, MODEL)
+        if tokens <= max_tokens:
+            pieces.append((page, tokens, _is_chunk_boundary(page, tokens, max_tokens // 2)))
+        else:
+            pieces.extend((piece, count_tokens(piece, MODEL), True)
+                          for piece in _split_oversized(page, max_tokens))
+    
+    chunks, current, current_tokens = [], [], 0
+    for piece, tokens, boundary in pieces:
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+        if boundary:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _split_oversized(page: str, max_tokens: int) -> List[str]:
+    """한도를 넘는 페이지를 줄 단위로 나눕니다 (한 줄이 한도를 넘으면 토큰 기준으로 자름)."""
+    pieces, current, current_tokens = [], [], 0
+    for line in page.splitlines():
+        tokens = count_tokens(line, MODEL)
+        if current and current_tokens + tokens > max_tokens:
+            pieces.append("\n".join(current))
+            current, current_tokens = [], 0
+        while tokens > max_tokens:
+            head, _ = truncate_to_tokens(line, max_tokens, MODEL)
+            if not head:
+                break
+            pieces.append(head)
+            line = line[len(head):]
+            tokens = count_tokens(line, MODEL)
+        current.append(line)
+        current_tokens += tokens
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def _cached_summary(stage: str, text: str, label: str, request: dict) -> str:
+    """
+    조각 요약 캐시를 먼저 확인하고, 없으면 요약 요청을 보내 결과를 캐시에 저장합니다.
+    캐시 키는 (모델, 프롬프트 버전, 단계, 입력 텍스트)이므로 바뀐 부분만 다시 요청합니다.
+    """
+    cache = get_summary_cache()
+    key = SummaryCache.make_key(MODEL, SUMMARY_PROMPT_VERSION, stage, text) if cache else None
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    summary = _create_summary(label, request)
+    if cache and summary:
+        cache.put(key, summary)
+    return summary
+
+
+def summarize_chunk(chunk: str, filename: str, index: int, total: int) -> str:
+    """
+    긴 문서의 조각 하나를 요약합니다 (map 단계).
+    
+    Args:
+        chunk: 페이지 표시가 포함된 조각 텍스트
+        filename: 파일명 (컨텍스트 제공용)
+        index: 조각 번호 (1부터)
+        total: 전체 조각 수
+        
+    Returns:
+        조각 요약 (페이지 번호 포함 bullet point)
+    """
+    prompt = f"""다음은 PDF 문서 "{filename}"의 일부({index}/{total})입니다.
+이 부분의 핵심 내용과 중요한 수치, 결론을 bullet point로 정리해주세요.
+각 항목 끝에 해당 페이지 번호를 (p.N) 형식으로 적어주세요.
+
+---
+
+문서 일부:
+{chunk}
+"""
+    request = {
+        "messages": [
+            {"role": "system", "content": "당신은 문서 요약 전문가입니다. 나중에 문서 전체 요약에 쓰일 수 있도록 "
+                                          "빠짐없이 간결하게 정리해주세요. 한국어로 답변합니다."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.3,
+        "max_tokens": CHUNK_SUMMARY_TOKENS
+    }
+    # 조각 번호는 프롬프트에만 쓰이므로 캐시 키에서는 제외 (앞에 페이지가 추가되어도 재사용)
+    return _cached_summary("chunk", f"{filename}\x00{chunk}", "summarize_chunk", request)
+
+
+def _reduce_group(notes: List[str], filename: str) -> str:
+    """여러 부분 요약을 하나의 부분 요약으로 합칩니다 (중간 reduce 단계)."""
+    joined = "\n\n".join(notes)
+    prompt = f"""다음은 PDF 문서 "{filename}"의 연속된 부분들을 요약한 내용입니다.
+중복을 없애고 하나의 요약으로 합쳐 bullet point로 정리해주세요. 페이지 번호 표시 (p.N)는 유지해주세요.
+
+---
+
+부분별 요약:
+{joined}
+"""
+    request = {
+        "messages": [
+            {"role": "system", "content": "당신은 문서 요약 전문가입니다. 핵심을 빠짐없이 간결하게 합쳐주세요. "
+                                          "한국어로 답변합니다."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.3,
+        "max_tokens": CHUNK_SUMMARY_TOKENS
+    }
+    return _cached_summary("reduce", f"{filename}\x00{joined}", "summarize_reduce", request)
+
+
+def _group_notes(notes: List[str], max_tokens: int) -> List[List[str]]:
+    """부분 요약을 토큰 한도 안의 묶음으로 나눕니다 (매 단계 수가 줄도록 묶음마다 최소 2개)."""
+    groups, current, current_tokens = [], [], 0
+    for note in notes:
+        tokens = count_tokens(note, MODEL)
+        if len(current) >= 2 and current_tokens + tokens > max_tokens:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(note)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def summarize_long_text(text: str, filename: str) -> str:
+    """
+    긴 문서를 조각별로 요약한 뒤 합쳐서 최종 요약을 만듭니다 (map-reduce).
+    조각 요약은 동시에 요청하고, 합친 요약이 한 요청에 들어갈 때까지 묶어서 다시 요약한 뒤
+    마지막에 📋/🔑/💡 형식의 최종 요약을 만듭니다.
+    
+    Args:
+        text: 페이지 표시가 포함된 문서 텍스트
+        filename: 파일명 (컨텍스트 제공용)
+        
+    Returns:
+        최종 요약 텍스트
+        
+    Raises:
+        TokenBudgetExceeded: 실행별 토큰 예산을 모두 사용한 경우
+        openai.OpenAIError: 재시도 후에도 API 호출이 실패한 경우
+    """
+    chunks = split_into_chunks(text, CHUNK_TOKENS)
+    print(f"  - {filename}: 긴 문서를 {len(chunks)}개 조각으로 나누어 요약합니다.")
     
+    with ThreadPoolExecutor(max_workers=CHUNK_CONCURRENCY) as pool:
+        notes = list(pool.map(lambda args: summarize_chunk(args[1], filename, args[0], len(chunks)),
+                              enumerate(chunks, 1)))
+        
+        while len(notes) > 1 and count_tokens("\n\n".join(notes), MODEL) > REDUCE_INPUT_TOKENS:
+            groups = _group_notes(notes, REDUCE_INPUT_TOKENS)
+            notes = list(pool.map(lambda group: _reduce_group(group, filename), groups))
+    
+    sections = "\n\n".join(f"[부분 {i}]\n{note}" for i, note in enumerate(notes, 1))
+    return _cached_summary("final", f"{filename}\x00{sections}", "summarize_reduce",
+                           build_summary_request(sections, filename, from_sections=True))
+
+
+def summarize_text(text: str, filename: str) -> str:
+    """
+    텍스트를 GPT API로 요약합니다.
+    MAX_INPUT_TOKENS 이하이면 한 번에 요약하고, 넘으면 조각별로 나누어 요약한 뒤 합칩니다.
+    
+    Args:
+        text: 요약할 텍스트
+        filename: 파일명 (컨텍스트 제공용)
+        
+    Returns:
+        요약된 텍스트
+        
+    Raises:
+        TokenBudgetExceeded: 실행별 토큰 예산을 모두 사용한 경우
+        openai.OpenAIError: 재시도 후에도 API 호출이 실패한 경우
+    """
+    if count_tokens(text, MODEL) > MAX_INPUT_TOKENS:
+        return summarize_long_text(text, filename)
+    return _create_summary("summarize", build_summary_request(text, filename))
+
+
+def summarize_texts_with_batch_api(texts: dict, batch_dir: str = os.path.join("summaries", ".batch"),
+                                   poll_interval: float = 30.0) -> tuple:
+    """
+    여러 문서를 Batch API로 한 번에 요약합니다 (오프라인 모드).
+    모든 요청을 배치 파일 하나로 제출하고 완료될 때까지 기다린 뒤 결과를 파일명에 다시 연결합니다.
+    
+    Args:
+        texts: {파일명: 추출한 텍스트} 딕셔너리
+        batch_dir: 배치 입력 파일과 제출 상태를 저장할 폴더 (중단 후 다시 실행하면 이어서 기다림)
+        poll_interval: 배치 상태를 확인하는 간격(초)
+        
+    Returns:
+        ({파일명: 요약}, {파일명: 실패 사유}) 튜플
+        
+    Raises:
+        TokenBudgetExceeded: 토큰 예산을 넘는 경우 (아무것도 제출하지 않음)
+        BatchJobError: 배치 작업 전체가 실패한 경우
+    """
+    runner = BatchRunner(client, usage_tracker, work_dir=batch_dir, poll_interval=poll_interval)
+    filenames = list(texts)
+    responses = runner.run(
+        "summarize", MODEL,
+        [build_summary_request(texts[filename], filename) for filename in filenames]
+    )
+    
+    results, failures = {}, {}
+    for filename, response in zip(filenames, responses):
+        if isinstance(response, Exception):
+            failures[filename] = f"요약 실패: {response}"
+        else:
+            results[filename] = response.choices[0].message.content
+    return results, failures
+
+
+def _extract_in_process(pdf_path: str, with_digest: bool = False) -> tuple:
+    """
+    프로세스 풀에서 실행할 텍스트 추출 (예기치 않은 예외도 오류 문자열로 돌려줌)
+    
+    Returns:
+        (내용 해시 또는 None, 추출한 텍스트) 튜플
+    """
+    try:
+        digest = PdfManifest.hash_file(pdf_path) if with_digest else None
+        return digest, extract_text_from_pdf(pdf_path)
     except Exception as e:
-        return f"요약 중 오류 발생: {str(e)}"
+        return None, f"오류 발생: {str(e)}"
 
 
-def summarize_all_pdfs(folder_path: str = ".") -> dict:
+def iter_pdf_summaries(pdf_files: list, extract_workers: Optional[int] = None,
+                       concurrency: int = 4, summarize: bool = True,
+                       manifest: Optional[PdfManifest] = None) -> Iterator[tuple]:
+    """
+    PDF 파일을 파이프라인으로 처리하여 결과를 입력 순서대로 하나씩 돌려줍니다.
+    CPU를 쓰는 텍스트 추출은 프로세스 풀에서, 응답을 기다리는 요약 요청은 동시 요청 수를 제한한
+    스레드 풀에서 실행하고, 추출이 끝난 파일부터 바로 요약 요청을 보냅니다.
+    앞 파일의 결과가 나오면 뒤 파일을 기다리지 않고 즉시 돌려주므로 저장도 바로 시작할 수 있습니다.
+    
+    매니페스트를 넘기면 내용이 같은 파일은 저장된 요약을 그대로 돌려주고(요약 모드),
+    추출 텍스트가 저장된 파일은 추출을 건너뛰며, 새로 추출/요약한 결과는 매니페스트에 기록합니다.
+    
+    Args:
+        pdf_files: 처리할 PDF 파일 경로 리스트 (이 순서대로 결과를 돌려줌)
+        extract_workers: 텍스트 추출 프로세스 수 (None이면 CPU 코어 수)
+        concurrency: 동시에 보낼 최대 요약 요청 수
+        summarize: False이면 텍스트 추출만 하고 추출한 텍스트를 돌려줌 (배치 모드용)
+        manifest: 파일별 처리 결과 매니페스트 (None이면 모든 파일을 처리)
+        
+    Yields:
+        (파일명, 요약 또는 추출한 텍스트, 실패 사유) 튜플 (성공하면 실패 사유가 None, 실패하면 결과가 None)
+    """
+    extract_workers = extract_workers or os.cpu_count() or 1
+    concurrency = max(1, concurrency)
+    set_request_concurrency(concurrency)
+    # 추출 중이거나 요약 대기 중인 파일 수 상한 (추출 텍스트가 메모리에 쌓이지 않도록)
+    max_in_flight = extract_workers + concurrency * 2
+    
+    queued = deque(enumerate(pdf_files))
+    futures = {}    # future -> (단계, 파일 인덱스)
+    digests = {}    # 매니페스트에 기록할 {파일 인덱스: 내용 해시}
+    finished = {}   # 순서를 기다리는 완료 결과 {파일 인덱스: (파일명, 결과, 실패 사유)}
+    next_index = 0
+    budget_error = None
+    
+    with ProcessPoolExecutor(max_workers=extract_workers) as extractors, \
+            ThreadPoolExecutor(max_workers=concurrency) as requesters:
+        def start_summary(i: int, name: str, text: str):
+            if not summarize:
+                finished[i] = (name, text, None)
+            elif budget_error is not None:
+                finished[i] = (name, None, f"건너뜀: {budget_error}")
+            else:
+                futures[requesters.submit(summarize_text, text, name)] = ('summarize', i)
+        
+        def reuse(i: int, name: str, digest: str) -> bool:
+            # 같은 내용의 요약이 있으면 그대로, 추출 텍스트만 있으면 추출 없이 요약
+            if summarize:
+                summary = manifest.get_summary(digest, MODEL, SUMMARY_PROMPT_VERSION)
+                if summary is not None:
+                    manifest.skipped += 1
+                    finished[i] = (name, summary, None)
+                    return True
+            text = manifest.get_text(digest)
+            if text is None:
+                return False
+            digests[i] = digest
+            start_summary(i, name, text)
+            return True
+        
+        def fill():
+            while queued and budget_error is None and len(futures) + len(finished) < max_in_flight:
+                i, pdf_file = queued.popleft()
+                if manifest is not None:
+                    digest = manifest.known_digest(str(pdf_file))
+                    if digest is not None and reuse(i, Path(pdf_file).name, digest):
+                        continue
+                futures[extractors.submit(_extract_in_process, str(pdf_file), manifest is not None)] = ('extract', i)
+        
+        fill()
+        # 매니페스트로 재사용한 파일은 future 없이 바로 finished에 들어가므로
+        # 대기열이 남아 있는 동안은 future가 비어도 계속 진행
+        while futures or finished or (queued and budget_error is None):
+            done = wait(futures, return_when=FIRST_COMPLETED)[0] if futures else ()
+            for future in done:
+                stage, i = futures.pop(future)
+                name = Path(pdf_files[i]).name
+                
+                if stage == 'extract':
+                    digest, text = future.result()
+                    if text.startswith("오류"):
+                        finished[i] = (name, None, text)
+                        continue
+                    if manifest is not None:
+                        # 수정 시각만 바뀐 파일은 내용 해시로 다시 찾음
+                        manifest.record_file(str(pdf_files[i]), digest)
+                        if reuse(i, name, digest):
+                            continue
+                        manifest.put_text(digest, text)
+                        digests[i] = digest
+                    start_summary(i, name, text)
+                    continue
+                
+                try:
+                    finished[i] = (name, future.result(), None)
+                except TokenBudgetExceeded as e:
+                    # 예산을 다 쓰면 새 파일은 더 넣지 않고 진행 중인 요청만 마무리
+                    budget_error = str(e)
+                    finished[i] = (name, None, str(e))
+                except Exception as e:
+                    finished[i] = (name, None, f"요약 실패: {e}")
+                else:
+                    if manifest is not None:
+                        manifest.put_summary(digests.pop(i), MODEL, SUMMARY_PROMPT_VERSION, finished[i][1])
+            
+            while next_index in finished:
+                digests.pop(next_index, None)
+                yield finished.pop(next_index)
+                next_index += 1
+            fill()
+    
+    # 토큰 예산을 다 써서 처리하지 않은 나머지 파일
+    if budget_error is not None:
+        for i, pdf_file in queued:
+            yield (Path(pdf_file).name, None, f"건너뜀: {budget_error}")
+
+
+def stream_pdf_summaries(folder_path: str = ".", extract_workers: Optional[int] = None,
+                         concurrency: int = 4, manifest: Optional[PdfManifest] = None) -> Iterator[tuple]:
+    """
+    폴더 내 모든 PDF 파일을 파이프라인으로 요약하고, 성공한 요약을 파일명 순서대로 하나씩 돌려줍니다.
+    진행 상황을 출력하며, 실패한 파일은 마지막에 모아서 알려 줍니다.
+    
+    Args:
+        folder_path: PDF 파일이 있는 폴더 경로
+        extract_workers: 텍스트 추출 프로세스 수 (None이면 CPU 코어 수)
+        concurrency: 동시에 보낼 최대 요약 요청 수
+        manifest: 파일별 처리 결과 매니페스트 (바뀌지 않은 파일은 저장된 요약을 돌려줌)
+        
+    Yields:
+        (파일명, 요약) 튜플
+    """
+    pdf_files = sorted(Path(folder_path).glob("*.pdf"))
+    if not pdf_files:
+        print("PDF 파일을 찾을 수 없습니다.")
+        return
+    
+    print(f"총 {len(pdf_files)}개의 PDF 파일을 발견했습니다. "
+          f"(추출 프로세스 {extract_workers or os.cpu_count()}개, 동시 요약 요청 {concurrency}개)\n")
+    
+    failures = {}
+    started = time.perf_counter()
+    for done, (filename, summary, error) in enumerate(
+            iter_pdf_summaries(pdf_files, extract_workers, concurrency, manifest=manifest), 1):
+        if error is not None:
+            print(f"[{done}/{len(pdf_files)}] ❌ {filename}: {error}")
+            failures[filename] = error
+            continue
+        print(f"[{done}/{len(pdf_files)}] ✅ {filename}")
+        yield filename, summary
+    
+    print(f"\n처리 시간: {time.perf_counter() - started:.1f}초")
+    if manifest is not None and manifest.skipped:
+        print(f"바뀌지 않은 {manifest.skipped}개 파일은 이전 요약을 사용했습니다.")
+    if failures:
+        print(f"⚠️ {len(failures)}개 파일을 요약하지 못했습니다 (요약 파일을 만들지 않음):")
+        for filename, reason in failures.items():
+            print(f"  - {filename}: {reason}")
+        print()
+
+
+def summarize_all_pdfs(folder_path: str = ".", batch_api: bool = False,
+                       poll_interval: float = 30.0, extract_workers: Optional[int] = None,
+                       concurrency: int = 4, manifest: Optional[PdfManifest] = None) -> dict:
     """
     폴더 내 모든 PDF 파일을 요약합니다.
     
     Args:
         folder_path: PDF 파일이 있는 폴더 경로
+        batch_api: 파일마다 요청하는 대신 Batch API로 모아 제출할지 여부
+            (최대 24시간이 걸리는 대신 처리 한도가 크고 비용이 절반)
+        poll_interval: Batch API 상태를 확인하는 간격(초)
+        extract_workers: 텍스트 추출 프로세스 수 (None이면 CPU 코어 수)
+        concurrency: 동시에 보낼 최대 요약 요청 수
+        manifest: 파일별 처리 결과 매니페스트 (바뀌지 않은 파일은 저장된 요약을 사용)
         
     Returns:
-        {파일명: 요약} 형태의 딕셔너리
+        {파일명: 요약} 형태의 딕셔너리 (실패한 파일은 포함하지 않음)
     """
+    if not batch_api:
+        return dict(stream_pdf_summaries(folder_path, extract_workers, concurrency, manifest))
+    
     results = {}
-    folder = Path(folder_path)
-    pdf_files = list(folder.glob("*.pdf"))
+    failures = {}
+    texts = {}  # 배치로 제출할 {파일명: 텍스트}
+    pdf_files = sorted(Path(folder_path).glob("*.pdf"))
     
     if not pdf_files:
         print("PDF 파일을 찾을 수 없습니다.")
@@ -111,63 +626,145 @@ def summarize_all_pdfs(folder_path: str = ".") -> dict:
     
     print(f"총 {len(pdf_files)}개의 PDF 파일을 발견했습니다.\n")
     
-    for i, pdf_file in enumerate(sorted(pdf_files), 1):
-        print(f"[{i}/{len(pdf_files)}] 처리 중: {pdf_file.name}")
-        
-        # 텍스트 추출
-        print("  - 텍스트 추출 중...")
-        text = extract_text_from_pdf(str(pdf_file))
-        
-        if text.startswith("오류"):
-            print(f"  - ❌ {text}")
-            results[pdf_file.name] = text
+    # 내용이 같은 파일은 이전 요약을 사용하고 나머지만 제출
+    pending = pdf_files
+    if manifest is not None:
+        pending = []
+        for pdf_file in pdf_files:
+            summary = manifest.get_summary(manifest.file_digest(str(pdf_file)), MODEL, SUMMARY_PROMPT_VERSION)
+            if summary is None:
+                pending.append(pdf_file)
+            else:
+                results[pdf_file.name] = summary
+        if results:
+            print(f"바뀌지 않은 {len(results)}개 파일은 이전 요약을 사용합니다.\n")
+    
+    # 텍스트만 병렬로 추출해 두고 추출이 끝난 뒤 한 번에 제출
+    for done, (filename, text, error) in enumerate(
+            iter_pdf_summaries(pending, extract_workers, summarize=False, manifest=manifest), 1):
+        if error is not None:
+            print(f"[{done}/{len(pending)}] ❌ {filename}: {error}")
+            failures[filename] = error
             continue
-        
-        # GPT로 요약
-        print("  - GPT로 요약 중...")
-        summary = summarize_text(text, pdf_file.name)
-        results[pdf_file.name] = summary
-        print("  - ✅ 완료!")
+        texts[filename] = text
+        print(f"[{done}/{len(pending)}] ✅ 추출 완료 (배치 제출 대기): {filename}")
+    
+    if texts:
+        print()
+        try:
+            batch_results, batch_failures = summarize_texts_with_batch_api(texts, poll_interval=poll_interval)
+        except TokenBudgetExceeded as e:
+            print(f"❌ {e}")
+            print("   토큰 예산을 넘어 배치를 제출하지 않았습니다.")
+        except BatchJobError as e:
+            print(f"❌ {e}")
+        else:
+            results.update(batch_results)
+            failures.update(batch_failures)
+            if manifest is not None:
+                for pdf_file in pending:
+                    if pdf_file.name in batch_results:
+                        manifest.put_summary(manifest.file_digest(str(pdf_file)), MODEL,
+                                             SUMMARY_PROMPT_VERSION, batch_results[pdf_file.name])
+            print(f"✅ 배치 요약 완료: {len(batch_results)}/{len(texts)}개")
         print()
     
-    return results
+    if failures:
+        print(f"⚠️ {len(failures)}개 파일을 요약하지 못했습니다 (요약 파일을 만들지 않음):")
+        for filename, reason in failures.items():
+            print(f"  - {filename}: {reason}")
+        print()
+    
+    # 이전 요약과 새 요약을 파일명 순서로 정렬
+    return {pdf_file.name: results[pdf_file.name] for pdf_file in pdf_files if pdf_file.name in results}
 
 
-def save_summaries(results: dict, output_folder: str = "summaries"):
+def save_summaries(results, output_folder: str = "summaries") -> int:
     """
     요약 결과를 파일로 저장합니다.
+    결과가 들어오는 순서대로 바로 저장하므로 stream_pdf_summaries의 출력을 그대로 넘기면
+    모든 파일이 끝나기를 기다리지 않고 저장이 진행됩니다.
     
     Args:
-        results: {파일명: 요약} 딕셔너리
+        results: {파일명: 요약} 딕셔너리 또는 (파일명, 요약) 튜플을 돌려주는 iterable
         output_folder: 출력 폴더명
+        
+    Returns:
+        저장한 요약 수
     """
     output_path = Path(output_folder)
     output_path.mkdir(exist_ok=True)
+    items = results.items() if isinstance(results, dict) else results
     
-    for filename, summary in results.items():
-        output_file = output_path / f"{Path(filename).stem}_요약.txt"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(f"원본 파일: {filename}\n")
-            f.write("=" * 60 + "\n\n")
-            f.write(summary)
-        print(f"저장됨: {output_file}")
-    
-    # 전체 요약을 하나의 파일로도 저장
+    # 전체 요약 파일은 첫 결과가 나올 때 만들고 결과마다 이어서 기록
     all_summaries_file = output_path / "_전체_요약.txt"
-    with open(all_summaries_file, "w", encoding="utf-8") as f:
-        f.write("PDF 문서 전체 요약\n")
-        f.write("=" * 60 + "\n\n")
-        
-        for filename, summary in results.items():
-            f.write(f"📄 {filename}\n")
-            f.write("-" * 60 + "\n")
-            f.write(summary)
-            f.write("\n\n" + "=" * 60 + "\n\n")
+    all_summaries = None
+    saved = 0
+    try:
+        for filename, summary in items:
+            output_file = output_path / f"{Path(filename).stem}_요약.txt"
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(f"원본 파일: {filename}\n")
+                f.write("=" * 60 + "\n\n")
+                f.write(summary)
+            print(f"저장됨: {output_file}")
+            
+            if all_summaries is None:
+                all_summaries = open(all_summaries_file, "w", encoding="utf-8")
+                all_summaries.write("PDF 문서 전체 요약\n")
+                all_summaries.write("=" * 60 + "\n\n")
+            all_summaries.write(f"📄 {filename}\n")
+            all_summaries.write("-" * 60 + "\n")
+            all_summaries.write(summary)
+            all_summaries.write("\n\n" + "=" * 60 + "\n\n")
+            all_summaries.flush()
+            saved += 1
+    finally:
+        if all_summaries is not None:
+            all_summaries.close()
     
-    print(f"\n전체 요약 저장됨: {all_summaries_file}")
+    if saved:
+        print(f"\n전체 요약 저장됨: {all_summaries_file}")
+    return saved
 
 
 def main():
+    parser = argparse.ArgumentParser(description="폴더 안의 PDF 파일을 GPT로 요약합니다.")
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="파일마다 요청하는 대신 Batch API로 모아 제출 (야간 작업용, 비용 절반, 최대 24시간 소요)"
+    )
+    parser.add_argument(
+        "--batch-poll-interval",
+        type=float,
+        default=30.0,
+        help="Batch API 상태를 확인하는 간격(초) (기본값: 30)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="텍스트 추출 프로세스 수 (기본값: CPU 코어 수)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="동시에 보낼 최대 요약 요청 수 (기본값: 4)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="요약 캐시와 매니페스트를 사용하지 않고 모든 파일을 다시 추출/요약"
+    )
+    args = parser.parse_args()
+    
+    global SUMMARY_CACHE_PATH, MANIFEST_PATH
+    if args.no_cache:
+        SUMMARY_CACHE_PATH = None
+        MANIFEST_PATH = None
+    
     print("=" * 60)
     print("📚 PDF 요약 프로그램 (GPT-4o-mini)")
     print("=" * 60)
@@ -182,17 +779,35 @@ def main():
     
     print("✅ API 키 확인됨\n")
     
-    # PDF 요약 실행
-    results = summarize_all_pdfs(".")
+    # 바뀌지 않은 파일은 매니페스트에 저장된 요약을 그대로 저장 (다시 추출/요약하지 않음)
+    manifest = open_manifest()
     
-    if not results:
-        return
+    # PDF 요약 실행 및 결과 저장
+    try:
+        if args.batch_api:
+            results = summarize_all_pdfs(".", batch_api=True, poll_interval=args.batch_poll_interval,
+                                         extract_workers=args.workers, manifest=manifest)
+            if not results:
+                return
+            print("-" * 60)
+            save_summaries(results)
+        else:
+            # 요약이 끝나는 대로 파일명 순서에 맞춰 바로 저장
+            saved = save_summaries(stream_pdf_summaries(".", args.workers, args.concurrency, manifest))
+            if not saved:
+                return
+    finally:
+        if manifest is not None:
+            manifest.close()
     
-    print()
-    print("-" * 60)
+    cache = get_summary_cache() if not args.batch_api else None
+    if cache is not None and cache.hits + cache.misses:
+        stats = cache.stats()
+        print(f"\n조각 요약 캐시: 적중 {stats['hits']}회, 새로 요청 {stats['misses']}회 (저장된 요약 {stats['entries']}개)")
     
-    # 결과 저장
-    save_summaries(results)
+    print()
+    print(usage_tracker.report())
+    usage_tracker.save_report(os.path.join("summaries", "_openai_usage.json"))
     
     print()
     print("=" * 60)
@@ -0,0 +1,335 @@
+"""
+요약 캐시 모듈
+(모델, 프롬프트 버전, 요약 단계, 입력 텍스트)의 해시를 키로 SQLite 파일에 요약 결과를 저장합니다.
+긴 문서를 조각별로 요약할 때 바뀌지 않은 조각의 요약을 재사용하는 데 사용합니다.
+캐시는 최대 항목 수와 보관 기간을 넘으면 오래 사용하지 않은 항목부터 정리합니다.
+PDF 파일별 내용 해시, 추출 텍스트, 요약을 기록하는 매니페스트도 제공합니다 (바뀌지 않은 파일은 건너뜀).
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class SummaryCache:
+    """SQLite 기반의 내용 주소 지정(content-addressed) 요약 캐시"""
+
+    def __init__(self, db_path: str, max_entries: Optional[int] = 20000,
+                 max_age_days: Optional[float] = 90):
+        """
+        Args:
+            db_path: 캐시 SQLite 파일 경로
+            max_entries: 보관할 최대 항목 수 (초과 시 오래 사용하지 않은 항목부터 삭제, None이면 제한 없음)
+            max_age_days: 마지막으로 사용한 지 이 일수가 지난 항목은 삭제 (None이면 제한 없음)
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS summary_cache (
+                   key TEXT PRIMARY KEY,
+                   summary TEXT NOT NULL,
+                   last_used REAL NOT NULL
+               )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used "
+            "ON summary_cache (last_used)"
+        )
+        self._conn.commit()
+        self.prune()
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, stage: str, text: str) -> str:
+        """
+        캐시 키를 생성합니다.
+
+        Args:
+            model: 요약에 사용한 모델명
+            prompt_version: 프롬프트 버전 (프롬프트가 바뀌면 캐시가 자동으로 무효화됨)
+            stage: 요약 단계 (예: 'chunk', 'reduce')
+            text: 요약할 입력 텍스트
+
+        Returns:
+            SHA-256 해시 문자열
+        """
+        payload = f"{model}\x00{prompt_version}\x00{stage}\x00{text}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시된 요약을 조회하고 적중/미스 횟수를 기록합니다.
+
+        Args:
+            key: make_key로 만든 캐시 키
+
+        Returns:
+            캐시된 요약 (없으면 None)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM summary_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE summary_cache SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, summary: str):
+        """
+        요약을 캐시에 저장하고, 최대 항목 수를 넘으면 오래 사용하지 않은 항목을 삭제합니다.
+
+        Args:
+            key: make_key로 만든 캐시 키
+            summary: 저장할 요약
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summary_cache (key, summary, last_used) VALUES (?, ?, ?)",
+                (key, summary, time.time())
+            )
+            self._evict(self.max_entries, None)
+            self._conn.commit()
+
+    def _evict(self, max_entries: Optional[int], max_age_days: Optional[float]) -> int:
+        """기간이 지난 항목과 최대 항목 수를 초과한 만큼 가장 오래 사용하지 않은 항목을 삭제합니다."""
+        removed = 0
+        if max_age_days is not None:
+            removed += self._conn.execute(
+                "DELETE FROM summary_cache WHERE last_used < ?",
+                (time.time() - max_age_days * 86400,)
+            ).rowcount
+        if max_entries is not None:
+            count = self._conn.execute("SELECT COUNT(*) FROM summary_cache").fetchone()[0]
+            overflow = count - max_entries
+            if overflow > 0:
+                removed += self._conn.execute(
+                    "DELETE FROM summary_cache WHERE key IN ("
+                    "SELECT key FROM summary_cache ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+        return removed
+
+    def prune(self, max_entries: Optional[int] = None, max_age_days: Optional[float] = None) -> int:
+        """
+        캐시를 정리합니다. 캐시를 열 때 설정한 한도로 자동 실행되며, 더 작은 한도로 직접 호출할 수도 있습니다.
+
+        Args:
+            max_entries: 남길 최대 항목 수 (None이면 생성 시 설정값)
+            max_age_days: 마지막 사용 후 보관할 일수 (None이면 생성 시 설정값)
+
+        Returns:
+            삭제한 항목 수
+        """
+        with self._lock:
+            removed = self._evict(
+                self.max_entries if max_entries is None else max_entries,
+                self.max_age_days if max_age_days is None else max_age_days
+            )
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> dict:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            hits, misses, entries를 담은 딕셔너리
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM summary_cache").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def close(self):
+        """데이터베이스 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+
+class PdfManifest:
+    """
+    PDF 처리 결과 매니페스트
+    파일 경로별 (크기, 수정 시각, 내용 해시)와 내용 해시별 추출 텍스트,
+    (내용 해시, 모델, 프롬프트 버전)별 요약을 SQLite 파일에 저장합니다.
+    크기와 수정 시각이 같은 파일은 다시 해시하지 않고, 내용이 같은 파일은 다시 추출/요약하지 않습니다.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: 매니페스트 SQLite 파일 경로
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS pdf_files (
+                   path TEXT PRIMARY KEY,
+                   size INTEGER NOT NULL,
+                   mtime_ns INTEGER NOT NULL,
+                   content_hash TEXT NOT NULL,
+                   updated_at REAL NOT NULL
+               );
+               CREATE TABLE IF NOT EXISTS pdf_texts (
+                   content_hash TEXT PRIMARY KEY,
+                   text TEXT NOT NULL
+               );
+               CREATE TABLE IF NOT EXISTS pdf_summaries (
+                   content_hash TEXT NOT NULL,
+                   model TEXT NOT NULL,
+                   prompt_version TEXT NOT NULL,
+                   summary TEXT NOT NULL,
+                   updated_at REAL NOT NULL,
+                   PRIMARY KEY (content_hash, model, prompt_version)
+               );"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """
+        파일 내용의 SHA-256 해시를 계산합니다.
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            SHA-256 해시 문자열
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def known_digest(self, path: str) -> Optional[str]:
+        """
+        크기와 수정 시각이 기록과 같으면 기록된 내용 해시를 반환합니다 (파일을 읽지 않음).
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            기록된 내용 해시 (새 파일이거나 바뀐 파일이면 None)
+        """
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, content_hash FROM pdf_files WHERE path = ?",
+                (os.path.abspath(path),)
+            ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        return None
+
+    def file_digest(self, path: str) -> str:
+        """
+        파일의 내용 해시를 반환합니다. 기록과 다르면 새로 계산해 기록합니다.
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            내용 해시
+        """
+        digest = self.known_digest(path)
+        if digest is None:
+            digest = self.hash_file(path)
+            self.record_file(path, digest)
+        return digest
+
+    def record_file(self, path: str, digest: str):
+        """
+        파일의 현재 크기/수정 시각과 내용 해시를 기록합니다.
+
+        Args:
+            path: 파일 경로
+            digest: 내용 해시
+        """
+        stat = os.stat(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pdf_files (path, size, mtime_ns, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, digest, time.time())
+            )
+            self._conn.commit()
+
+    def get_text(self, digest: str) -> Optional[str]:
+        """내용 해시에 해당하는 추출 텍스트를 반환합니다 (없으면 None)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM pdf_texts WHERE content_hash = ?", (digest,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_text(self, digest: str, text: str):
+        """내용 해시에 추출 텍스트를 저장합니다."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pdf_texts (content_hash, text) VALUES (?, ?)", (digest, text)
+            )
+            self._conn.commit()
+
+    def get_summary(self, digest: str, model: str, prompt_version: str) -> Optional[str]:
+        """
+        같은 내용, 같은 모델과 프롬프트 버전으로 만든 요약을 반환합니다.
+
+        Args:
+            digest: 내용 해시
+            model: 요약 모델명
+            prompt_version: 요약 프롬프트 버전
+
+        Returns:
+            저장된 요약 (없으면 None)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM pdf_summaries WHERE content_hash = ? AND model = ? AND prompt_version = ?",
+                (digest, model, prompt_version)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_summary(self, digest: str, model: str, prompt_version: str, summary: str):
+        """
+        요약을 저장합니다.
+
+        Args:
+            digest: 내용 해시
+            model: 요약 모델명
+            prompt_version: 요약 프롬프트 버전
+            summary: 요약
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pdf_summaries "
+                "(content_hash, model, prompt_version, summary, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (digest, model, prompt_version, summary, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        """데이터베이스 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
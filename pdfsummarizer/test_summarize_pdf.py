@@ -0,0 +1,125 @@
+"""
+iter_pdf_summaries 파이프라인과 긴 문서 조각 요약 테스트
+요약 요청은 가짜 함수로 바꾸고, 작은 PDF 파일을 만들어 모든 파일이 입력 순서대로 처리되는지,
+긴 문서의 한 페이지만 고치면 그 페이지가 든 조각만 다시 요약하는지 확인합니다.
+
+    python -m pytest pdfsummarizer
+"""
+
+import os
+import time
+
+import fitz
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import summarize_pdf
+from summary_cache import PdfManifest
+
+
+def make_pdfs(folder, count):
+    """'문서 N' 텍스트가 들어 있는 한 쪽짜리 PDF를 count개 만듭니다."""
+    paths = []
+    for n in range(count):
+        path = folder / f"doc_{n:02d}.pdf"
+        document = fitz.open()
+        document.new_page().insert_text((72, 72), f"document {n}")
+        document.save(str(path))
+        document.close()
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def fake_summarize(monkeypatch):
+    """요약 요청 대신 파일명을 돌려주는 가짜 함수 (호출된 파일명을 기록, doc_01은 느리게 응답)"""
+    calls = []
+
+    def summarize_text(text, filename):
+        calls.append(filename)
+        if filename == "doc_01.pdf":
+            time.sleep(0.5)
+        return f"요약: {filename}"
+
+    monkeypatch.setattr(summarize_pdf, "summarize_text", summarize_text)
+    return calls
+
+
+def test_all_files_processed_in_order_with_slow_file(tmp_path, fake_summarize):
+    pdfs = make_pdfs(tmp_path, 10)
+
+    results = list(summarize_pdf.iter_pdf_summaries(pdfs, extract_workers=2, concurrency=1))
+
+    assert [name for name, _, _ in results] == [p.name for p in pdfs]
+    assert all(error is None for _, _, error in results)
+    assert [summary for _, summary, _ in results] == [f"요약: {p.name}" for p in pdfs]
+    assert sorted(fake_summarize) == [p.name for p in pdfs]
+
+
+def test_unchanged_folder_is_fully_reused_from_manifest(tmp_path, fake_summarize):
+    pdfs = make_pdfs(tmp_path, 20)
+    manifest = PdfManifest(str(tmp_path / "manifest.sqlite3"))
+    try:
+        first = list(summarize_pdf.iter_pdf_summaries(pdfs, extract_workers=2, concurrency=1,
+                                                      manifest=manifest))
+        assert all(error is None for _, _, error in first)
+        fake_summarize.clear()
+
+        second = list(summarize_pdf.iter_pdf_summaries(pdfs, extract_workers=2, concurrency=1,
+                                                       manifest=manifest))
+    finally:
+        manifest.close()
+
+    assert second == first
+    assert fake_summarize == []
+    assert manifest.skipped == len(pdfs)
+
+
+def paged_text(pages):
+    """extract_text_from_pdf와 같은 형식으로 페이지 표시를 붙인 텍스트를 만듭니다."""
+    return "\n".join(f"--- 페이지 {n} ---\n{page}" for n, page in enumerate(pages, 1))
+
+
+@pytest.fixture
+def fake_requests(monkeypatch, tmp_path):
+    """임시 조각 요약 캐시를 쓰고, 요약 요청 대신 (작업 이름, 프롬프트)를 기록하는 가짜 함수"""
+    monkeypatch.setattr(summarize_pdf, "SUMMARY_CACHE_PATH", str(tmp_path / "summary_cache.sqlite3"))
+    monkeypatch.setattr(summarize_pdf, "_summary_cache", None)
+    monkeypatch.setattr(summarize_pdf, "CHUNK_TOKENS", 400)
+    calls = []
+
+    def create_summary(label, request):
+        prompt = request["messages"][-1]["content"]
+        calls.append((label, prompt))
+        return f"- 요약 {len(calls)}"
+
+    monkeypatch.setattr(summarize_pdf, "_create_summary", create_summary)
+    yield calls
+    summarize_pdf._summary_cache.close()
+
+
+def test_editing_one_page_only_resummarizes_its_chunk(fake_requests):
+    pages = [f"section {n} " + " ".join(f"item{n}-{k}" for k in range(20 + n % 7 * 6)) for n in range(60)]
+    summarize_pdf.summarize_long_text(paged_text(pages), "long.pdf")
+    first_chunks = [prompt for label, prompt in fake_requests if label == "summarize_chunk"]
+    assert len(first_chunks) > 5
+    fake_requests.clear()
+
+    pages[30] += " 수정한 문장" * 5
+    summarize_pdf.summarize_long_text(paged_text(pages), "long.pdf")
+
+    rerun_chunks = [prompt for label, prompt in fake_requests if label == "summarize_chunk"]
+    assert len(rerun_chunks) == 1
+    assert "수정한 문장" in rerun_chunks[0]
+
+
+def test_chunks_stay_under_limit_and_keep_every_page():
+    pages = [f"page {n} " + "word " * (10 + n * 7 % 90) for n in range(80)]
+    pages[5] = "very long page " + "token " * 3000
+
+    chunks = summarize_pdf.split_into_chunks(paged_text(pages), 400)
+
+    assert all(summarize_pdf.count_tokens(chunk, summarize_pdf.MODEL) <= 400 for chunk in chunks)
+    markers = [int(m.group(1)) for chunk in chunks for m in summarize_pdf.PAGE_MARKER.finditer(chunk)]
+    assert markers == list(range(1, len(pages) + 1))
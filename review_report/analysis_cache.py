@@ -0,0 +1,167 @@
+"""
+리뷰 분석 결과 캐시 모듈
+(모델, 프롬프트 버전, 정규화된 리뷰 텍스트)의 해시를 키로 SQLite 파일에 분석 결과를 저장합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+def normalize_review_text(text: str) -> str:
+    """
+    캐시 키 및 중복 판별에 사용할 수 있도록 리뷰 텍스트를 정규화합니다.
+    연속된 공백을 하나로 줄이고 앞뒤 공백을 제거한 뒤 소문자로 변환합니다.
+
+    Args:
+        text: 원본 리뷰 텍스트
+
+    Returns:
+        정규화된 리뷰 텍스트
+    """
+    return re.sub(r'\s+', ' ', str(text)).strip().lower()
+
+
+class AnalysisCache:
+    """SQLite 기반의 내용 주소 지정(content-addressed) 분석 결과 캐시"""
+
+    def __init__(self, db_path: str, max_entries: int = 500000):
+        """
+        Args:
+            db_path: 캐시 SQLite 파일 경로
+            max_entries: 보관할 최대 항목 수 (초과 시 오래 사용하지 않은 항목부터 삭제)
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS analysis_cache (
+                   key TEXT PRIMARY KEY,
+                   result TEXT NOT NULL,
+                   last_used REAL NOT NULL
+               )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_used "
+            "ON analysis_cache (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, text: str) -> str:
+        """
+        캐시 키를 생성합니다.
+
+        Args:
+            model: 분석에 사용한 모델명
+            prompt_version: 프롬프트 버전 (프롬프트가 바뀌면 캐시가 자동으로 무효화됨)
+            text: 리뷰 텍스트
+
+        Returns:
+            SHA-256 해시 문자열
+        """
+        payload = f"{model}\x00{prompt_version}\x00{normalize_review_text(text)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        """
+        여러 키의 캐시 결과를 한 번에 조회하고 적중/미스 횟수를 기록합니다.
+
+        Args:
+            keys: 조회할 캐시 키 리스트
+
+        Returns:
+            {키: 분석 결과} 딕셔너리 (캐시에 없는 키는 포함되지 않음)
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            # SQLite 변수 개수 제한을 고려하여 나누어 조회
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, result FROM analysis_cache WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, result in rows:
+                    found[key] = json.loads(result)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE analysis_cache SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            hit_count = sum(1 for key in keys if key in found)
+            self.hits += hit_count
+            self.misses += len(keys) - hit_count
+
+        return found
+
+    def put_many(self, items: Dict[str, dict]):
+        """
+        분석 결과를 캐시에 저장하고, 최대 항목 수를 넘으면 오래된 항목을 삭제합니다.
+
+        Args:
+            items: {키: 분석 결과} 딕셔너리
+        """
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO analysis_cache (key, result, last_used) VALUES (?, ?, ?)",
+                [(key, json.dumps(result, ensure_ascii=False), now) for key, result in items.items()]
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """최대 항목 수를 초과한 만큼 가장 오래 사용하지 않은 항목을 삭제합니다."""
+        count = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM analysis_cache WHERE key IN ("
+                "SELECT key FROM analysis_cache ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        캐시 적중/미스 통계를 반환합니다.
+
+        Returns:
+            hits, misses, entries를 담은 딕셔너리
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self)
+        }
+
+    def close(self):
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
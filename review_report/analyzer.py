@@ -7,28 +7,87 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional
 from collections import Counter
-import re
 import os
-import json
-import time
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from openai import OpenAI
+from rate_limiter import RateLimiter
+from analysis_cache import AnalysisCache, normalize_review_text
+from local_classifier import LexiconClassifier
+from checkpoint import AnalysisJournal
+from keyword_extractor import LocalKeywordExtractor
+
+# 저장소 루트의 공용 모듈(openai_common) 사용
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+from openai_common import (BatchRunner, StructuredOutputError, TokenBudgetExceeded, UsageTracker,
+                           count_message_tokens, count_tokens, get_client, is_retryable,
+                           parse_structured_response, repair_messages, response_format)
+from stats_engine import GroupStatsEngine
+from schemas import KeywordExtraction, ReviewAnalysis, ReviewBatchAnalysis
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
+# 리뷰 분석 프롬프트 버전 (프롬프트나 응답 형식을 바꾸면 올려서 캐시를 무효화)
+PROMPT_VERSION = "review-v2"
+
 
 class ReviewAnalyzer:
     """리뷰 데이터를 분석하는 클래스"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini",
+                 max_workers: int = 8, requests_per_minute: Optional[int] = 500,
+                 tokens_per_minute: Optional[int] = 200000,
+                 batched: bool = True, batch_token_budget: int = 3000,
+                 max_reviews_per_batch: int = 40,
+                 cache_path: Optional[str] = None,
+                 cache_max_entries: int = 500000,
+                 local_classifier: Optional[LexiconClassifier] = None,
+                 journal: Optional[AnalysisJournal] = None,
+                 keyword_token_budget: int = 6000,
+                 keyword_engine: str = 'llm',
+                 group_dimensions: Optional[List[str]] = None,
+                 cross_tabs: Optional[List[tuple]] = None,
+                 usage_tracker: Optional[UsageTracker] = None,
+                 batch_api: bool = False, batch_dir: str = 'batch_jobs',
+                 batch_poll_interval: float = 30.0,
+                 batch_max_wait: Optional[float] = None):
         """
         분석기 초기화
         
         Args:
             api_key: OpenAI API 키 (None이면 .env에서 자동 로드)
             model: 사용할 OpenAI 모델 (기본값: gpt-4o-mini)
+            max_workers: 동시에 진행할 최대 API 요청 수 (1이면 순차 실행)
+            requests_per_minute: 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute: 분당 최대 토큰 수 (None이면 제한 없음)
+            batched: 여러 리뷰를 한 번의 요청으로 묶어 감정을 분류할지 여부
+            batch_token_budget: 묶음 요청 하나에 담을 리뷰 본문의 최대 토큰 수
+            max_reviews_per_batch: 묶음 요청 하나에 담을 최대 리뷰 수
+            cache_path: 분석 결과 캐시 SQLite 파일 경로 (None이면 캐시 사용 안 함)
+            cache_max_entries: 캐시에 보관할 최대 항목 수
+            local_classifier: 명확한 리뷰를 API 없이 분류할 로컬 분류기 (None이면 모든 리뷰를 API로 분석)
+            journal: 분석이 끝난 리뷰를 즉시 기록하고 재실행 시 건너뛰는 체크포인트 저널
+            keyword_token_budget: 키워드 추출 요청 하나에 담을 리뷰 본문의 최대 토큰 수
+            keyword_engine: 키워드 추출 방식
+                'llm' - OpenAI API로 묶음별 후보 추출 후 전체 리뷰에서 언급 횟수 집계
+                'local' - API 없이 n-gram TF-IDF로 추출
+                'hybrid' - 로컬 추출 결과를 OpenAI 후보와 합쳐 함께 순위를 매김
+            group_dimensions: 그룹별 통계를 낼 컬럼 리스트 (None이면 노트북모델/연령대/성별)
+            cross_tabs: 교차 통계를 낼 컬럼 조합 리스트 (None이면 노트북모델 × 연령대)
+            usage_tracker: 토큰 예산 확인 및 사용량/비용/지연 시간 기록기
+                (None이면 환경 변수 OPENAI_RUN_TOKEN_BUDGET, OPENAI_CALL_TOKEN_BUDGET 사용)
+            batch_api: OpenAI 요청을 동기 호출 대신 Batch API로 모아 제출하는 오프라인 모드 사용 여부
+                (응답까지 최대 24시간이 걸리는 대신 처리 한도가 크고 비용이 절반)
+            batch_dir: Batch API 입력 파일과 제출 상태를 저장할 폴더
+            batch_poll_interval: Batch API 상태를 확인하는 간격(초)
+            batch_max_wait: Batch API 결과를 기다릴 최대 시간(초) (None이면 완료될 때까지 대기)
         """
+        if keyword_engine not in ('llm', 'local', 'hybrid'):
+            raise ValueError(f"지원하지 않는 키워드 추출 방식입니다: {keyword_engine} (llm, local, hybrid)")
+        
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError(
@@ -36,7 +95,136 @@ class ReviewAnalyzer:
                 "생성자에 api_key를 전달하세요."
             )
         self.model = model
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_client(self.api_key)
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.usage = usage_tracker or UsageTracker.from_env()
+        self.batched = batched
+        self.batch_token_budget = batch_token_budget
+        self.max_reviews_per_batch = max(1, max_reviews_per_batch)
+        self.cache = AnalysisCache(cache_path, cache_max_entries) if cache_path else None
+        self.local_classifier = local_classifier
+        self.journal = journal
+        self.keyword_token_budget = keyword_token_budget
+        self.keyword_engine = keyword_engine
+        self.group_dimensions = group_dimensions
+        self.cross_tabs = cross_tabs
+        self.keyword_extractor = LocalKeywordExtractor() if keyword_engine != 'llm' else None
+        self.batch_runner = BatchRunner(
+            self.client, self.usage, work_dir=batch_dir,
+            poll_interval=batch_poll_interval, max_wait=batch_max_wait
+        ) if batch_api else None
+    
+    def _estimate_tokens(self, messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """
+        요청에 사용될 토큰 수를 로컬에서 계산합니다.
+        
+        Args:
+            messages: 전송할 메시지 목록
+            max_tokens: 응답 최대 토큰 수
+            
+        Returns:
+            예상 토큰 수 (입력 + 최대 출력)
+        """
+        return count_message_tokens(messages, self.model) + max_tokens
+    
+    def _create_chat_completion(self, messages: List[Dict[str, str]], max_tokens: int,
+                                label: str = 'review', **kwargs):
+        """
+        속도 제한 예산을 확보한 뒤 Chat Completion API를 호출합니다.
+        재시도도 매번 속도 제한 예산을 다시 확보한 뒤 보냅니다.
+        토큰 예산을 넘는 요청은 보내지 않고 TokenBudgetExceeded를 발생시킵니다.
+        
+        Args:
+            messages: 전송할 메시지 목록
+            max_tokens: 응답 최대 토큰 수
+            label: 사용량 보고서에서 묶을 작업 이름
+            **kwargs: chat.completions.create에 그대로 전달할 인자 (temperature, response_format 등)
+            
+        Returns:
+            OpenAI 응답 객체
+        """
+        estimated_tokens = self._estimate_tokens(messages, max_tokens)
+        
+        response = self.usage.create_chat_completion(
+            self.client, label, messages, self.model,
+            before_attempt=lambda: self.rate_limiter.acquire(estimated_tokens),
+            max_tokens=max_tokens, **kwargs
+        )
+        
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            self.rate_limiter.record_usage(estimated_tokens, usage.total_tokens)
+        return response
+    
+    def _run_concurrently(self, func, items: List[Any], 
+                          progress_every: int = 10, on_result=None) -> List[Any]:
+        """
+        스레드 풀에서 항목별 작업을 동시에 실행하고 입력 순서대로 결과를 반환합니다.
+        
+        Args:
+            func: 각 항목에 적용할 함수
+            items: 처리할 항목 리스트
+            progress_every: 진행 상황을 출력할 완료 건수 간격
+            on_result: 항목 하나가 끝날 때마다 (인덱스, 결과)로 호출할 함수 (호출 스레드에서 실행)
+            
+        Returns:
+            입력 순서와 같은 순서의 결과 리스트
+        """
+        total = len(items)
+        results = [None] * total
+        
+        if self.max_workers == 1:
+            for i, item in enumerate(items):
+                results[i] = func(item)
+                if on_result is not None:
+                    on_result(i, results[i])
+                if (i + 1) % progress_every == 0:
+                    print(f"진행 중: {i + 1}/{total} ({(i + 1)/total*100:.1f}%)")
+            return results
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(func, item): i for i, item in enumerate(items)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                results[i] = future.result()
+                if on_result is not None:
+                    on_result(i, results[i])
+                if done % progress_every == 0:
+                    print(f"진행 중: {done}/{total} ({done/total*100:.1f}%)")
+        
+        return results
+    
+    def _structured_completion(self, request: Dict[str, Any], model_cls, label: str):
+        """
+        구조화된 출력 요청을 보내고 응답을 스키마 모델로 검증합니다.
+        검증에 실패하면 한 번만 다시 요청합니다. 응답이 최대 토큰에서 잘린 경우에는 같은 요청을
+        두 배의 최대 토큰으로, 그 밖의 경우에는 실패한 응답과 오류를 보여 주고 수정을 요청합니다.
+        
+        Args:
+            request: _review_request 등이 만든 요청 인자 (messages, max_tokens, response_format 등)
+            model_cls: 응답을 검증할 pydantic 모델
+            label: 사용량 보고서에서 묶을 작업 이름
+            
+        Returns:
+            검증된 모델 인스턴스
+            
+        Raises:
+            StructuredOutputError: 수정 요청 후에도 응답이 스키마에 맞지 않거나 모델이 응답을 거부한 경우
+        """
+        response = self._create_chat_completion(**request, label=label)
+        try:
+            return parse_structured_response(model_cls, response)
+        except StructuredOutputError as e:
+            if e.refusal:
+                raise
+            if e.truncated:
+                retry = {**request, 'max_tokens': request['max_tokens'] * 2}
+            else:
+                retry = {**request, 'messages': repair_messages(request['messages'], e)}
+        
+        response = self._create_chat_completion(**retry, label=f"{label}_repair")
+        return parse_structured_response(model_cls, response)
     
     def analyze_basic_stats(self, df: pd.DataFrame, review_col: str, 
                            rating_col: str = '평점') -> Dict[str, Any]:
@@ -57,77 +245,14 @@ class ReviewAnalyzer:
             'rating_column': rating_col
         }
         
-        # 평점 분석
-        if rating_col in df.columns:
-            ratings = df[rating_col].dropna()
-            results['rating_stats'] = {
-                'mean': float(ratings.mean()),
-                'median': float(ratings.median()),
-                'std': float(ratings.std()),
-                'min': int(ratings.min()),
-                'max': int(ratings.max())
-            }
-            
-            # 평점 분포
-            rating_dist = ratings.value_counts().sort_index().to_dict()
-            results['rating_distribution'] = {int(k): int(v) for k, v in rating_dist.items()}
-            
-            # 평점 비율
-            total = len(ratings)
-            results['rating_percentage'] = {
-                int(k): round(v / total * 100, 2) 
-                for k, v in rating_dist.items()
-            }
-        else:
-            results['rating_stats'] = None
-            results['rating_distribution'] = None
-            results['rating_percentage'] = None
-        
-        # 노트북 모델별 분석
-        if '노트북모델' in df.columns:
-            model_stats = df.groupby('노트북모델').agg({
-                rating_col: ['mean', 'count'] if rating_col in df.columns else 'count'
-            }).round(2)
-            
-            if rating_col in df.columns:
-                model_stats.columns = ['평균평점', '리뷰수']
-                model_stats = model_stats.sort_values('평균평점', ascending=False)
-            else:
-                model_stats.columns = ['리뷰수']
-                model_stats = model_stats.sort_values('리뷰수', ascending=False)
-            
-            results['model_statistics'] = model_stats.to_dict('index')
-        
-        # 연령대별 분석
-        if '연령대' in df.columns:
-            age_stats = df.groupby('연령대').agg({
-                rating_col: 'mean' if rating_col in df.columns else 'count'
-            }).round(2)
-            
-            if rating_col in df.columns:
-                age_stats.columns = ['평균평점']
-            else:
-                age_stats.columns = ['리뷰수']
-            
-            results['age_statistics'] = age_stats.to_dict('index')
-        
-        # 성별 분석
-        if '성별' in df.columns:
-            gender_stats = df.groupby('성별').agg({
-                rating_col: 'mean' if rating_col in df.columns else 'count'
-            }).round(2)
-            
-            if rating_col in df.columns:
-                gender_stats.columns = ['평균평점']
-            else:
-                gender_stats.columns = ['리뷰수']
-            
-            results['gender_statistics'] = gender_stats.to_dict('index')
+        # 평점 통계와 그룹별/교차 통계를 한 번의 인코딩으로 계산
+        engine = GroupStatsEngine(rating_col, self.group_dimensions, self.cross_tabs)
+        results.update(engine.compute(df))
         
         # 구매일자 분석
         if '구매일자' in df.columns:
-            df['구매일자'] = pd.to_datetime(df['구매일자'], errors='coerce')
-            date_range = df['구매일자'].dropna()
+            # 원본 데이터프레임을 수정하지 않도록 변환 결과는 별도 시리즈로 보관
+            date_range = pd.to_datetime(df['구매일자'], errors='coerce').dropna()
             if len(date_range) > 0:
                 results['date_range'] = {
                     'start': date_range.min().strftime('%Y-%m-%d'),
@@ -137,124 +262,524 @@ class ReviewAnalyzer:
         
         return results
     
-    def _analyze_review_with_openai(self, review: str) -> Dict[str, str]:
+    def _review_request(self, review: str) -> Dict[str, Any]:
         """
-        OpenAI API를 사용하여 개별 리뷰를 분석합니다.
+        개별 리뷰 분석 요청을 만듭니다 (응답 형식은 ReviewAnalysis 스키마로 고정).
         
         Args:
             review: 분석할 리뷰 텍스트
             
         Returns:
-            분석 결과 딕셔너리 (sentiment, summary)
+            chat.completions.create에 전달할 인자 딕셔너리 (messages, max_tokens, response_format 등)
         """
-        prompt = f"""다음 고객 리뷰를 분석해주세요. JSON 형식으로 응답해주세요.
+        prompt = f"""다음 고객 리뷰를 분석해주세요.
 
 리뷰: {review}
 
-다음 형식으로 응답해주세요:
-{{
-    "sentiment": "positive" 또는 "negative" 또는 "neutral",
-    "summary": "리뷰의 핵심 내용을 1-2문장으로 요약"
-}}
+- sentiment: "positive", "negative", "neutral" 중 하나
+- summary: 리뷰의 핵심 내용을 1-2문장으로 요약"""
+
+        return {
+            'messages': [
+                {"role": "system", "content": "당신은 고객 리뷰를 분석하는 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            # 스키마로 응답 형식이 고정되고 잘린 응답은 한 번 다시 요청하므로 최대 토큰을 좁게 잡음
+            'max_tokens': 150,
+            'temperature': 0.3,
+            'response_format': response_format(ReviewAnalysis)
+        }
+    
+    def _analyze_review_with_openai(self, review: str) -> Dict[str, str]:
+        """
+        OpenAI API를 사용하여 개별 리뷰를 분석합니다.
+        일시적인 오류는 공용 클라이언트의 재시도 정책으로 다시 시도하며,
+        그래도 실패하면 임의의 감정으로 채우지 않고 오류를 담아 반환합니다.
+        
+        Args:
+            review: 분석할 리뷰 텍스트
+            
+        Returns:
+            분석 결과 딕셔너리 (sentiment, summary), 실패하면 {"error": 오류 메시지}
+        """
+        try:
+            analysis = self._structured_completion(self._review_request(review), ReviewAnalysis, 'review')
+            return analysis.model_dump()
+        except TokenBudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"리뷰 분석 중 오류 발생: {str(e)}")
+            return {"error": str(e)}
+    
+    def _build_review_batches(self, reviews: List[str], token_budget: Optional[int] = None,
+                              max_items: Optional[int] = None) -> List[List[int]]:
+        """
+        리뷰 본문의 토큰 예산에 맞춰 리뷰 인덱스를 묶음으로 나눕니다.
+        
+        Args:
+            reviews: 분석할 리뷰 리스트
+            token_budget: 묶음 하나의 최대 토큰 수 (None이면 batch_token_budget)
+            max_items: 묶음 하나의 최대 리뷰 수 (None이면 max_reviews_per_batch)
+            
+        Returns:
+            묶음별 리뷰 인덱스 리스트
+        """
+        token_budget = token_budget or self.batch_token_budget
+        max_items = max_items or self.max_reviews_per_batch
+        batches = []
+        current = []
+        current_tokens = 0
+        
+        for i, review in enumerate(reviews):
+            review_tokens = count_tokens(review, self.model) + 5  # 번호 표기 등 여유분
+            if current and (current_tokens + review_tokens > token_budget
+                            or len(current) >= max_items):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(i)
+            current_tokens += review_tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _review_batch_request(self, batch: List[str]) -> Dict[str, Any]:
+        """
+        여러 리뷰를 한 번에 분석하는 묶음 요청을 만듭니다 (응답 형식은 ReviewBatchAnalysis 스키마로 고정).
+        
+        Args:
+            batch: 분석할 리뷰 리스트
+            
+        Returns:
+            chat.completions.create에 전달할 인자 딕셔너리 (messages, max_tokens, response_format 등)
+        """
+        reviews_text = "\n".join([f"[{i}] {review}" for i, review in enumerate(batch)])
+        
+        prompt = f"""다음 고객 리뷰들을 각각 분석해주세요. 대괄호 안의 숫자가 리뷰 번호입니다.
+
+리뷰 목록:
+{reviews_text}
 
-응답은 반드시 JSON 형식만 반환하세요."""
+results에 모든 리뷰 번호마다 하나씩 다음 항목을 넣어주세요:
+- index: 리뷰 번호
+- sentiment: "positive", "negative", "neutral" 중 하나
+- summary: 리뷰의 핵심 내용을 1-2문장으로 요약"""
 
+        return {
+            'messages': [
+                {"role": "system", "content": "당신은 고객 리뷰를 분석하는 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            'max_tokens': 70 * len(batch) + 50,
+            'temperature': 0.3,
+            'response_format': response_format(ReviewBatchAnalysis)
+        }
+    
+    @staticmethod
+    def _review_batch_results(parsed: ReviewBatchAnalysis, size: int) -> List[Optional[Dict[str, str]]]:
+        """
+        검증된 묶음 응답을 리뷰 순서대로 정렬된 분석 결과로 변환합니다.
+        
+        Args:
+            parsed: 검증된 묶음 응답
+            size: 묶음에 담은 리뷰 수
+            
+        Returns:
+            리뷰 순서대로 정렬된 분석 결과 리스트 (응답에서 누락되거나 번호가 범위를 벗어난 항목은 None)
+        """
+        results: List[Optional[Dict[str, str]]] = [None] * size
+        for item in parsed.results:
+            if 0 <= item.index < size:
+                results[item.index] = {'sentiment': item.sentiment, 'summary': item.summary}
+        return results
+    
+    def _analyze_review_batch_with_openai(self, batch: List[str]) -> List[Optional[Dict[str, str]]]:
+        """
+        OpenAI API를 사용하여 여러 리뷰를 한 번의 요청으로 분석합니다.
+        
+        Args:
+            batch: 분석할 리뷰 리스트
+            
+        Returns:
+            리뷰 순서대로 정렬된 분석 결과 리스트 (파싱에 실패한 항목은 None,
+            재시도 후에도 API 호출이 실패한 경우 모든 항목이 {"error": 오류 메시지})
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "당신은 고객 리뷰를 분석하는 전문가입니다. JSON 형식으로만 응답하세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=200
+            parsed = self._structured_completion(
+                self._review_batch_request(batch), ReviewBatchAnalysis, 'review_batch'
             )
+        except TokenBudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"묶음 리뷰 분석 중 오류 발생: {str(e)}")
+            if is_retryable(e):
+                # 재시도를 모두 소진한 일시적 오류는 개별 요청으로 다시 보내지 않고 실패로 표시
+                return [{"error": str(e)} for _ in batch]
+            return [None] * len(batch)
+        
+        return self._review_batch_results(parsed, len(batch))
+    
+    def _analyze_reviews(self, reviews: List[str], progress_every: int = 10) -> List[Dict[str, str]]:
+        """
+        리뷰 리스트를 분석합니다. 체크포인트 저널이나 캐시에 결과가 있으면 재사용하고,
+        나머지 리뷰만 API로 분석합니다. 새로 분석한 결과는 끝나는 즉시 저널에 기록하고,
+        모든 분석이 끝나면 캐시에 저장합니다.
+        
+        Args:
+            reviews: 분석할 리뷰 리스트
+            progress_every: 진행 상황을 출력할 완료 건수 간격
             
-            result_text = response.choices[0].message.content.strip()
-            # JSON 추출 (코드 블록 제거)
-            if result_text.startswith("```json"):
-                result_text = result_text[7:]
-            if result_text.startswith("```"):
-                result_text = result_text[3:]
-            if result_text.endswith("```"):
-                result_text = result_text[:-3]
-            result_text = result_text.strip()
+        Returns:
+            리뷰 순서대로 정렬된 분석 결과 리스트
+        """
+        if self.cache is None and self.journal is None:
+            return self._request_analyses(reviews, progress_every)
+        
+        keys = [AnalysisCache.make_key(self.model, PROMPT_VERSION, review) for review in reviews]
+        analyses: List[Optional[Dict[str, str]]] = [None] * len(reviews)
+        
+        if self.journal is not None:
+            for i, key in enumerate(keys):
+                analyses[i] = self.journal.get(key)
+            resumed = sum(1 for analysis in analyses if analysis is not None)
+            if resumed:
+                print(f"체크포인트에서 {resumed}개 리뷰의 분석 결과를 복구했습니다.")
+        
+        if self.cache is not None:
+            lookup = [i for i, analysis in enumerate(analyses) if analysis is None]
+            cached = self.cache.get_many([keys[i] for i in lookup])
+            for i in lookup:
+                analyses[i] = cached.get(keys[i])
+        
+        pending = [i for i, analysis in enumerate(analyses) if analysis is None]
+        print(f"재사용한 결과: {len(reviews) - len(pending)}개, 새로 분석할 리뷰: {len(pending)}개")
+        
+        if pending:
+            def record(j: int, analysis: Dict[str, str]):
+                if self.journal is not None and 'error' not in analysis:
+                    self.journal.append(keys[pending[j]], analysis)
             
-            result = json.loads(result_text)
-            return result
-        except Exception as e:
-            print(f"리뷰 분석 중 오류 발생: {str(e)}")
-            return {"sentiment": "neutral", "summary": "분석 실패"}
+            fresh = self._request_analyses(
+                [reviews[i] for i in pending], progress_every, on_result=record
+            )
+            new_entries = {}
+            for i, analysis in zip(pending, fresh):
+                analyses[i] = analysis
+                if 'error' not in analysis:
+                    new_entries[keys[i]] = analysis
+            
+            if self.journal is not None:
+                self.journal.sync()
+            if self.cache is not None:
+                self.cache.put_many(new_entries)
+        
+        return analyses
     
-    def _extract_keywords_with_openai(self, reviews_list: List[str], sentiment_type: str) -> Dict[str, Any]:
+    def _request_analyses(self, reviews: List[str], progress_every: int = 10,
+                          on_result=None) -> List[Dict[str, str]]:
         """
-        OpenAI API를 사용하여 긍정/부정 키워드를 추출합니다.
+        API로 리뷰 리스트를 분석합니다. 묶음 모드에서는 여러 리뷰를 한 요청으로 보내고,
+        응답을 파싱하지 못한 리뷰만 개별 요청으로 다시 분석합니다.
         
         Args:
-            reviews_list: 분석할 리뷰 리스트
+            reviews: 분석할 리뷰 리스트
+            progress_every: 진행 상황을 출력할 완료 건수 간격
+            on_result: 리뷰 하나의 분석이 확정될 때마다 (인덱스, 결과)로 호출할 함수
+            
+        Returns:
+            리뷰 순서대로 정렬된 분석 결과 리스트
+        """
+        if self.batch_runner is not None:
+            return self._request_analyses_with_batch_api(reviews, on_result)
+        
+        if not self.batched:
+            return self._run_concurrently(
+                self._analyze_review_with_openai, reviews,
+                progress_every=progress_every, on_result=on_result
+            )
+        
+        batches = self._build_review_batches(reviews)
+        print(f"{len(batches)}개의 묶음 요청으로 분석합니다...")
+        
+        def record_batch(batch_index: int, results: List[Optional[Dict[str, str]]]):
+            if on_result is None:
+                return
+            for i, result in zip(batches[batch_index], results):
+                if result is not None:
+                    on_result(i, result)
+        
+        batch_results = self._run_concurrently(
+            lambda indices: self._analyze_review_batch_with_openai([reviews[i] for i in indices]),
+            batches,
+            progress_every=max(1, len(batches) // 10),
+            on_result=record_batch
+        )
+        
+        analyses: List[Optional[Dict[str, str]]] = [None] * len(reviews)
+        for indices, results in zip(batches, batch_results):
+            for i, result in zip(indices, results):
+                analyses[i] = result
+        
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if missing:
+            print(f"묶음 응답에서 누락된 {len(missing)}개 리뷰를 개별 분석합니다...")
+            retried = self._run_concurrently(
+                self._analyze_review_with_openai,
+                [reviews[i] for i in missing],
+                progress_every=progress_every,
+                on_result=None if on_result is None else lambda j, result: on_result(missing[j], result)
+            )
+            for i, result in zip(missing, retried):
+                analyses[i] = result
+        
+        return analyses
+    
+    def _request_analyses_with_batch_api(self, reviews: List[str],
+                                         on_result=None) -> List[Dict[str, str]]:
+        """
+        Batch API로 리뷰 리스트를 분석합니다 (오프라인 모드).
+        묶음 요청(또는 개별 요청)을 배치 파일 하나로 제출하고 완료를 기다린 뒤 결과를 리뷰에 다시 연결합니다.
+        묶음 응답에서 누락된 리뷰는 개별 요청으로 만든 두 번째 배치로 다시 분석합니다.
+        
+        Args:
+            reviews: 분석할 리뷰 리스트
+            on_result: 리뷰 하나의 분석이 확정될 때마다 (인덱스, 결과)로 호출할 함수
+            
+        Returns:
+            리뷰 순서대로 정렬된 분석 결과 리스트 (실패한 리뷰는 {"error": 오류 메시지})
+        """
+        analyses: List[Optional[Dict[str, str]]] = [None] * len(reviews)
+        
+        if self.batched:
+            batches = self._build_review_batches(reviews)
+            responses = self.batch_runner.run(
+                'review_batch', self.model,
+                [self._review_batch_request([reviews[i] for i in indices]) for indices in batches]
+            )
+            for indices, response in zip(batches, responses):
+                try:
+                    if isinstance(response, Exception):
+                        raise response
+                    parsed = parse_structured_response(ReviewBatchAnalysis, response)
+                except Exception:
+                    continue  # 묶음의 리뷰는 아래에서 개별 요청으로 다시 분석
+                for i, result in zip(indices, self._review_batch_results(parsed, len(indices))):
+                    analyses[i] = result
+        
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if missing:
+            if self.batched:
+                print(f"묶음 응답에서 누락된 {len(missing)}개 리뷰를 개별 요청 배치로 다시 분석합니다...")
+            responses = self.batch_runner.run(
+                'review', self.model, [self._review_request(reviews[i]) for i in missing]
+            )
+            for i, response in zip(missing, responses):
+                try:
+                    if isinstance(response, Exception):
+                        raise response
+                    analyses[i] = parse_structured_response(ReviewAnalysis, response).model_dump()
+                except Exception as e:
+                    analyses[i] = {"error": str(e)}
+        
+        if on_result is not None:
+            for i, analysis in enumerate(analyses):
+                on_result(i, analysis)
+        return analyses
+    
+    def _keyword_request(self, reviews_list: List[str], sentiment_type: str) -> Dict[str, Any]:
+        """
+        리뷰 묶음 하나에서 키워드 후보를 추출하는 요청을 만듭니다 (응답 형식은 KeywordExtraction 스키마로 고정).
+        
+        Args:
+            reviews_list: 분석할 리뷰 리스트 (키워드 토큰 예산에 맞춰 나눈 묶음)
             sentiment_type: 'positive' 또는 'negative'
             
         Returns:
-            키워드 및 관련 리뷰 딕셔너리
+            chat.completions.create에 전달할 인자 딕셔너리 (messages, max_tokens, response_format 등)
         """
-        reviews_text = "\n".join([f"- {review}" for review in reviews_list[:50]])  # 최대 50개만
+        reviews_text = "\n".join([f"- {review}" for review in reviews_list])
         
         prompt = f"""다음 {sentiment_type} 리뷰들을 분석하여 주요 키워드와 각 키워드에 해당하는 리뷰를 추출해주세요.
 
 리뷰 목록:
 {reviews_text}
 
-다음 JSON 형식으로 응답해주세요:
-{{
-    "keywords": [
-        {{
-            "keyword": "키워드명",
-            "count": 키워드가 언급된 리뷰 수,
-            "reviews": ["관련 리뷰 1", "관련 리뷰 2", ...]
-        }}
-    ]
-}}
+keywords에 키워드마다 다음 항목을 넣어주세요:
+- keyword: 키워드명 (리뷰에 실제로 등장하는 표현을 그대로 사용)
+- count: 키워드가 언급된 리뷰 수
+- reviews: 관련 리뷰 (최대 5개)
 
-상위 10개 키워드만 추출하고, 각 키워드당 최대 5개의 관련 리뷰를 포함하세요.
-응답은 반드시 JSON 형식만 반환하세요."""
+상위 10개 키워드만 추출하세요."""
 
+        return {
+            'messages': [
+                {"role": "system", "content": "당신은 고객 리뷰에서 키워드를 추출하는 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            'max_tokens': 2000,
+            'temperature': 0.3,
+            'response_format': response_format(KeywordExtraction)
+        }
+    
+    def _extract_keywords_with_openai(self, reviews_list: List[str], sentiment_type: str) -> Dict[str, Any]:
+        """
+        OpenAI API를 사용하여 리뷰 묶음 하나에서 긍정/부정 키워드를 추출합니다.
+        
+        Args:
+            reviews_list: 분석할 리뷰 리스트 (키워드 토큰 예산에 맞춰 나눈 묶음)
+            sentiment_type: 'positive' 또는 'negative'
+            
+        Returns:
+            키워드 및 관련 리뷰 딕셔너리
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "당신은 고객 리뷰에서 키워드를 추출하는 전문가입니다. JSON 형식으로만 응답하세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
+            extraction = self._structured_completion(
+                self._keyword_request(reviews_list, sentiment_type), KeywordExtraction, 'keywords'
             )
-            
-            result_text = response.choices[0].message.content.strip()
-            # JSON 추출 (코드 블록 제거)
-            if result_text.startswith("```json"):
-                result_text = result_text[7:]
-            if result_text.startswith("```"):
-                result_text = result_text[3:]
-            if result_text.endswith("```"):
-                result_text = result_text[:-3]
-            result_text = result_text.strip()
-            
-            result = json.loads(result_text)
-            return result
+            return extraction.model_dump()
+        except TokenBudgetExceeded:
+            raise
         except Exception as e:
             print(f"키워드 추출 중 오류 발생: {str(e)}")
-            return {"keywords": []}
+            return {"keywords": [], "error": str(e)}
+    
+    def _extract_keywords_map_reduce(self, reviews_list: List[str], sentiment_type: str,
+                                     top_n: int = 10, max_candidates: int = 200,
+                                     extra_candidates: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        모든 리뷰를 대상으로 키워드를 추출합니다.
+        리뷰를 토큰 예산에 맞춰 나눈 묶음별로 키워드 후보를 동시에 추출(map)하고,
+        후보를 합친 뒤 전체 리뷰에서 실제 언급 횟수를 직접 세어 순위를 다시 매깁니다(reduce).
+        리뷰 원문에 그대로 등장하지 않아 LLM 추정 횟수만 있는 키워드는 estimated로 표시하고,
+        직접 센 키워드 뒤에 둡니다 (추정치가 부풀려져도 실제로 센 키워드를 앞지르지 않도록).
+        
+        Args:
+            reviews_list: 분석할 리뷰 리스트
+            sentiment_type: 'positive' 또는 'negative'
+            top_n: 반환할 키워드 수
+            max_candidates: 언급 횟수를 셀 최대 후보 키워드 수
+            extra_candidates: OpenAI 후보와 함께 순위를 매길 추가 후보 (로컬 추출 결과 등)
+            
+        Returns:
+            키워드 리스트 (keyword, count, reviews, estimated)
+            직접 센 키워드가 언급 횟수 순으로 먼저, 추정 횟수만 있는 키워드가 그 뒤에 옴
+        """
+        # 같은 리뷰는 후보 추출에 한 번만 사용 (언급 횟수는 전체 리뷰 기준으로 셈)
+        unique_reviews = list(dict.fromkeys(reviews_list))
+        chunks = self._build_review_batches(
+            unique_reviews, token_budget=self.keyword_token_budget, max_items=len(unique_reviews)
+        )
+        print(f"  {len(unique_reviews)}개 리뷰를 {len(chunks)}개 묶음으로 나누어 키워드 후보를 추출합니다...")
+        
+        if self.batch_runner is not None:
+            responses = self.batch_runner.run(
+                f'keywords_{sentiment_type}', self.model,
+                [self._keyword_request([unique_reviews[i] for i in indices], sentiment_type) for indices in chunks]
+            )
+            partials = []
+            for response in responses:
+                try:
+                    if isinstance(response, Exception):
+                        raise response
+                    partials.append(parse_structured_response(KeywordExtraction, response).model_dump())
+                except Exception as e:
+                    partials.append({"keywords": [], "error": str(e)})
+        else:
+            partials = self._run_concurrently(
+                lambda indices: self._extract_keywords_with_openai(
+                    [unique_reviews[i] for i in indices], sentiment_type
+                ),
+                chunks,
+                progress_every=max(1, len(chunks) // 10)
+            )
+        
+        failed_chunks = sum(1 for partial in partials if isinstance(partial, dict) and 'error' in partial)
+        if failed_chunks:
+            print(f"  경고: {len(chunks)}개 묶음 중 {failed_chunks}개에서 키워드 후보를 추출하지 못했습니다.")
+        
+        if extra_candidates:
+            partials.append({'keywords': extra_candidates})
+        
+        # 후보 병합: 같은 키워드(공백/대소문자 무시)의 LLM 추정 횟수와 관련 리뷰를 합침
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for partial in partials:
+            for item in partial.get('keywords', []) if isinstance(partial, dict) else []:
+                if not isinstance(item, dict) or not str(item.get('keyword', '')).strip():
+                    continue
+                keyword = str(item['keyword']).strip()
+                entry = candidates.setdefault(
+                    normalize_review_text(keyword),
+                    {'keyword': keyword, 'estimated': 0, 'reviews': []}
+                )
+                try:
+                    entry['estimated'] += int(item.get('count', 0))
+                except (TypeError, ValueError):
+                    pass
+                entry['reviews'].extend(str(review) for review in item.get('reviews', []))
+        
+        ranked_candidates = sorted(candidates.items(), key=lambda kv: kv[1]['estimated'], reverse=True)
+        
+        # 전체 리뷰에서 키워드가 등장하는 리뷰 수를 직접 셈
+        normalized_reviews = [normalize_review_text(review) for review in reviews_list]
+        keywords = []
+        for normalized_keyword, entry in ranked_candidates[:max_candidates]:
+            matched = [i for i, text in enumerate(normalized_reviews) if normalized_keyword in text]
+            if matched:
+                count = len(matched)
+                examples = list(dict.fromkeys(reviews_list[i] for i in matched))
+            else:
+                # 리뷰 원문에 그대로 등장하지 않는 요약형 키워드는 LLM 추정치를 사용
+                count = entry['estimated']
+                examples = list(dict.fromkeys(entry['reviews']))
+            keywords.append({
+                'keyword': entry['keyword'],
+                'count': count,
+                'reviews': examples[:5],
+                'estimated': not matched
+            })
+        
+        keywords.sort(key=lambda item: (not item['estimated'], item['count']), reverse=True)
+        return keywords[:top_n]
+    
+    def _extract_keywords(self, target_reviews: List[str], all_reviews: List[str],
+                          sentiment_type: str) -> List[Dict[str, Any]]:
+        """
+        설정된 키워드 추출 방식(keyword_engine)으로 키워드를 추출합니다.
+        
+        Args:
+            target_reviews: 키워드를 추출할 감정별 리뷰 리스트
+            all_reviews: 전체 리뷰 리스트 (로컬 추출의 IDF 계산용)
+            sentiment_type: 'positive' 또는 'negative'
+            
+        Returns:
+            키워드 리스트 (keyword, count, reviews)
+        """
+        if self.keyword_engine == 'llm':
+            return self._extract_keywords_map_reduce(target_reviews, sentiment_type)
+        
+        local_keywords = self.keyword_extractor.extract(target_reviews, all_reviews, top_n=30)
+        if self.keyword_engine == 'local':
+            return local_keywords[:10]
+        
+        return self._extract_keywords_map_reduce(
+            target_reviews, sentiment_type, extra_candidates=local_keywords
+        )
     
     def analyze_sentiment_and_reviews(self, reviews: pd.Series, 
+                                      ratings: Optional[pd.Series] = None,
                                       batch_size: int = 10,
-                                      extract_keywords: bool = True) -> Dict[str, Any]:
+                                      extract_keywords: bool = True,
+                                      deduplicate: bool = True) -> Dict[str, Any]:
         """
         OpenAI API를 사용하여 리뷰의 감정과 후기를 분석합니다.
         
         Args:
             reviews: 리뷰 텍스트 시리즈
-            batch_size: 한 번에 처리할 리뷰 수 (API 호출 제한 고려)
+            ratings: 리뷰와 같은 인덱스를 가진 평점 시리즈 (로컬 분류기에서 사용)
+            batch_size: 진행 상황을 출력할 리뷰 수 간격
             extract_keywords: 키워드 추출 여부
+            deduplicate: 공백/대소문자만 다른 중복 리뷰를 한 번만 분석할지 여부
             
         Returns:
             감정 및 후기 분석 결과 딕셔너리
@@ -283,14 +808,65 @@ class ReviewAnalyzer:
         positive_reviews = []
         negative_reviews = []
         
-        print(f"총 {total}개의 리뷰를 분석합니다...")
+        print(f"총 {total}개의 리뷰를 분석합니다... (동시 요청 {self.max_workers}개)")
+        
+        review_list = reviews.tolist()
+        normalized = [normalize_review_text(review) for review in review_list]
+        unique_count = len(set(normalized))
+        analyses: List[Optional[Dict[str, str]]] = [None] * total
+        
+        # 1단계: 로컬 분류기로 명확한 리뷰를 즉시 분류
+        if self.local_classifier is not None:
+            if ratings is not None:
+                rating_list = ratings.reindex(reviews.index).tolist()
+            else:
+                rating_list = [None] * total
+            for i, (review, rating) in enumerate(zip(review_list, rating_list)):
+                analyses[i] = self.local_classifier.classify(review, rating)
+        
+        escalated = [i for i, analysis in enumerate(analyses) if analysis is None]
+        local_count = total - len(escalated)
+        if self.local_classifier is not None:
+            print(f"로컬 분류: {local_count}개, OpenAI 분석 대상: {len(escalated)}개")
+        
+        # 2단계: 나머지 리뷰를 OpenAI API로 분석
+        if escalated:
+            if deduplicate:
+                # 정규화한 텍스트 기준으로 고유 리뷰만 분석한 뒤 원래 행으로 결과를 펼침
+                unique_index = {}
+                row_to_unique = []
+                unique_reviews = []
+                for i in escalated:
+                    key = normalized[i]
+                    if key not in unique_index:
+                        unique_index[key] = len(unique_reviews)
+                        unique_reviews.append(review_list[i])
+                    row_to_unique.append(unique_index[key])
+                
+                print(f"고유 리뷰 {len(unique_reviews)}개 (중복 제외 {len(escalated) - len(unique_reviews)}개)")
+                unique_analyses = self._analyze_reviews(unique_reviews, progress_every=batch_size)
+                for i, unique_i in zip(escalated, row_to_unique):
+                    analyses[i] = unique_analyses[unique_i]
+            else:
+                escalated_analyses = self._analyze_reviews(
+                    [review_list[i] for i in escalated], progress_every=batch_size
+                )
+                for i, analysis in zip(escalated, escalated_analyses):
+                    analyses[i] = analysis
         
-        for i, review in enumerate(reviews, 1):
-            if i % batch_size == 0:
-                print(f"진행 중: {i}/{total} ({i/total*100:.1f}%)")
-                time.sleep(0.5)  # API 호출 제한 방지
+        failed_count = 0
+        for review, analysis in zip(review_list, analyses):
+            if 'error' in analysis:
+                # 재시도 후에도 분석하지 못한 리뷰는 중립으로 세지 않고 실패로 따로 집계
+                failed_count += 1
+                review_summaries.append({
+                    'review': review,
+                    'sentiment': 'failed',
+                    'summary': '',
+                    'error': analysis['error']
+                })
+                continue
             
-            analysis = self._analyze_review_with_openai(review)
             sentiment = analysis.get('sentiment', 'neutral')
             summary = analysis.get('summary', '')
             
@@ -309,7 +885,9 @@ class ReviewAnalyzer:
                 'summary': summary
             })
         
-        print(f"분석 완료: {total}/{total} (100.0%)")
+        print(f"분석 완료: {total - failed_count}/{total} ({(total - failed_count) / total * 100:.1f}%)")
+        if failed_count:
+            print(f"경고: {failed_count}개 리뷰는 재시도 후에도 분석하지 못해 감정 집계에서 제외했습니다.")
         
         result = {
             'total': total,
@@ -319,28 +897,45 @@ class ReviewAnalyzer:
             'positive_percentage': round(positive_count / total * 100, 2),
             'negative_percentage': round(negative_count / total * 100, 2),
             'neutral_percentage': round(neutral_count / total * 100, 2),
+            'failed': failed_count,
+            'unique_reviews': unique_count,
+            'unique_ratio': round(unique_count / total * 100, 2),
+            'tier_counts': {'local': local_count, 'llm': len(escalated)},
             'review_summaries': review_summaries
         }
         
+        if self.local_classifier is not None:
+            result['local_threshold'] = self.local_classifier.confidence_threshold
+        
+        if self.cache is not None:
+            result['cache_stats'] = self.cache.stats()
+        
+        if self.journal is not None:
+            result['resumed_reviews'] = self.journal.resumed
+        
+        if self.batch_runner is not None:
+            result['batch_api'] = True
+        
         # 키워드 추출
         if extract_keywords:
             print("\n긍정 키워드 추출 중...")
             if positive_reviews:
-                positive_keywords_data = self._extract_keywords_with_openai(positive_reviews, 'positive')
-                result['positive_keywords'] = positive_keywords_data.get('keywords', [])
+                result['positive_keywords'] = self._extract_keywords(positive_reviews, review_list, 'positive')
             else:
                 result['positive_keywords'] = []
             
             print("부정 키워드 추출 중...")
             if negative_reviews:
-                negative_keywords_data = self._extract_keywords_with_openai(negative_reviews, 'negative')
-                result['negative_keywords'] = negative_keywords_data.get('keywords', [])
+                result['negative_keywords'] = self._extract_keywords(negative_reviews, review_list, 'negative')
             else:
                 result['negative_keywords'] = []
         else:
             result['positive_keywords'] = []
             result['negative_keywords'] = []
         
+        # 키워드 추출까지 포함한 OpenAI 호출 사용량
+        result['openai_usage'] = self.usage.summary()
+        
         return result
     
     
@@ -359,7 +954,10 @@ class ReviewAnalyzer:
         """
         results = {
             'basic_stats': self.analyze_basic_stats(df, review_col, rating_col),
-            'sentiment_analysis': self.analyze_sentiment_and_reviews(df[review_col])
+            'sentiment_analysis': self.analyze_sentiment_and_reviews(
+                df[review_col],
+                ratings=df[rating_col] if rating_col in df.columns else None
+            )
         }
         
         return results
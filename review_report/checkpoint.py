@@ -0,0 +1,126 @@
+"""
+분석 진행 상황 체크포인트 모듈
+분석이 끝난 리뷰의 결과를 추가 전용(append-only) JSONL 저널에 기록하여,
+중간에 프로그램이 종료되어도 이어서 분석할 수 있게 합니다.
+저널 파일은 첫 결과를 기록할 때 열리므로, 저널을 만들기만 해서는 기존 체크포인트가 지워지지 않습니다.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+class AnalysisJournal:
+    """리뷰 분석 결과를 JSONL 파일에 추가 기록하는 저널"""
+
+    def __init__(self, path: str, resume: bool = False,
+                 fsync_every: int = 200, fsync_interval: float = 5.0):
+        """
+        Args:
+            path: 저널 파일 경로
+            resume: True면 기존 저널을 읽어 이어서 기록하고, False면 새로 시작
+                (False여도 기존 저널은 첫 결과를 기록할 때 비로소 덮어씀)
+            fsync_every: 이 개수만큼 기록할 때마다 디스크에 동기화
+            fsync_interval: 마지막 동기화 후 이 시간(초)이 지나면 디스크에 동기화
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self.entries: Dict[str, dict] = self._read() if resume else {}
+        self.resumed = 0  # 저널에서 복구하여 다시 분석하지 않은 리뷰 수
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._resume = resume
+        self._file = None
+        self._closed = False
+
+        if not resume and os.path.exists(path) and os.path.getsize(path) > 0:
+            print(f"기존 체크포인트가 있습니다: {path}\n"
+                  f"  이어서 분석하려면 --resume 옵션을 사용하세요. (새 결과를 기록하면 덮어씁니다)")
+
+    def _open(self):
+        """첫 기록 시 저널 파일을 엽니다 (이어서 기록하면 추가, 아니면 새로 작성)."""
+        self._file = open(self.path, 'a' if self._resume else 'w', encoding='utf-8')
+
+        # 비정상 종료로 잘린 줄 뒤에 이어 쓰지 않도록 줄바꿈을 보충
+        if self._resume and self._file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+
+    def _read(self) -> Dict[str, dict]:
+        """
+        기존 저널을 읽습니다. 비정상 종료로 마지막 줄이 잘린 경우 그 줄은 무시합니다.
+
+        Returns:
+            {키: 분석 결과} 딕셔너리
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    entries[record['key']] = record['result']
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        return entries
+
+    def get(self, key: str) -> Optional[dict]:
+        """저널에 기록된 분석 결과를 반환합니다 (없으면 None)."""
+        result = self.entries.get(key)
+        if result is not None:
+            self.resumed += 1
+        return result
+
+    def append(self, key: str, result: dict):
+        """
+        분석 결과 하나를 저널에 기록합니다.
+        디스크 동기화(fsync)는 일정 개수 또는 일정 시간마다 묶어서 수행합니다.
+
+        Args:
+            key: 리뷰 캐시 키
+            result: 분석 결과 딕셔너리
+        """
+        if key in self.entries or self._closed:
+            return
+        if self._file is None:
+            self._open()
+        self.entries[key] = result
+        self._file.write(json.dumps({'key': key, 'result': result}, ensure_ascii=False) + '\n')
+        self._pending += 1
+
+        if (self._pending >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        """버퍼에 남은 기록을 디스크에 동기화합니다."""
+        if self._file is None or self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self, remove: bool = False):
+        """
+        저널을 닫습니다.
+
+        Args:
+            remove: True면 저널 파일을 삭제 (분석이 정상적으로 끝난 경우)
+        """
+        self._closed = True
+        if self._file is not None and not self._file.closed:
+            self.sync()
+            self._file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,369 @@
+"""
+데이터 로드 모듈
+엑셀, CSV, Parquet, Feather 파일을 읽고, 파싱한 엑셀을 컬럼형(Parquet) 캐시로 보관합니다.
+대용량 파일은 일정한 행 단위로 나누어 읽고 병합 가능한 누적기로 기본 통계를 한 번의 순회로 계산합니다.
+"""
+
+import os
+import glob
+import hashlib
+import math
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+import pandas as pd
+
+from stats_engine import GroupStatsEngine
+
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+SUPPORTED_EXTENSIONS = EXCEL_EXTENSIONS + ('.csv', '.parquet', '.feather')
+
+
+def _columnar_cache_paths(file_path: str, cache_dir: str) -> Tuple[str, str]:
+    """
+    엑셀 파일에 대응하는 컬럼형 캐시 파일 경로를 만듭니다.
+    파일 경로 해시를 접두어로, (크기, 수정 시각) 해시를 접미어로 사용하므로
+    원본 파일이 바뀌면 새 캐시 파일 이름이 만들어집니다.
+
+    Returns:
+        (캐시 파일 경로, 같은 원본 파일의 캐시를 찾는 glob 패턴)
+    """
+    abs_path = os.path.abspath(file_path)
+    stat = os.stat(abs_path)
+    path_hash = hashlib.sha1(abs_path.encode('utf-8')).hexdigest()[:12]
+    version_hash = hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8')).hexdigest()[:12]
+    cache_file = os.path.join(cache_dir, f"{path_hash}_{version_hash}.parquet")
+    return cache_file, os.path.join(cache_dir, f"{path_hash}_*.parquet")
+
+
+def load_dataframe(file_path: str, cache_dir: Optional[str] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    파일 형식에 맞게 데이터프레임을 로드합니다.
+    엑셀 파일은 cache_dir이 주어지면 파싱 결과를 Parquet 캐시로 저장해 두고,
+    파일 크기와 수정 시각이 같으면 다음 실행부터 캐시를 읽습니다.
+
+    Args:
+        file_path: 읽을 파일 경로 (.xlsx, .xlsm, .xls, .csv, .parquet, .feather)
+        cache_dir: 컬럼형 캐시를 저장할 디렉토리 (None이면 캐시 사용 안 함)
+
+    Returns:
+        (데이터프레임, 로드 정보 딕셔너리 {'source': 읽은 위치, 'load_seconds': 소요 시간})
+
+    Raises:
+        ValueError: 지원하지 않는 파일 형식인 경우
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    started = time.perf_counter()
+
+    if ext == '.parquet':
+        df, source = pd.read_parquet(file_path), 'parquet'
+    elif ext == '.feather':
+        df, source = pd.read_feather(file_path), 'feather'
+    elif ext == '.csv':
+        df, source = pd.read_csv(file_path, encoding='utf-8-sig'), 'csv'
+    elif ext in EXCEL_EXTENSIONS:
+        df, source = _load_excel_with_cache(file_path, cache_dir)
+    else:
+        raise ValueError(
+            f"지원하지 않는 파일 형식입니다: {ext} "
+            f"(지원 형식: {', '.join(SUPPORTED_EXTENSIONS)})"
+        )
+
+    return df, {
+        'source': source,
+        'load_seconds': round(time.perf_counter() - started, 3)
+    }
+
+
+def _load_excel_with_cache(file_path: str, cache_dir: Optional[str]) -> Tuple[pd.DataFrame, str]:
+    """엑셀 파일을 읽되, 유효한 컬럼형 캐시가 있으면 캐시를 읽습니다."""
+    if cache_dir is None:
+        return pd.read_excel(file_path), 'excel'
+
+    cache_file, pattern = _columnar_cache_paths(file_path, cache_dir)
+    if os.path.exists(cache_file):
+        try:
+            return pd.read_parquet(cache_file), 'columnar cache'
+        except Exception as e:
+            print(f"컬럼형 캐시를 읽지 못해 엑셀을 다시 읽습니다: {e}")
+
+    df = pd.read_excel(file_path)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 같은 원본 파일의 이전 버전 캐시 삭제
+        for stale in glob.glob(pattern):
+            os.remove(stale)
+        df.to_parquet(cache_file, index=False)
+    except ImportError:
+        print("pyarrow가 설치되어 있지 않아 컬럼형 캐시를 만들지 않습니다: pip install pyarrow")
+    except Exception as e:
+        # 혼합 타입 컬럼 등 Parquet으로 저장할 수 없는 경우 캐시 없이 진행
+        print(f"컬럼형 캐시 저장 실패 (분석에는 영향 없음): {e}")
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
+
+    return df, 'excel'
+
+
+def iter_dataframe_chunks(file_path: str, chunksize: int = 50000,
+                          columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    파일을 행 단위 청크로 나누어 데이터프레임으로 반환합니다.
+
+    Args:
+        file_path: 읽을 파일 경로 (.xlsx, .xlsm, .csv, .parquet, .feather)
+        chunksize: 청크 하나에 담을 최대 행 수
+        columns: 읽을 컬럼 목록 (None이면 전체 컬럼)
+
+    Yields:
+        청크 데이터프레임
+
+    Raises:
+        ValueError: 지원하지 않는 파일 형식인 경우
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext in ('.xlsx', '.xlsm'):
+        yield from _iter_excel_chunks(file_path, chunksize, columns)
+    elif ext == '.csv':
+        for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=columns,
+                                 encoding='utf-8-sig'):
+            yield chunk
+    elif ext == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet 파일을 읽으려면 pyarrow 패키지가 필요합니다: pip install pyarrow")
+        parquet_file = pq.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    elif ext == '.feather':
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ValueError("Feather 파일을 읽으려면 pyarrow 패키지가 필요합니다: pip install pyarrow")
+        # 메모리 맵으로 열어 레코드 배치 단위로 읽음
+        with pa.memory_map(file_path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                table = pa.Table.from_batches([reader.get_batch(i)])
+                if columns is not None:
+                    table = table.select([col for col in columns if col in table.column_names])
+                for start in range(0, table.num_rows, chunksize):
+                    yield table.slice(start, chunksize).to_pandas()
+    else:
+        raise ValueError(
+            f"스트리밍 모드에서 지원하지 않는 파일 형식입니다: {ext} "
+            f"(지원 형식: .xlsx, .xlsm, .csv, .parquet, .feather)"
+        )
+
+
+def _iter_excel_chunks(file_path: str, chunksize: int,
+                       columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """openpyxl 읽기 전용 모드로 첫 번째 시트를 청크 단위로 읽습니다."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(name) if name is not None else f"Unnamed: {i}"
+                  for i, name in enumerate(header)]
+
+        if columns is not None:
+            indices = [header.index(col) for col in columns if col in header]
+        else:
+            indices = list(range(len(header)))
+        selected = [header[i] for i in indices]
+
+        buffer = []
+        for row in rows:
+            if row is None or all(value is None for value in row):
+                continue
+            buffer.append([row[i] if i < len(row) else None for i in indices])
+            if len(buffer) >= chunksize:
+                yield pd.DataFrame(buffer, columns=selected)
+                buffer = []
+
+        if buffer:
+            yield pd.DataFrame(buffer, columns=selected)
+    finally:
+        wb.close()
+
+
+class RunningMoments:
+    """평균과 표준편차를 한 번의 순회로 계산하는 병합 가능한 누적기"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # 평균과의 편차 제곱합
+
+    def update(self, values: pd.Series):
+        """값 묶음을 누적합니다."""
+        values = pd.to_numeric(values, errors='coerce').dropna()
+        if len(values) == 0:
+            return
+        other = RunningMoments()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        self.merge(other)
+
+    def merge(self, other: 'RunningMoments'):
+        """다른 누적기의 결과를 합칩니다 (Chan의 병렬 분산 알고리즘)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        """표본 표준편차 (pandas의 std와 동일하게 ddof=1)"""
+        if self.count < 2:
+            return float('nan')
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class StreamingStats:
+    """청크 단위로 누적하여 analyze_basic_stats와 같은 형식의 기본 통계를 만드는 클래스"""
+
+    def __init__(self, rating_col: str = '평점', date_col: str = '구매일자',
+                 dimensions: Optional[List[str]] = None,
+                 cross_tabs: Optional[List[Tuple[str, ...]]] = None):
+        """
+        Args:
+            rating_col: 평점 컬럼명
+            date_col: 구매일자 컬럼명
+            dimensions: 그룹별 통계를 낼 컬럼 리스트 (None이면 노트북모델/연령대/성별)
+            cross_tabs: 교차 통계를 낼 컬럼 조합 리스트 (None이면 노트북모델 × 연령대)
+        """
+        self.rating_col = rating_col
+        self.date_col = date_col
+        self.engine = GroupStatsEngine(rating_col, dimensions, cross_tabs)
+        self.total = 0
+        self.has_rating = False
+        self.rating_moments = RunningMoments()
+        self.rating_counts: Counter = Counter()
+        # {그룹 컬럼 튜플: {그룹 값 튜플: [리뷰 수, 평점 개수, 평점 합계]}}
+        self.groups: Dict[Tuple[str, ...], Dict[Tuple, List[float]]] = {}
+        self.date_min = None
+        self.date_max = None
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        청크 하나의 통계를 누적합니다. 청크 데이터프레임은 수정하지 않습니다.
+
+        Args:
+            chunk: 데이터 청크
+        """
+        self.total += len(chunk)
+
+        ratings = None
+        if self.rating_col in chunk.columns:
+            self.has_rating = True
+            ratings = pd.to_numeric(chunk[self.rating_col], errors='coerce')
+            self.rating_moments.update(ratings)
+            self.rating_counts.update(ratings.value_counts().to_dict())
+
+        self.engine.merge_groups(self.groups, self.engine.aggregate(chunk, ratings))
+
+        if self.date_col in chunk.columns:
+            dates = pd.to_datetime(chunk[self.date_col], errors='coerce').dropna()
+            if len(dates) > 0:
+                chunk_min, chunk_max = dates.min(), dates.max()
+                self.date_min = chunk_min if self.date_min is None else min(self.date_min, chunk_min)
+                self.date_max = chunk_max if self.date_max is None else max(self.date_max, chunk_max)
+
+    def merge(self, other: 'StreamingStats'):
+        """
+        다른 누적기의 결과를 합칩니다 (병렬로 나누어 읽은 경우).
+
+        Args:
+            other: 합칠 StreamingStats
+        """
+        self.total += other.total
+        self.has_rating = self.has_rating or other.has_rating
+        self.rating_moments.merge(other.rating_moments)
+        self.rating_counts.update(other.rating_counts)
+        self.engine.merge_groups(self.groups, other.groups)
+        for value in (other.date_min, other.date_max):
+            if value is None:
+                continue
+            self.date_min = value if self.date_min is None else min(self.date_min, value)
+            self.date_max = value if self.date_max is None else max(self.date_max, value)
+
+    def _median(self) -> float:
+        """평점 분포에서 중앙값을 계산합니다."""
+        n = sum(self.rating_counts.values())
+        lower_rank, upper_rank = (n - 1) // 2, n // 2
+        lower = upper = None
+        seen = 0
+        for value in sorted(self.rating_counts):
+            seen += self.rating_counts[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                upper = value
+                break
+        return (lower + upper) / 2
+
+    def to_results(self, review_col: str) -> Dict[str, Any]:
+        """
+        누적된 통계를 analyze_basic_stats와 같은 형식의 딕셔너리로 변환합니다.
+
+        Args:
+            review_col: 리뷰 컬럼명
+
+        Returns:
+            기본 통계 결과 딕셔너리
+        """
+        results = {
+            'total_reviews': self.total,
+            'review_column': review_col,
+            'rating_column': self.rating_col
+        }
+
+        if self.has_rating and self.rating_moments.count > 0:
+            results['rating_stats'] = {
+                'mean': self.rating_moments.mean,
+                'median': float(self._median()),
+                'std': self.rating_moments.std,
+                'min': int(min(self.rating_counts)),
+                'max': int(max(self.rating_counts))
+            }
+            rated = self.rating_moments.count
+            results['rating_distribution'] = {
+                int(k): int(v) for k, v in sorted(self.rating_counts.items())
+            }
+            results['rating_percentage'] = {
+                int(k): round(v / rated * 100, 2) for k, v in sorted(self.rating_counts.items())
+            }
+        else:
+            results['rating_stats'] = None
+            results['rating_distribution'] = None
+            results['rating_percentage'] = None
+
+        results.update(self.engine.format_groups(self.groups, self.has_rating))
+
+        if self.date_min is not None:
+            results['date_range'] = {
+                'start': self.date_min.strftime('%Y-%m-%d'),
+                'end': self.date_max.strftime('%Y-%m-%d'),
+                'total_days': (self.date_max - self.date_min).days
+            }
+
+        return results
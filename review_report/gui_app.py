@@ -70,7 +70,16 @@ class ReviewReportGUI:
             command=self.start_analysis,
             state='disabled'
         )
-        self.analyze_btn.grid(row=3, column=0, columnspan=3, pady=20)
+        self.analyze_btn.grid(row=3, column=0, columnspan=2, pady=20)
+        
+        # 중단된 분석 이어서 하기
+        self.resume_var = tk.BooleanVar(value=True)
+        resume_check = ttk.Checkbutton(
+            main_frame,
+            text="중단된 분석 이어서 하기",
+            variable=self.resume_var
+        )
+        resume_check.grid(row=3, column=2, padx=5)
         
         # 진행 상황 표시
         ttk.Label(main_frame, text="진행 상황:").grid(row=4, column=0, sticky=tk.W, pady=5)
@@ -117,7 +126,12 @@ class ReviewReportGUI:
         """Excel 파일 선택 대화상자"""
         file_path = filedialog.askopenfilename(
             title="Excel 파일 선택",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+            filetypes=[
+                ("Excel files", "*.xlsx *.xls"),
+                ("Columnar files", "*.parquet *.feather"),
+                ("CSV files", "*.csv"),
+                ("All files", "*.*")
+            ]
         )
         
         if file_path:
@@ -177,7 +191,8 @@ class ReviewReportGUI:
             self.log_message(f"\n엑셀 파일 로드 중: {os.path.basename(self.excel_file_path)}")
             generator = ReviewReportGenerator(
                 excel_file=self.excel_file_path,
-                output_dir=output_dir
+                output_dir=output_dir,
+                resume=self.resume_var.get()
             )
             
             # 리뷰 컬럼 감지
@@ -222,12 +237,16 @@ class ReviewReportGUI:
         self.log_message(f"  - HTML: {html_path}")
         self.log_message(f"\n분석 요약:")
         self.log_message(f"  - 총 리뷰 수: {summary['total_reviews']}")
+        if 'load_seconds' in summary:
+            self.log_message(f"  - 데이터 로드: {summary['load_seconds']:.2f}초 ({summary['load_source']})")
         if 'average_rating' in summary:
             self.log_message(f"  - 평균 평점: {summary['average_rating']:.2f}")
         if 'sentiment' in summary:
             self.log_message(f"  - 긍정: {summary['sentiment']['positive']}개")
             self.log_message(f"  - 부정: {summary['sentiment']['negative']}개")
             self.log_message(f"  - 중립: {summary['sentiment']['neutral']}개")
+            if summary['sentiment']['failed']:
+                self.log_message(f"  - 분석 실패: {summary['sentiment']['failed']}개 (재시도 후에도 실패)")
         
         self.result_var.set(f"보고서 생성 완료: {os.path.basename(report_path)}")
         self.open_report_btn.config(state='normal')
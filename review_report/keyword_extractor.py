@@ -0,0 +1,156 @@
+"""
+로컬 키워드 추출 모듈
+API 호출 없이 감정별 리뷰에서 단어/두 단어 조합(n-gram)을 세어 TF-IDF 방식으로 주요 키워드를 고릅니다.
+kiwipiepy가 설치되어 있으면 한국어 형태소 분석으로 명사/형용사/동사 어간을 추출합니다.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Any
+
+
+# 어절 끝에서 떼어낼 조사/어미 (긴 것부터 검사)
+KOREAN_SUFFIXES = sorted([
+    '입니다', '습니다', '합니다', '했어요', '해요', '에서는', '으로는', '이에요', '예요',
+    '네요', '어요', '아요', '에서', '으로', '까지', '부터', '보다', '처럼', '이랑',
+    '하고', '은', '는', '이', '가', '을', '를', '에', '도', '의', '로', '와', '과', '요', '만'
+], key=len, reverse=True)
+
+STOPWORDS = {
+    '그리고', '그냥', '정말', '진짜', '너무', '아주', '조금', '약간', '많이', '좀', '잘',
+    '것', '수', '때', '더', '또', '및', '제', '저', '이', '그', '저는', '제가', '다',
+    '있어요', '있습니다', '없어요', '같아요', '합니다', '해요', '하는', '하고', '있는',
+    '노트북', '제품', '구매', '사용'
+}
+
+
+class LocalKeywordExtractor:
+    """감정별 리뷰에서 키워드를 로컬로 추출하는 클래스"""
+
+    def __init__(self, ngram_range: tuple = (1, 2), min_count: int = 2,
+                 use_morphology: bool = True, stopwords: Optional[set] = None):
+        """
+        Args:
+            ngram_range: 추출할 n-gram 길이 범위 (최소, 최대)
+            min_count: 키워드로 인정할 최소 등장 리뷰 수
+            use_morphology: kiwipiepy가 설치된 경우 형태소 분석 사용 여부
+            stopwords: 불용어 집합 (None이면 기본값)
+        """
+        self.ngram_range = ngram_range
+        self.min_count = min_count
+        self.stopwords = stopwords if stopwords is not None else STOPWORDS
+        self._kiwi = None
+
+        if use_morphology:
+            try:
+                from kiwipiepy import Kiwi
+                self._kiwi = Kiwi()
+            except ImportError:
+                pass
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        리뷰를 토큰 리스트로 변환합니다.
+
+        Args:
+            text: 리뷰 텍스트
+
+        Returns:
+            토큰 리스트
+        """
+        if self._kiwi is not None:
+            tokens = [
+                token.form for token in self._kiwi.tokenize(text)
+                if token.tag in ('NNG', 'NNP', 'VA', 'VV', 'XR', 'SL')
+            ]
+        else:
+            tokens = []
+            for word in re.findall(r'[가-힣A-Za-z0-9]+', text.lower()):
+                for suffix in KOREAN_SUFFIXES:
+                    if len(word) > len(suffix) + 1 and word.endswith(suffix):
+                        word = word[:-len(suffix)]
+                        break
+                tokens.append(word)
+
+        return [token for token in tokens if len(token) > 1 and token not in self.stopwords]
+
+    def _terms(self, text: str) -> set:
+        """리뷰 하나에 등장하는 n-gram 집합을 만듭니다."""
+        tokens = self.tokenize(text)
+        terms = set()
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(tokens) - n + 1):
+                terms.add(' '.join(tokens[i:i + n]))
+        return terms
+
+    def extract(self, target_reviews: List[str], all_reviews: Optional[List[str]] = None,
+                top_n: int = 10, examples_per_keyword: int = 5) -> List[Dict[str, Any]]:
+        """
+        대상 리뷰(예: 부정 리뷰)에서 특징적인 키워드를 추출합니다.
+        점수는 대상 리뷰 안의 문서 빈도 × 전체 리뷰 기준 역문서 빈도(IDF)입니다.
+
+        Args:
+            target_reviews: 키워드를 추출할 리뷰 리스트
+            all_reviews: IDF 계산에 사용할 전체 리뷰 리스트 (None이면 대상 리뷰 사용)
+            top_n: 반환할 키워드 수
+            examples_per_keyword: 키워드별 대표 리뷰 수
+
+        Returns:
+            점수 순으로 정렬된 키워드 리스트 (keyword, count, reviews)
+        """
+        if not target_reviews:
+            return []
+
+        # 같은 리뷰 텍스트는 한 번만 토큰화
+        term_cache: Dict[str, set] = {}
+
+        def terms_of(review: str) -> set:
+            terms = term_cache.get(review)
+            if terms is None:
+                terms = term_cache[review] = self._terms(review)
+            return terms
+
+        target_terms = [terms_of(review) for review in target_reviews]
+        target_df = Counter(term for terms in target_terms for term in terms)
+
+        if all_reviews is None or all_reviews is target_reviews:
+            corpus_df, corpus_size = target_df, len(target_reviews)
+        else:
+            corpus_df = Counter(term for review in all_reviews for term in terms_of(review))
+            corpus_size = len(all_reviews)
+
+        scored = []
+        for term, count in target_df.items():
+            if count < self.min_count:
+                continue
+            idf = math.log((1 + corpus_size) / (1 + corpus_df.get(term, count))) + 1
+            # 두 단어 조합은 구체적인 표현이므로 가중치를 조금 더 줌
+            weight = 1.2 if ' ' in term else 1.0
+            scored.append((count * idf * weight, term, count))
+
+        scored.sort(reverse=True)
+
+        # 상위 단어 조합에 포함된 단일 단어는 중복 표시하지 않음
+        keywords = []
+        chosen_terms = []
+        for _, term, count in scored:
+            words = set(term.split(' '))
+            if any(words <= set(chosen.split(' ')) or set(chosen.split(' ')) <= words
+                   for chosen in chosen_terms):
+                continue
+            chosen_terms.append(term)
+
+            examples = []
+            for review, terms in zip(target_reviews, target_terms):
+                if term in terms and review not in examples:
+                    examples.append(review)
+                    if len(examples) >= examples_per_keyword:
+                        break
+
+            keywords.append({'keyword': term, 'count': count, 'reviews': examples})
+            if len(keywords) >= top_n:
+                break
+
+        return keywords
@@ -0,0 +1,173 @@
+"""
+로컬 감정 분류 모듈
+평점과 한국어 긍정/부정 키워드를 이용해 명확한 리뷰를 API 호출 없이 즉시 분류합니다.
+감정 키워드가 하나도 없는 리뷰(평점만 있는 경우 포함)나 확신도가 낮은 리뷰는 분류하지 않고 OpenAI API 분석으로 넘깁니다.
+"""
+
+import re
+from typing import Dict, List, Optional, Any
+
+
+class LexiconClassifier:
+    """
+    평점과 감정 키워드 사전을 결합한 로컬 감정 분류기
+
+    ReviewAnalyzer는 classify(review, rating) 메서드만 사용하므로,
+    같은 형태의 메서드를 가진 다른 분류기(예: 오프라인 모델)로 교체할 수 있습니다.
+    """
+
+    # 부정 표현이 먼저 매칭되도록 부정어가 포함된 표현은 NEGATIVE_KEYWORDS에 둡니다
+    POSITIVE_KEYWORDS = [
+        '좋아요', '좋습니다', '좋네요', '좋음', '좋은', '좋고', '좋다', '만족', '최고',
+        '추천', '훌륭', '괜찮', '깔끔', '감사', '편리', '가성비', '튼튼', '조용',
+        '빠르', '빠름', '빨라', '예쁘', '이뻐', '마음에 들', '맘에 들', '굿', '대박'
+    ]
+
+    NEGATIVE_KEYWORDS = [
+        '안 좋', '안좋', '좋지 않', '좋지않', '별로', '불만', '최악', '느리', '느려',
+        '고장', '불량', '환불', '반품', '실망', '아쉽', '아쉬', '문제', '소음', '발열',
+        '비싸', '안 되', '안되', '안 돼', '안돼', '교환', '늦', '후회', '짜증', '불편',
+        '망가', '깨져', '깨짐', '비추'
+    ]
+
+    # 긍정과 부정이 섞여 있을 가능성이 높은 전환 표현
+    CONTRAST_MARKERS = ['지만', '는데', '그런데', '하지만', '그러나', '반면']
+
+    def __init__(self, confidence_threshold: float = 0.6,
+                 positive_rating: float = 4, negative_rating: float = 2,
+                 max_rating: float = 5, rating_weight: float = 0.6,
+                 positive_keywords: Optional[List[str]] = None,
+                 negative_keywords: Optional[List[str]] = None):
+        """
+        Args:
+            confidence_threshold: 이 값 이상의 확신도일 때만 로컬에서 분류를 확정
+            positive_rating: 이 평점 이상이면 긍정 신호로 간주
+            negative_rating: 이 평점 이하이면 부정 신호로 간주
+            max_rating: 평점 척도의 최댓값
+            rating_weight: 평점이 있을 때 평점 신호에 주는 가중치 (0~1)
+            positive_keywords: 사용자 정의 긍정 키워드 목록 (None이면 기본값)
+            negative_keywords: 사용자 정의 부정 키워드 목록 (None이면 기본값)
+        """
+        self.confidence_threshold = confidence_threshold
+        self.positive_rating = positive_rating
+        self.negative_rating = negative_rating
+        self.max_rating = max_rating
+        self.rating_weight = rating_weight
+
+        positive_keywords = positive_keywords or self.POSITIVE_KEYWORDS
+        negative_keywords = negative_keywords or self.NEGATIVE_KEYWORDS
+        self._positive_pattern = self._compile(positive_keywords)
+        self._negative_pattern = self._compile(negative_keywords)
+
+    @staticmethod
+    def _compile(keywords: List[str]) -> re.Pattern:
+        """긴 키워드가 먼저 매칭되도록 정렬하여 하나의 정규식으로 만듭니다."""
+        ordered = sorted(keywords, key=len, reverse=True)
+        return re.compile('|'.join(re.escape(keyword) for keyword in ordered))
+
+    def _rating_score(self, rating: Optional[float]) -> Optional[float]:
+        """
+        평점을 -1(부정) ~ 1(긍정) 범위의 점수로 변환합니다.
+
+        Returns:
+            평점 점수 (평점이 없으면 None)
+        """
+        if rating is None:
+            return None
+        try:
+            rating = float(rating)
+        except (TypeError, ValueError):
+            return None
+        if rating != rating:  # NaN
+            return None
+
+        if rating >= self.positive_rating:
+            span = max(self.max_rating - self.positive_rating, 1)
+            return min(1.0, 0.5 + 0.5 * (rating - self.positive_rating) / span)
+        if rating <= self.negative_rating:
+            span = max(self.negative_rating - 1, 1)
+            return -min(1.0, 0.5 + 0.5 * (self.negative_rating - rating) / span)
+        return 0.0
+
+    def score(self, review: str, rating: Optional[float] = None) -> Dict[str, Any]:
+        """
+        리뷰의 감정 점수와 확신도를 계산합니다.
+
+        Args:
+            review: 리뷰 텍스트
+            rating: 리뷰 평점 (없으면 None)
+
+        Returns:
+            sentiment, confidence, positive_hits, negative_hits를 담은 딕셔너리
+        """
+        text = str(review)
+
+        # 부정 표현을 먼저 찾아 지운 뒤 긍정 표현을 찾음 ("안 좋아요"가 긍정으로 잡히지 않도록)
+        negative_hits = len(self._negative_pattern.findall(text))
+        remaining = self._negative_pattern.sub(' ', text)
+        positive_hits = len(self._positive_pattern.findall(remaining))
+
+        hits = positive_hits + negative_hits
+        if hits:
+            lexicon_score = (positive_hits - negative_hits) / hits
+            lexicon_strength = min(1.0, hits / 2)
+        else:
+            lexicon_score = 0.0
+            lexicon_strength = 0.0
+        lexicon_signal = lexicon_score * lexicon_strength
+
+        rating_score = self._rating_score(rating)
+        if rating_score is None:
+            combined = lexicon_signal
+        else:
+            combined = (self.rating_weight * rating_score
+                        + (1 - self.rating_weight) * lexicon_signal)
+
+        confidence = abs(combined)
+
+        # 리뷰 본문에 감정 키워드 근거가 없으면 평점만으로 판단하지 않음
+        if not lexicon_signal:
+            confidence = 0.0
+
+        # 평점과 키워드가 서로 반대 방향이면 판단하지 않음
+        if rating_score and lexicon_signal and (rating_score > 0) != (lexicon_signal > 0):
+            confidence = 0.0
+
+        # 전환 표현이 있으면 긍정/부정이 섞였을 수 있으므로 확신도를 낮춤
+        if any(marker in text for marker in self.CONTRAST_MARKERS):
+            confidence *= 0.6
+
+        sentiment = 'positive' if combined > 0 else 'negative' if combined < 0 else 'neutral'
+
+        return {
+            'sentiment': sentiment,
+            'confidence': round(confidence, 3),
+            'positive_hits': positive_hits,
+            'negative_hits': negative_hits
+        }
+
+    def classify(self, review: str, rating: Optional[float] = None) -> Optional[Dict[str, str]]:
+        """
+        확신도가 임계값 이상인 경우에만 리뷰를 분류합니다.
+
+        Args:
+            review: 리뷰 텍스트
+            rating: 리뷰 평점 (없으면 None)
+
+        Returns:
+            분석 결과 딕셔너리 (sentiment, summary에는 요약 대신 분류 근거),
+            감정 키워드가 없거나 확신도가 낮으면 None
+        """
+        scored = self.score(review, rating)
+        if scored['sentiment'] == 'neutral' or scored['confidence'] < self.confidence_threshold:
+            return None
+
+        # 로컬 분류는 리뷰를 요약하지 않으므로 요약 대신 분류 근거를 남김
+        basis = [f"긍정 표현 {scored['positive_hits']}개", f"부정 표현 {scored['negative_hits']}개"]
+        if self._rating_score(rating) is not None:
+            basis.insert(0, f"평점 {float(rating):g}점")
+
+        return {
+            'sentiment': scored['sentiment'],
+            'summary': f"(로컬 분류: {', '.join(basis)})"
+        }
@@ -0,0 +1,108 @@
+"""
+API 호출 속도 제한 모듈
+분당 요청 수(RPM)와 분당 토큰 수(TPM) 예산을 토큰 버킷 방식으로 관리합니다.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """일정한 속도로 다시 채워지는 토큰 버킷"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Args:
+            capacity: 버킷에 담을 수 있는 최대 토큰 수
+            refill_per_second: 초당 다시 채워지는 토큰 수
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        """경과 시간만큼 토큰을 채웁니다."""
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        지정한 양의 토큰을 쓰기 위해 기다려야 하는 시간을 계산합니다.
+
+        Args:
+            amount: 필요한 토큰 수 (버킷 용량을 넘으면 용량으로 제한)
+
+        Returns:
+            대기 시간(초), 바로 사용 가능하면 0
+        """
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        """토큰을 차감합니다. 음수를 전달하면 토큰을 돌려받습니다."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - min(amount, self.capacity))
+
+
+class RateLimiter:
+    """RPM/TPM 예산을 함께 지키는 스레드 안전한 속도 제한기"""
+
+    def __init__(self, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None):
+        """
+        Args:
+            requests_per_minute: 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute: 분당 최대 토큰 수 (None이면 제한 없음)
+        """
+        self.request_bucket = (
+            TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+            if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+            if tokens_per_minute else None
+        )
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0):
+        """
+        요청 1건과 예상 토큰 수만큼의 예산을 확보할 때까지 대기합니다.
+
+        Args:
+            tokens: 이번 요청에서 사용할 것으로 예상되는 토큰 수
+        """
+        while True:
+            with self._lock:
+                wait = 0.0
+                if self.request_bucket:
+                    wait = max(wait, self.request_bucket.wait_time(1))
+                if self.token_bucket:
+                    wait = max(wait, self.token_bucket.wait_time(tokens))
+
+                if wait == 0.0:
+                    if self.request_bucket:
+                        self.request_bucket.consume(1)
+                    if self.token_bucket:
+                        self.token_bucket.consume(tokens)
+                    return
+            time.sleep(wait)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """
+        응답에서 확인된 실제 토큰 사용량으로 예산을 보정합니다.
+
+        Args:
+            estimated_tokens: acquire()에 전달했던 예상 토큰 수
+            actual_tokens: 응답의 usage에 기록된 실제 토큰 수
+        """
+        if not self.token_bucket:
+            return
+        with self._lock:
+            self.token_bucket.consume(actual_tokens - estimated_tokens)
@@ -3,8 +3,9 @@
 Markdown 및 HTML 형식의 보고서를 생성합니다.
 """
 
+import html
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 
 
@@ -20,6 +21,175 @@ class ReportGenerator:
         os.makedirs(output_dir, exist_ok=True)
         self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
+    def _processing_lines(self, sentiment_analysis: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """
+        감정 분석 처리 정보(분류 단계, 중복 제거, 캐시 등)를 보고서에 표시할 항목 목록으로 변환합니다.
+        
+        Args:
+            sentiment_analysis: 감정 분석 결과 딕셔너리
+            
+        Returns:
+            (항목명, 값) 튜플 리스트
+        """
+        lines = []
+        
+        if sentiment_analysis.get('failed'):
+            lines.append((
+                '분석 실패',
+                f"{sentiment_analysis['failed']}개 (재시도 후에도 OpenAI API 호출이 실패하여 감정 집계에서 제외)"
+            ))
+        
+        tier_counts = sentiment_analysis.get('tier_counts')
+        if tier_counts and 'local_threshold' in sentiment_analysis:
+            lines.append((
+                '분류 단계',
+                f"로컬 분류 {tier_counts['local']}개, OpenAI 분석 {tier_counts['llm']}개 "
+                f"(로컬 확신도 임계값 {sentiment_analysis['local_threshold']})"
+            ))
+        
+        if 'unique_reviews' in sentiment_analysis:
+            lines.append((
+                '고유 리뷰',
+                f"{sentiment_analysis['unique_reviews']}/{sentiment_analysis['total']} "
+                f"({sentiment_analysis['unique_ratio']:.1f}%, 중복 리뷰는 한 번만 분석)"
+            ))
+        
+        if sentiment_analysis.get('resumed_reviews'):
+            lines.append(('체크포인트 복구', f"{sentiment_analysis['resumed_reviews']}개 리뷰"))
+        
+        cache_stats = sentiment_analysis.get('cache_stats')
+        if cache_stats:
+            lookups = cache_stats['hits'] + cache_stats['misses']
+            hit_rate = cache_stats['hits'] / lookups * 100 if lookups else 0
+            lines.append((
+                '캐시 적중',
+                f"{cache_stats['hits']}/{lookups} ({hit_rate:.1f}%), 캐시 항목 수: {cache_stats['entries']}"
+            ))
+        
+        usage = (sentiment_analysis.get('openai_usage') or {}).get('total')
+        if usage and usage['calls']:
+            cost = f", 비용 약 ${usage['cost_usd']:.4f}" if usage['cost_usd'] is not None else ""
+            client = sentiment_analysis['openai_usage'].get('client') or {}
+            retries = f", 재시도 {client['retries']}회" if client.get('retries') else ""
+            if usage.get('batch_calls'):
+                retries += (f", Batch API {usage['batch_calls']}건 "
+                            f"(배치 가격 적용, 대기 {usage.get('batch_wall_time', 0):.1f}초)")
+            lines.append((
+                'OpenAI 사용량',
+                f"호출 {usage['calls']}회, 입력 {usage['prompt_tokens']:,}토큰, "
+                f"출력 {usage['completion_tokens']:,}토큰{cost}, 평균 응답 {usage['avg_latency']:.2f}초{retries}"
+            ))
+        
+        return lines
+    
+    @staticmethod
+    def _format_keyword_count(kw_data: Dict[str, Any]) -> str:
+        """
+        키워드 언급 횟수를 표시용 문자열로 변환합니다.
+        리뷰에서 직접 세지 못한 LLM 추정치는 '약 N (추정)'으로 표시합니다.
+        """
+        count = kw_data.get('count', 0)
+        return f"약 {count} (추정)" if kw_data.get('estimated') else str(count)
+    
+    def _cross_tab_markdown(self, name: str, table: Dict[Any, Dict[Any, Dict[str, Any]]]) -> str:
+        """
+        교차 통계를 행 × 열 형태의 Markdown 표로 변환합니다.
+        각 칸에는 평균 평점(리뷰 수)을 표시합니다.
+        
+        Args:
+            name: 교차 통계 이름 (예: '노트북모델 × 연령대')
+            table: {행 값: {열 값: {'평균평점', '리뷰수'}}}
+            
+        Returns:
+            Markdown 문자열
+        """
+        columns = self._cross_tab_columns(table)
+        
+        md = f"""
+---
+
+## {name} 교차 통계
+
+평균 평점(리뷰 수)입니다.
+
+| {name.split(' × ')[0]} | {' | '.join(str(column) for column in columns)} |
+|{'---|' * (len(columns) + 1)}
+"""
+        for row_key, row in table.items():
+            cells = []
+            for column in columns:
+                stats = row.get(column)
+                cells.append(self._format_rating_cell(stats) if stats else '-')
+            md += f"| {row_key} | {' | '.join(cells)} |\n"
+        return md
+    
+    @staticmethod
+    def _cross_tab_columns(table: Dict[Any, Dict[Any, Dict[str, Any]]]) -> List[Any]:
+        """교차 통계의 열 값을 정렬된 목록으로 모읍니다 (정렬할 수 없으면 문자열 기준)."""
+        columns = []
+        for row in table.values():
+            for column in row:
+                if column not in columns:
+                    columns.append(column)
+        try:
+            columns.sort()
+        except TypeError:
+            columns.sort(key=str)
+        return columns
+    
+    @staticmethod
+    def _format_rating_cell(stats: Dict[str, Any]) -> str:
+        """그룹 통계 한 칸을 '평균 평점 (리뷰 수)' 문자열로 변환합니다."""
+        avg_rating = stats.get('평균평점', 'N/A')
+        review_count = stats.get('리뷰수', 0)
+        if isinstance(avg_rating, (int, float)):
+            return f"{avg_rating:.2f} ({review_count})"
+        return f"{avg_rating} ({review_count})"
+    
+    def _group_statistics_html(self, basic_stats: Dict[str, Any]) -> str:
+        """
+        열별 그룹 통계와 교차 통계를 HTML 표로 변환합니다 (Markdown 보고서와 같은 내용).
+        
+        Args:
+            basic_stats: 기본 통계 딕셔너리 (group_statistics, cross_tab_statistics 사용)
+            
+        Returns:
+            HTML 문자열 (통계가 없으면 빈 문자열)
+        """
+        content = ""
+        for column, group_stats in (basic_stats.get('group_statistics') or {}).items():
+            column_text = html.escape(str(column))
+            content += f"""
+        <h2>{column_text}별 통계</h2>
+        <table>
+            <tr><th>{column_text}</th><th>평균 평점</th><th>리뷰 수</th></tr>
+"""
+            for group, stats in group_stats.items():
+                avg_rating = stats.get('평균평점', 'N/A')
+                if isinstance(avg_rating, (int, float)):
+                    avg_rating = f"{avg_rating:.2f}"
+                content += (f"            <tr><td>{html.escape(str(group))}</td><td>{avg_rating}</td>"
+                            f"<td>{stats.get('리뷰수', 0)}</td></tr>\n")
+            content += "        </table>\n"
+        
+        for name, table in (basic_stats.get('cross_tab_statistics') or {}).items():
+            columns = self._cross_tab_columns(table)
+            header = ''.join(f"<th>{html.escape(str(column))}</th>" for column in columns)
+            content += f"""
+        <h2>{html.escape(str(name))} 교차 통계</h2>
+        <p>평균 평점(리뷰 수)입니다.</p>
+        <table>
+            <tr><th>{html.escape(name.split(' × ')[0])}</th>{header}</tr>
+"""
+            for row_key, row in table.items():
+                cells = ''.join(
+                    f"<td>{self._format_rating_cell(row[column]) if row.get(column) else '-'}</td>"
+                    for column in columns
+                )
+                content += f"            <tr><td>{html.escape(str(row_key))}</td>{cells}</tr>\n"
+            content += "        </table>\n"
+        return content
+    
     def generate_markdown_report(self, analysis_results: Dict[str, Any],
                                filename: str = None) -> str:
         """
@@ -78,7 +248,12 @@ class ReportGenerator:
 - **긍정 리뷰:** {sentiment_analysis['positive']} ({sentiment_analysis['positive_percentage']:.1f}%)
 - **부정 리뷰:** {sentiment_analysis['negative']} ({sentiment_analysis['negative_percentage']:.1f}%)
 - **중립 리뷰:** {sentiment_analysis['neutral']} ({sentiment_analysis['neutral_percentage']:.1f}%)
-
+"""
+            
+            for label, value in self._processing_lines(sentiment_analysis):
+                md_content += f"- **{label}:** {value}\n"
+            
+            md_content += """
 ### 긍정 키워드 분석
 
 긍정 리뷰에서 자주 언급된 주요 키워드와 관련 리뷰입니다.
@@ -89,7 +264,7 @@ class ReportGenerator:
             if positive_keywords:
                 for i, kw_data in enumerate(positive_keywords[:10], 1):
                     keyword = kw_data.get('keyword', 'N/A')
-                    count = kw_data.get('count', 0)
+                    count = self._format_keyword_count(kw_data)
                     reviews = kw_data.get('reviews', [])
                     
                     md_content += f"#### {i}. {keyword} (언급 횟수: {count})\n\n"
@@ -107,7 +282,7 @@ class ReportGenerator:
             if negative_keywords:
                 for i, kw_data in enumerate(negative_keywords[:10], 1):
                     keyword = kw_data.get('keyword', 'N/A')
-                    count = kw_data.get('count', 0)
+                    count = self._format_keyword_count(kw_data)
                     reviews = kw_data.get('reviews', [])
                     
                     md_content += f"#### {i}. {keyword} (언급 횟수: {count})\n\n"
@@ -167,6 +342,26 @@ class ReportGenerator:
                 else:
                     md_content += f"| {gender} | {avg_rating} |\n"
         
+        for column, group_stats in (basic_stats.get('group_statistics') or {}).items():
+            md_content += f"""
+---
+
+## {column}별 통계
+
+| {column} | 평균 평점 | 리뷰 수 |
+|--------|-----------|---------|
+"""
+            for group, stats in group_stats.items():
+                avg_rating = stats.get('평균평점', 'N/A')
+                review_count = stats.get('리뷰수', 0)
+                if isinstance(avg_rating, (int, float)):
+                    md_content += f"| {group} | {avg_rating:.2f} | {review_count} |\n"
+                else:
+                    md_content += f"| {group} | {avg_rating} | {review_count} |\n"
+        
+        for name, table in (basic_stats.get('cross_tab_statistics') or {}).items():
+            md_content += self._cross_tab_markdown(name, table)
+        
         md_content += """
 ---
 
@@ -349,6 +544,12 @@ class ReportGenerator:
             <p><strong>긍정 리뷰:</strong> {sentiment_analysis['positive']} ({sentiment_analysis['positive_percentage']:.1f}%)</p>
             <p><strong>부정 리뷰:</strong> {sentiment_analysis['negative']} ({sentiment_analysis['negative_percentage']:.1f}%)</p>
             <p><strong>중립 리뷰:</strong> {sentiment_analysis['neutral']} ({sentiment_analysis['neutral_percentage']:.1f}%)</p>
+"""
+            
+            for label, value in self._processing_lines(sentiment_analysis):
+                html_content += f"            <p><strong>{label}:</strong> {value}</p>\n"
+            
+            html_content += """
         </div>
         
         <h3>긍정 키워드 분석</h3>
@@ -359,7 +560,7 @@ class ReportGenerator:
             if positive_keywords:
                 for kw_data in positive_keywords[:10]:
                     keyword = kw_data.get('keyword', 'N/A')
-                    count = kw_data.get('count', 0)
+                    count = self._format_keyword_count(kw_data)
                     reviews = kw_data.get('reviews', [])
                     
                     html_content += f"""
@@ -388,7 +589,7 @@ class ReportGenerator:
             if negative_keywords:
                 for kw_data in negative_keywords[:10]:
                     keyword = kw_data.get('keyword', 'N/A')
-                    count = kw_data.get('count', 0)
+                    count = self._format_keyword_count(kw_data)
                     reviews = kw_data.get('reviews', [])
                     
                     html_content += f"""
@@ -408,6 +609,8 @@ class ReportGenerator:
             else:
                 html_content += "<p>키워드 정보가 없습니다.</p>"
         
+        html_content += self._group_statistics_html(basic_stats)
+        
         html_content += """
     </div>
 </body>
@@ -6,22 +6,68 @@ OpenAI API를 활용한 감정 및 후기 분석을 포함합니다.
 
 import pandas as pd
 import os
-from typing import Optional, List
+import sys
+import time
+import hashlib
+from typing import Optional, List, Tuple
 from column_detector import ColumnDetector
 from analyzer import ReviewAnalyzer
+from local_classifier import LexiconClassifier
+from data_loader import iter_dataframe_chunks, load_dataframe, StreamingStats
+from checkpoint import AnalysisJournal
 from report_generator import ReportGenerator
 
+# 저장소 루트의 공용 모듈(openai_common) 사용
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+from openai_common import BatchJobError, TokenBudgetExceeded, UsageTracker
+
 
 class ReviewReportGenerator:
     """고객 리뷰 데이터를 분석하고 보고서를 생성하는 메인 클래스"""
     
     def __init__(self, excel_file: str, output_dir: str = 'reports', 
-                 rating_column: str = '평점'):
+                 rating_column: str = '평점', max_workers: int = 8,
+                 requests_per_minute: Optional[int] = 500,
+                 tokens_per_minute: Optional[int] = 200000,
+                 batched: bool = True, use_cache: bool = True,
+                 local_threshold: Optional[float] = 0.6,
+                 streaming: bool = False, chunksize: int = 50000,
+                 resume: bool = False, keyword_engine: str = 'llm',
+                 group_by: Optional[List[str]] = None,
+                 cross_tabs: Optional[List[Tuple[str, ...]]] = None,
+                 run_token_budget: Optional[int] = None,
+                 call_token_budget: Optional[int] = None,
+                 batch_api: bool = False, batch_poll_interval: float = 30.0,
+                 batch_max_wait: Optional[float] = None):
         """
         Args:
-            excel_file: 분석할 엑셀 파일 경로
+            excel_file: 분석할 파일 경로 (.xlsx, .xls, .csv, .parquet, .feather)
             output_dir: 보고서를 저장할 디렉토리
             rating_column: 평점 컬럼명 (기본값: '평점')
+            max_workers: 동시에 진행할 최대 OpenAI API 요청 수
+            requests_per_minute: 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute: 분당 최대 토큰 수 (None이면 제한 없음)
+            batched: 여러 리뷰를 한 번의 요청으로 묶어 분석할지 여부
+            use_cache: 분석 결과 캐시 및 엑셀 파싱 결과의 컬럼형 캐시 사용 여부
+                (출력 디렉토리의 .cache 폴더에 저장)
+            local_threshold: 로컬 분류기로 확정할 최소 확신도 (None이면 로컬 분류 사용 안 함)
+            streaming: 파일 전체를 메모리에 올리지 않고 청크 단위로 읽어 분석할지 여부
+                (.xlsx, .csv, .parquet 지원)
+            chunksize: 스트리밍 모드에서 한 번에 읽을 행 수
+            resume: 이전에 중단된 분석의 체크포인트를 읽어 이미 분석한 리뷰를 건너뛸지 여부
+            keyword_engine: 키워드 추출 방식 ('llm', 'local', 'hybrid')
+            group_by: 그룹별 통계를 낼 컬럼 리스트 (None이면 노트북모델/연령대/성별)
+            cross_tabs: 교차 통계를 낼 컬럼 조합 리스트 (None이면 노트북모델 × 연령대)
+            run_token_budget: 이번 실행에서 사용할 최대 OpenAI 토큰 수
+                (None이면 환경 변수 OPENAI_RUN_TOKEN_BUDGET, 없으면 제한 없음)
+            call_token_budget: OpenAI 요청 하나의 최대 입력 토큰 수
+                (None이면 환경 변수 OPENAI_CALL_TOKEN_BUDGET, 없으면 제한 없음)
+            batch_api: OpenAI 요청을 Batch API로 모아 제출하는 오프라인 모드 사용 여부
+                (배치 파일과 제출 상태는 출력 디렉토리의 .batch 폴더에 저장)
+            batch_poll_interval: Batch API 상태를 확인하는 간격(초)
+            batch_max_wait: Batch API 결과를 기다릴 최대 시간(초) (None이면 완료될 때까지 대기)
         """
         if not os.path.exists(excel_file):
             raise FileNotFoundError(f"엑셀 파일을 찾을 수 없습니다: {excel_file}")
@@ -29,26 +75,71 @@ class ReviewReportGenerator:
         self.excel_file = excel_file
         self.output_dir = output_dir
         self.rating_column = rating_column
+        self.streaming = streaming
+        self.chunksize = chunksize
+        self.group_by = group_by
+        self.cross_tabs = cross_tabs
+        self.data_cache_dir = os.path.join(output_dir, '.cache', 'data') if use_cache else None
+        
+        # 체크포인트 저널 (입력 파일별로 출력 디렉토리의 .checkpoints 폴더에 저장)
+        file_hash = hashlib.sha1(os.path.abspath(excel_file).encode('utf-8')).hexdigest()[:12]
+        journal_path = os.path.join(
+            output_dir, '.checkpoints',
+            f"{os.path.splitext(os.path.basename(excel_file))[0]}_{file_hash}.jsonl"
+        )
+        self.journal = AnalysisJournal(journal_path, resume=resume)
+        
+        # OpenAI 토큰 예산 및 사용량 기록
+        self.usage = UsageTracker.from_env()
+        if run_token_budget is not None:
+            self.usage.run_token_budget = run_token_budget
+        if call_token_budget is not None:
+            self.usage.call_token_budget = call_token_budget
         
         # 모듈 초기화
         self.column_detector = ColumnDetector()
-        self.analyzer = ReviewAnalyzer()
+        self.analyzer = ReviewAnalyzer(
+            max_workers=max_workers,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            batched=batched,
+            cache_path=os.path.join(output_dir, '.cache', 'analysis_cache.sqlite3') if use_cache else None,
+            local_classifier=(
+                LexiconClassifier(confidence_threshold=local_threshold)
+                if local_threshold is not None else None
+            ),
+            journal=self.journal,
+            keyword_engine=keyword_engine,
+            group_dimensions=group_by,
+            cross_tabs=cross_tabs,
+            usage_tracker=self.usage,
+            batch_api=batch_api,
+            batch_dir=os.path.join(output_dir, '.batch'),
+            batch_poll_interval=batch_poll_interval,
+            batch_max_wait=batch_max_wait
+        )
         self.report_generator = ReportGenerator(output_dir)
         
         # 데이터 로드
         self.df = None
+        self.load_info = None
         self.review_column = None
         self.analysis_results = None
     
     def load_data(self) -> pd.DataFrame:
         """
         엑셀 파일을 로드합니다.
+        스트리밍 모드에서는 컬럼 감지에 사용할 첫 번째 청크만 로드합니다.
         
         Returns:
             로드된 데이터프레임
         """
         try:
-            self.df = pd.read_excel(self.excel_file)
+            if self.streaming:
+                self.df = next(iter_dataframe_chunks(self.excel_file, self.chunksize), pd.DataFrame())
+            else:
+                self.df, self.load_info = load_dataframe(self.excel_file, self.data_cache_dir)
+                print(f"데이터 로드: {self.load_info['load_seconds']:.2f}초 ({self.load_info['source']})")
             if self.df.empty:
                 raise ValueError("엑셀 파일이 비어있습니다.")
             return self.df
@@ -116,15 +207,69 @@ class ReviewReportGenerator:
         if self.review_column not in self.df.columns:
             raise ValueError(f"리뷰 컬럼 '{self.review_column}'을 찾을 수 없습니다.")
         
-        # 분석 수행
-        self.analysis_results = self.analyzer.analyze_all(
-            self.df, 
-            self.review_column, 
-            self.rating_column
-        )
+        # 분석 수행 (정상 종료 시에만 체크포인트 삭제)
+        try:
+            if self.streaming:
+                self.analysis_results = self._analyze_streaming()
+            else:
+                self.analysis_results = self.analyzer.analyze_all(
+                    self.df, 
+                    self.review_column, 
+                    self.rating_column
+                )
+        except BaseException:
+            self.journal.close()
+            print(f"분석이 중단되었습니다. 진행 상황이 저장되었습니다: {self.journal.path}")
+            print(self.usage.report())
+            raise
         
+        self.journal.close(remove=True)
         return self.analysis_results
     
+    def _analyze_streaming(self) -> dict:
+        """
+        파일을 청크 단위로 한 번 순회하며 기본 통계를 누적하고,
+        감정 분석에 필요한 리뷰/평점 컬럼만 모아서 분석합니다.
+        
+        기본 통계는 청크 크기만큼의 메모리로 계산하지만, 감정 분석은 중복 제거와 키워드 추출에
+        전체 리뷰가 필요하므로 리뷰 텍스트(빈 리뷰 제외)와 평점(float32)은 끝까지 메모리에 남습니다.
+        나머지 컬럼은 청크를 처리한 뒤 바로 버립니다.
+        
+        Returns:
+            분석 결과 딕셔너리
+        """
+        started = time.perf_counter()
+        stats = StreamingStats(rating_col=self.rating_column, dimensions=self.group_by,
+                               cross_tabs=self.cross_tabs)
+        review_parts = []
+        rating_parts = []
+        offset = 0
+        
+        for chunk in iter_dataframe_chunks(self.excel_file, self.chunksize):
+            chunk.index = range(offset, offset + len(chunk))
+            offset += len(chunk)
+            
+            stats.update(chunk)
+            chunk_reviews = chunk[self.review_column].dropna()
+            review_parts.append(chunk_reviews)
+            if self.rating_column in chunk.columns:
+                rating_parts.append(pd.to_numeric(chunk[self.rating_column].loc[chunk_reviews.index],
+                                                  errors='coerce').astype('float32'))
+            del chunk
+            print(f"읽은 행 수: {offset}")
+        
+        reviews = pd.concat(review_parts) if review_parts else pd.Series(dtype=object)
+        ratings = pd.concat(rating_parts) if rating_parts else None
+        self.load_info = {
+            'source': 'stream',
+            'load_seconds': round(time.perf_counter() - started, 3)
+        }
+        
+        return {
+            'basic_stats': stats.to_results(self.review_column),
+            'sentiment_analysis': self.analyzer.analyze_sentiment_and_reviews(reviews, ratings=ratings)
+        }
+    
     def generate_report(self, filename: Optional[str] = None) -> str:
         """
         Markdown 보고서를 생성합니다.
@@ -138,10 +283,16 @@ class ReviewReportGenerator:
         if self.analysis_results is None:
             self.analyze()
         
-        return self.report_generator.generate_markdown_report(
+        report_file = self.report_generator.generate_markdown_report(
             self.analysis_results, 
             filename
         )
+        
+        # 작업별 토큰/비용/지연 시간 집계를 보고서 옆에 저장
+        self.usage.save_report(
+            os.path.join(self.output_dir, f'openai_usage_{self.report_generator.timestamp}.json')
+        )
+        return report_file
     
     def get_summary(self) -> dict:
         """
@@ -165,11 +316,16 @@ class ReviewReportGenerator:
         if basic_stats.get('rating_stats'):
             summary['average_rating'] = basic_stats['rating_stats']['mean']
         
+        if self.load_info:
+            summary['load_seconds'] = self.load_info['load_seconds']
+            summary['load_source'] = self.load_info['source']
+        
         if sentiment_analysis:
             summary['sentiment'] = {
                 'positive': sentiment_analysis['positive'],
                 'negative': sentiment_analysis['negative'],
-                'neutral': sentiment_analysis['neutral']
+                'neutral': sentiment_analysis['neutral'],
+                'failed': sentiment_analysis.get('failed', 0)
             }
         
         return summary
@@ -193,7 +349,7 @@ if __name__ == '__main__':
     
     parser.add_argument(
         'excel_file',
-        help='분석할 엑셀 파일 경로'
+        help='분석할 파일 경로 (.xlsx, .xls, .csv, .parquet, .feather)'
     )
     
     parser.add_argument(
@@ -220,6 +376,127 @@ if __name__ == '__main__':
         help='생성할 보고서 파일명 (지정하지 않으면 자동 생성)'
     )
     
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=8,
+        help='동시에 진행할 최대 API 요청 수 (기본값: 8, 1이면 순차 실행)'
+    )
+    
+    parser.add_argument(
+        '--rpm',
+        type=int,
+        default=500,
+        help='분당 최대 API 요청 수 (기본값: 500, 0이면 제한 없음)'
+    )
+    
+    parser.add_argument(
+        '--tpm',
+        type=int,
+        default=200000,
+        help='분당 최대 토큰 수 (기본값: 200000, 0이면 제한 없음)'
+    )
+    
+    parser.add_argument(
+        '--no-batch',
+        action='store_true',
+        help='리뷰를 묶지 않고 리뷰마다 개별 API 요청으로 분석'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='이전 분석 결과 캐시를 사용하지 않고 모든 리뷰를 새로 분석'
+    )
+    
+    parser.add_argument(
+        '--local-threshold',
+        type=float,
+        default=0.6,
+        help='평점/키워드 기반 로컬 분류를 확정할 최소 확신도 (0~1, 기본값: 0.6)'
+    )
+    
+    parser.add_argument(
+        '--no-local',
+        action='store_true',
+        help='로컬 분류를 사용하지 않고 모든 리뷰를 OpenAI API로 분석'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='대용량 파일을 청크 단위로 읽어 메모리 사용량을 줄임 (.xlsx, .csv, .parquet, .feather). '
+             '기본 통계는 청크 단위로 누적하지만 감정 분석할 리뷰/평점 컬럼은 메모리에 모음'
+    )
+    
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=50000,
+        help='스트리밍 모드에서 한 번에 읽을 행 수 (기본값: 50000)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='이전에 중단된 분석의 체크포인트를 읽어 이미 분석한 리뷰를 건너뜀'
+    )
+    
+    parser.add_argument(
+        '--keywords',
+        choices=['llm', 'local', 'hybrid'],
+        default='llm',
+        help='키워드 추출 방식: llm(OpenAI), local(API 없이 n-gram 집계), hybrid(둘을 합쳐 순위) (기본값: llm)'
+    )
+    
+    parser.add_argument(
+        '--group-by',
+        nargs='+',
+        metavar='COLUMN',
+        help='그룹별 통계를 낼 컬럼 (기본값: 노트북모델 연령대 성별)'
+    )
+    
+    parser.add_argument(
+        '--cross-tab',
+        action='append',
+        metavar='A:B',
+        help='교차 통계를 낼 컬럼 조합, 여러 번 지정 가능 (기본값: 노트북모델:연령대)'
+    )
+    
+    parser.add_argument(
+        '--token-budget',
+        type=int,
+        default=None,
+        help='이번 실행에서 사용할 최대 OpenAI 토큰 수, 넘으면 분석을 중단하고 체크포인트 저장 (기본값: 제한 없음)'
+    )
+    
+    parser.add_argument(
+        '--call-token-budget',
+        type=int,
+        default=None,
+        help='OpenAI 요청 하나의 최대 입력 토큰 수 (기본값: 제한 없음)'
+    )
+    
+    parser.add_argument(
+        '--batch-api',
+        action='store_true',
+        help='OpenAI 요청을 Batch API로 모아 제출하고 완료될 때까지 기다림 (야간 작업용, 처리 한도가 크고 비용 절반, 최대 24시간 소요)'
+    )
+    
+    parser.add_argument(
+        '--batch-poll-interval',
+        type=float,
+        default=30.0,
+        help='Batch API 상태를 확인하는 간격(초) (기본값: 30)'
+    )
+    
+    parser.add_argument(
+        '--batch-max-wait',
+        type=float,
+        default=None,
+        help='Batch API 결과를 기다릴 최대 시간(초), 넘으면 중단하고 다시 실행 시 이어서 기다림 (기본값: 제한 없음)'
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -233,7 +510,24 @@ if __name__ == '__main__':
         generator = ReviewReportGenerator(
             excel_file=args.excel_file,
             output_dir=args.output,
-            rating_column=args.rating_column
+            rating_column=args.rating_column,
+            max_workers=args.workers,
+            requests_per_minute=args.rpm or None,
+            tokens_per_minute=args.tpm or None,
+            batched=not args.no_batch,
+            use_cache=not args.no_cache,
+            local_threshold=None if args.no_local else args.local_threshold,
+            streaming=args.stream,
+            chunksize=args.chunksize,
+            resume=args.resume,
+            keyword_engine=args.keywords,
+            group_by=args.group_by,
+            cross_tabs=[tuple(spec.split(':')) for spec in args.cross_tab] if args.cross_tab else None,
+            run_token_budget=args.token_budget,
+            call_token_budget=args.call_token_budget,
+            batch_api=args.batch_api,
+            batch_poll_interval=args.batch_poll_interval,
+            batch_max_wait=args.batch_max_wait
         )
         
         # 리뷰 컬럼 감지
@@ -263,6 +557,8 @@ if __name__ == '__main__':
         print(f"\n분석 요약:")
         print(f"  총 리뷰 수: {summary['total_reviews']}")
         print(f"  리뷰 컬럼: {summary['review_column']}")
+        if 'load_seconds' in summary:
+            print(f"  데이터 로드: {summary['load_seconds']:.2f}초 ({summary['load_source']})")
         if 'average_rating' in summary:
             print(f"  평균 평점: {summary['average_rating']:.2f}")
         if 'sentiment' in summary:
@@ -270,8 +566,19 @@ if __name__ == '__main__':
             print(f"    - 긍정: {summary['sentiment']['positive']}개")
             print(f"    - 부정: {summary['sentiment']['negative']}개")
             print(f"    - 중립: {summary['sentiment']['neutral']}개")
+            if summary['sentiment']['failed']:
+                print(f"    - 분석 실패: {summary['sentiment']['failed']}개")
+        print()
+        print(generator.usage.report())
         print("\n" + "=" * 60)
         
+    except TokenBudgetExceeded as e:
+        print(f"\n오류: {e}", file=sys.stderr)
+        print("예산을 늘린 뒤 --resume 옵션으로 이어서 분석할 수 있습니다.", file=sys.stderr)
+        sys.exit(1)
+    except BatchJobError as e:
+        print(f"\n오류: {e}", file=sys.stderr)
+        sys.exit(1)
     except FileNotFoundError as e:
         print(f"\n오류: {e}", file=sys.stderr)
         sys.exit(1)
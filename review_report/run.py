@@ -3,6 +3,7 @@
 """
 간단한 실행 스크립트
 엑셀 파일을 드래그 앤 드롭하거나 경로를 입력하여 실행할 수 있습니다.
+중단된 분석은 --resume 옵션으로 이어서 진행할 수 있습니다.
 """
 
 import sys
@@ -18,9 +19,13 @@ def main():
     print("고객 리뷰 분석 보고서 생성기")
     print("=" * 60)
     
+    # --resume: 이전에 중단된 분석을 이어서 진행
+    resume = '--resume' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--resume']
+    
     # 명령줄 인자가 있으면 사용
-    if len(sys.argv) > 1:
-        excel_file = sys.argv[1]
+    if args:
+        excel_file = args[0]
     else:
         # 사용자 입력 받기
         excel_file = input("\n엑셀 파일 경로를 입력하세요: ").strip().strip('"').strip("'")
@@ -38,7 +43,9 @@ def main():
         print("분석을 시작합니다...\n")
         
         # 보고서 생성기 초기화
-        generator = ReviewReportGenerator(excel_file=excel_file)
+        generator = ReviewReportGenerator(excel_file=excel_file, resume=resume)
+        if resume:
+            print("이전 체크포인트에서 이어서 분석합니다.")
         
         # 리뷰 컬럼 자동 감지
         print("리뷰 컬럼 자동 감지 중...")
@@ -63,6 +70,8 @@ def main():
         print(f"\n분석 요약:")
         print(f"  총 리뷰 수: {summary['total_reviews']}")
         print(f"  리뷰 컬럼: {summary['review_column']}")
+        if 'load_seconds' in summary:
+            print(f"  데이터 로드: {summary['load_seconds']:.2f}초 ({summary['load_source']})")
         if 'average_rating' in summary:
             print(f"  평균 평점: {summary['average_rating']:.2f}")
         if 'sentiment' in summary:
@@ -0,0 +1,45 @@
+"""
+OpenAI 응답 형식 모듈
+리뷰 분석과 키워드 추출 요청의 구조화된 출력(Structured Outputs) 스키마를 pydantic 모델로 정의합니다.
+요청에는 이 모델에서 만든 strict JSON 스키마를 보내고, 응답은 같은 모델로 검증합니다.
+"""
+
+from typing import List, Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ReviewAnalysis(BaseModel):
+    """리뷰 하나의 감정 분석 결과"""
+    model_config = ConfigDict(extra='forbid')
+
+    sentiment: Literal['positive', 'negative', 'neutral']
+    summary: str
+
+
+class IndexedReviewAnalysis(ReviewAnalysis):
+    """묶음 요청 안에서 리뷰 번호가 붙은 감정 분석 결과"""
+    index: int
+
+
+class ReviewBatchAnalysis(BaseModel):
+    """여러 리뷰를 한 번에 분석한 묶음 요청의 응답"""
+    model_config = ConfigDict(extra='forbid')
+
+    results: List[IndexedReviewAnalysis]
+
+
+class KeywordItem(BaseModel):
+    """키워드 하나와 관련 리뷰"""
+    model_config = ConfigDict(extra='forbid')
+
+    keyword: str
+    count: int
+    reviews: List[str]
+
+
+class KeywordExtraction(BaseModel):
+    """리뷰 묶음 하나에서 추출한 키워드 후보"""
+    model_config = ConfigDict(extra='forbid')
+
+    keywords: List[KeywordItem]
@@ -0,0 +1,255 @@
+"""
+그룹별 통계 계산 모듈
+그룹 컬럼의 값을 정수 코드로 바꾼 뒤 NumPy bincount로 리뷰 수/평점 개수/평점 합계를 한 번에 집계합니다.
+그룹 컬럼이나 교차 통계(예: 모델 × 연령대)를 추가해도 그룹 수만큼의 배열만 더 필요합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 기존 보고서 형식과 호환되는 그룹 컬럼과 결과 키
+DEFAULT_DIMENSIONS = {
+    '노트북모델': 'model_statistics',
+    '연령대': 'age_statistics',
+    '성별': 'gender_statistics'
+}
+
+# 리뷰 수도 함께 표시하는 그룹 컬럼 (나머지는 평균 평점만 표시)
+COUNTED_DIMENSIONS = {'노트북모델'}
+
+DEFAULT_CROSS_TABS = [('노트북모델', '연령대')]
+
+
+def cross_tab_name(columns: Sequence[str]) -> str:
+    """교차 통계의 표시 이름을 만듭니다 (예: '노트북모델 × 연령대')."""
+    return ' × '.join(columns)
+
+
+class GroupStatsEngine:
+    """평점 통계와 그룹별/교차 통계를 벡터 연산으로 계산하는 클래스"""
+
+    def __init__(self, rating_col: str = '평점',
+                 dimensions: Optional[List[str]] = None,
+                 cross_tabs: Optional[List[Tuple[str, ...]]] = None):
+        """
+        Args:
+            rating_col: 평점 컬럼명
+            dimensions: 그룹별 통계를 낼 컬럼 리스트 (None이면 노트북모델/연령대/성별)
+            cross_tabs: 교차 통계를 낼 컬럼 조합 리스트 (None이면 노트북모델 × 연령대)
+        """
+        self.rating_col = rating_col
+        self.dimensions = list(dimensions) if dimensions is not None else list(DEFAULT_DIMENSIONS)
+        self.cross_tabs = [tuple(columns) for columns in
+                           (cross_tabs if cross_tabs is not None else DEFAULT_CROSS_TABS)]
+
+    @staticmethod
+    def _encode(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        그룹 값을 0부터 시작하는 정수 코드로 변환합니다. 결측값은 -1입니다.
+
+        Returns:
+            (코드 배열, 코드 순서대로 정렬된 그룹 값 배열)
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy(), values.cat.categories.to_numpy()
+        try:
+            codes, uniques = pd.factorize(values, sort=True)
+        except TypeError:
+            # 문자열과 숫자가 섞여 정렬할 수 없으면 등장 순서 사용
+            codes, uniques = pd.factorize(values)
+        return codes, np.asarray(uniques)
+
+    def aggregate(self, df: pd.DataFrame,
+                  ratings: Optional[pd.Series] = None) -> Dict[Tuple[str, ...], Dict[Tuple, List[float]]]:
+        """
+        그룹별/교차 조합별 [리뷰 수, 평점 개수, 평점 합계]를 계산합니다.
+        청크 단위로 호출한 결과를 더하면 전체 결과와 같습니다.
+
+        Args:
+            df: 데이터프레임 (수정하지 않음)
+            ratings: 숫자로 변환된 평점 시리즈 (None이면 평점 없이 리뷰 수만 계산)
+
+        Returns:
+            {그룹 컬럼 튜플: {그룹 값 튜플: [리뷰 수, 평점 개수, 평점 합계]}}
+        """
+        groupings = [(column,) for column in self.dimensions]
+        groupings += [columns for columns in self.cross_tabs if len(columns) > 1]
+        groupings = [columns for columns in groupings if set(columns).issubset(df.columns)]
+        needed = {column for columns in groupings for column in columns}
+
+        if ratings is not None:
+            values = ratings.to_numpy(dtype=float, na_value=np.nan)
+            valid = ~np.isnan(values)
+            filled = np.where(valid, values, 0.0)
+        else:
+            valid = filled = None
+
+        # 컬럼별 인코딩은 한 번만 수행하고 그룹별/교차 통계에서 재사용
+        encoded = {column: self._encode(df[column]) for column in needed}
+
+        results = {}
+        for columns in groupings:
+            present = np.ones(len(df), dtype=bool)
+            for column in columns:
+                present &= encoded[column][0] >= 0
+
+            # 컬럼을 하나씩 더할 때마다 실제로 나타난 조합만 다시 번호를 매겨
+            # 배열 크기가 카디널리티의 곱이 아닌 관측된 그룹 수에 맞춰지도록 함
+            codes = np.zeros(int(present.sum()), dtype=np.int64)
+            members = np.zeros((1, 0), dtype=np.int64)  # 그룹 번호별 컬럼 인코딩 값
+            for column in columns:
+                column_codes, uniques = encoded[column]
+                combined = codes * len(uniques) + column_codes[present]
+                observed, codes = np.unique(combined, return_inverse=True)
+                codes = codes.reshape(-1)
+                members = np.column_stack([members[observed // len(uniques)], observed % len(uniques)])
+
+            size = len(members)
+            sizes = np.bincount(codes, minlength=size)
+            if valid is not None:
+                counts = np.bincount(codes, weights=valid[present], minlength=size)
+                sums = np.bincount(codes, weights=filled[present], minlength=size)
+            else:
+                counts = sums = np.zeros(size)
+
+            groups = {}
+            for code, indices in enumerate(members):
+                key = []
+                for column, index in zip(columns, indices):
+                    value = encoded[column][1][index]
+                    key.append(value.item() if isinstance(value, np.generic) else value)
+                groups[tuple(key)] = [int(sizes[code]), int(counts[code]), float(sums[code])]
+            results[columns] = groups
+
+        return results
+
+    @staticmethod
+    def merge_groups(target: Dict[Tuple[str, ...], Dict[Tuple, List[float]]],
+                     other: Dict[Tuple[str, ...], Dict[Tuple, List[float]]]):
+        """
+        aggregate 결과 other를 target에 더합니다.
+
+        Args:
+            target: 누적 중인 집계 결과 (제자리에서 수정됨)
+            other: 더할 집계 결과
+        """
+        for columns, groups in other.items():
+            acc = target.setdefault(columns, {})
+            for key, (size, count, total) in groups.items():
+                entry = acc.setdefault(key, [0, 0, 0.0])
+                entry[0] += size
+                entry[1] += count
+                entry[2] += total
+
+    def format_groups(self, groups: Dict[Tuple[str, ...], Dict[Tuple, List[float]]],
+                      has_rating: bool) -> Dict[str, Any]:
+        """
+        집계 결과를 보고서용 딕셔너리로 변환합니다.
+        기본 그룹 컬럼은 기존 결과 키(model_statistics 등)에, 그 밖의 컬럼은
+        group_statistics에, 교차 통계는 cross_tab_statistics에 담습니다.
+
+        Args:
+            groups: aggregate 결과
+            has_rating: 평점 컬럼 존재 여부
+
+        Returns:
+            결과 딕셔너리 조각
+        """
+        results = {}
+
+        for columns, acc in groups.items():
+            stats = {}
+            for key, (size, count, total) in acc.items():
+                label = key[0] if len(columns) == 1 else key
+                if has_rating:
+                    mean = float(np.round(total / count, 2)) if count else float('nan')
+                    stats[label] = {'평균평점': mean}
+                    if len(columns) > 1 or columns[0] not in DEFAULT_DIMENSIONS \
+                            or columns[0] in COUNTED_DIMENSIONS:
+                        stats[label]['리뷰수'] = count
+                else:
+                    stats[label] = {'리뷰수': size}
+
+            sort_field = '평균평점' if has_rating else '리뷰수'
+            if len(columns) == 1 and columns[0] in COUNTED_DIMENSIONS:
+                ordered = sorted(stats.items(), key=lambda item: item[1][sort_field], reverse=True)
+            else:
+                ordered = self._sorted_by_key(stats.items())
+
+            if len(columns) == 1 and columns[0] in DEFAULT_DIMENSIONS:
+                results[DEFAULT_DIMENSIONS[columns[0]]] = dict(ordered)
+            elif len(columns) == 1:
+                results.setdefault('group_statistics', {})[columns[0]] = dict(ordered)
+            else:
+                # 첫 번째 컬럼 값 → 나머지 컬럼 값 조합 순으로 중첩
+                table: Dict[Any, Dict[Any, Dict[str, float]]] = {}
+                for key, value in ordered:
+                    inner_key = key[1] if len(key) == 2 else ' / '.join(str(part) for part in key[1:])
+                    table.setdefault(key[0], {})[inner_key] = value
+                results.setdefault('cross_tab_statistics', {})[cross_tab_name(columns)] = table
+
+        return results
+
+    @staticmethod
+    def _sorted_by_key(items) -> List[Tuple[Any, Any]]:
+        """그룹 값 기준으로 정렬합니다 (정렬할 수 없는 값이 섞여 있으면 문자열 기준)."""
+        items = list(items)
+        try:
+            return sorted(items, key=lambda item: item[0])
+        except TypeError:
+            return sorted(items, key=lambda item: str(item[0]))
+
+    def rating_summary(self, ratings: pd.Series) -> Dict[str, Any]:
+        """
+        평점 통계, 분포, 비율을 계산합니다.
+
+        Args:
+            ratings: 숫자로 변환된 평점 시리즈
+
+        Returns:
+            rating_stats, rating_distribution, rating_percentage를 담은 딕셔너리
+        """
+        values = ratings.to_numpy(dtype=float, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return {'rating_stats': None, 'rating_distribution': None, 'rating_percentage': None}
+
+        codes, uniques = pd.factorize(values, sort=True)
+        counts = np.bincount(codes, minlength=len(uniques))
+        total = len(values)
+
+        return {
+            'rating_stats': {
+                'mean': float(values.mean()),
+                'median': float(np.median(values)),
+                'std': float(values.std(ddof=1)) if total > 1 else float('nan'),
+                'min': int(uniques[0]),
+                'max': int(uniques[-1])
+            },
+            'rating_distribution': {int(k): int(v) for k, v in zip(uniques, counts)},
+            'rating_percentage': {int(k): round(v / total * 100, 2) for k, v in zip(uniques, counts)}
+        }
+
+    def compute(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        평점 통계와 그룹별/교차 통계를 계산합니다.
+
+        Args:
+            df: 데이터프레임 (수정하지 않음)
+
+        Returns:
+            평점 통계 및 그룹별 통계 딕셔너리
+        """
+        has_rating = self.rating_col in df.columns
+        ratings = pd.to_numeric(df[self.rating_col], errors='coerce') if has_rating else None
+
+        if has_rating:
+            results = self.rating_summary(ratings)
+        else:
+            results = {'rating_stats': None, 'rating_distribution': None, 'rating_percentage': None}
+
+        results.update(self.format_groups(self.aggregate(df, ratings), has_rating))
+        return results
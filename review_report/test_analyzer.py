@@ -0,0 +1,46 @@
+"""
+ReviewAnalyzer 요청 경로 테스트
+일시적인 오류로 재시도되는 요청도 매 시도마다 속도 제한 예산을 다시 확보하는지 확인합니다.
+
+    python -m pytest review_report
+"""
+
+import openai
+from openai.types.chat import ChatCompletion
+
+from analyzer import ReviewAnalyzer
+from openai_common import RetryPolicy, UsageTracker
+
+
+class FlakyCompletions:
+    """처음 failures번은 연결 오류를 내고 그다음부터 응답하는 chat.completions 대역"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def create(self, model, messages, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise openai.APIConnectionError(request=None)
+        return ChatCompletion.model_validate({
+            'id': 'chatcmpl-test', 'object': 'chat.completion', 'created': 0, 'model': model,
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': 'ok'}}],
+            'usage': {'prompt_tokens': 10, 'completion_tokens': 2, 'total_tokens': 12}
+        })
+
+
+def test_retries_go_through_rate_limiter(monkeypatch):
+    usage = UsageTracker(retry_policy=RetryPolicy(max_retries=3, base_delay=0.0))
+    analyzer = ReviewAnalyzer(api_key='test-key', usage_tracker=usage)
+    completions = FlakyCompletions(failures=2)
+    monkeypatch.setattr(analyzer.client, 'chat', type('Chat', (), {'completions': completions})())
+    acquired = []
+    monkeypatch.setattr(analyzer.rate_limiter, 'acquire', lambda tokens=0: acquired.append(tokens))
+
+    response = analyzer._create_chat_completion([{'role': 'user', 'content': '좋아요'}], max_tokens=20)
+
+    assert response.choices[0].message.content == 'ok'
+    assert completions.calls == 3
+    assert len(acquired) == 3 and len(set(acquired)) == 1
@@ -0,0 +1,56 @@
+"""
+로컬 감정 분류 테스트
+감정 키워드가 있는 명확한 리뷰만 로컬에서 분류하고, 평점만 높거나 낮은 리뷰는 OpenAI 분석으로 넘기는지 확인합니다.
+
+    python -m pytest review_report
+"""
+
+import pandas as pd
+import pytest
+
+from analyzer import ReviewAnalyzer
+from local_classifier import LexiconClassifier
+
+
+@pytest.fixture
+def classifier():
+    return LexiconClassifier()
+
+
+def test_rating_without_lexicon_hits_is_not_decided_locally(classifier):
+    scored = classifier.score("배송 받았습니다", 5)
+
+    assert scored['positive_hits'] == scored['negative_hits'] == 0
+    assert scored['confidence'] == 0
+    assert classifier.classify("배송 받았습니다", 5) is None
+    assert classifier.classify("오늘 도착", 1) is None
+
+
+def test_rating_with_agreeing_keywords_is_classified_locally(classifier):
+    positive = classifier.classify("화면이 깔끔하고 만족합니다", 5)
+    negative = classifier.classify("불량이라 환불했어요", 1)
+
+    assert positive['sentiment'] == 'positive'
+    assert negative['sentiment'] == 'negative'
+    # 요약 자리에는 리뷰 원문이 아닌 로컬 분류 근거를 남김
+    assert positive['summary'] == "(로컬 분류: 평점 5점, 긍정 표현 2개, 부정 표현 0개)"
+    assert "불량" not in negative['summary']
+
+
+def test_rating_only_review_goes_to_openai(monkeypatch):
+    analyzer = ReviewAnalyzer(api_key='test-key', local_classifier=LexiconClassifier())
+    sent = []
+
+    def fake_analyze_reviews(reviews, progress_every=10):
+        sent.extend(reviews)
+        return [{'sentiment': 'neutral', 'summary': 'API 분석'} for _ in reviews]
+
+    monkeypatch.setattr(analyzer, '_analyze_reviews', fake_analyze_reviews)
+    reviews = pd.Series(["배송 받았습니다", "정말 만족해요 최고", "환불 요청합니다 최악"])
+    ratings = pd.Series([5, 5, 1])
+
+    result = analyzer.analyze_sentiment_and_reviews(reviews, ratings, extract_keywords=False)
+
+    assert sent == ["배송 받았습니다"]
+    assert result['tier_counts'] == {'local': 2, 'llm': 1}
+    assert [item['sentiment'] for item in result['review_summaries']] == ['neutral', 'positive', 'negative']
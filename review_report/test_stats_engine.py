@@ -0,0 +1,32 @@
+"""
+그룹별/교차 통계 집계 테스트
+카디널리티가 큰 컬럼을 교차해도 관측된 그룹 수만큼만 집계하고 pandas groupby와 같은 결과를 내는지 확인합니다.
+
+    python -m pytest review_report
+"""
+
+import numpy as np
+import pandas as pd
+
+from stats_engine import GroupStatsEngine
+
+
+def test_high_cardinality_cross_tab_matches_groupby():
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        '판매자': rng.integers(0, 10 ** 6, n),
+        '상품': rng.integers(0, 10 ** 6, n),
+        '옵션': rng.integers(0, 10 ** 6, n),
+        '색상': rng.choice(['검정', '흰색', None], n),
+        '평점': np.where(rng.random(n) < 0.1, np.nan, rng.integers(1, 6, n))
+    })
+    columns = ('판매자', '상품', '옵션', '색상')
+    engine = GroupStatsEngine('평점', [], [columns])
+
+    groups = engine.aggregate(df, df['평점'])[columns]
+
+    expected = df.dropna(subset=['색상']).groupby(list(columns))['평점'].agg(['size', 'count', 'sum'])
+    assert len(groups) == len(expected)
+    for key, (size, count, total) in expected.iterrows():
+        assert groups[key] == [size, count, total]
@@ -4,11 +4,20 @@ Extracts subtitles from YouTube videos using youtube-transcript-api with proxy s
 """
 
 import os
+import sys
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api.proxies import WebshareProxyConfig
-from openai import OpenAI
+
+# Use the shared OpenAI helpers (openai_common) at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openai_common import TokenBudgetExceeded, UsageTracker, get_client
+
+# Token budgets and per-run usage/cost/latency accounting
+# (set OPENAI_RUN_TOKEN_BUDGET / OPENAI_CALL_TOKEN_BUDGET to enforce budgets)
+usage_tracker = UsageTracker.from_env()
 
 
 def extract_video_id(url: str) -> str:
@@ -45,7 +54,7 @@ def detect_multilingual(text: str) -> bool:
     return has_korean and has_english
 
 
-def check_spelling_with_gpt(text: str, api_key: str, language: str = "ko") -> str:
+def check_spelling_with_gpt(text: str, api_key: str, language: str = "ko") -> Optional[str]:
     """
     Check spelling and grammar of text using GPT model with language-specific formatting.
     Handles multilingual text (e.g., Korean + English) by correcting each language separately.
@@ -56,9 +65,11 @@ def check_spelling_with_gpt(text: str, api_key: str, language: str = "ko") -> st
         language: Language code (e.g., 'ko', 'en')
     
     Returns:
-        Corrected text with proper paragraph breaks
+        Corrected text with proper paragraph breaks, or None if the check failed
+        (transient API errors are retried with backoff before giving up)
     """
-    client = OpenAI(api_key=api_key)
+    # Shared client: reuses pooled connections and retries 429/5xx with backoff
+    client = get_client(api_key)
     
     # Check if text is multilingual (Korean + English)
     is_multilingual = detect_multilingual(text)
@@ -104,7 +115,9 @@ Text:
 {text}"""
     
     try:
-        response = client.chat.completions.create(
+        response = usage_tracker.create_chat_completion(
+            client,
+            "spelling",
             model="gpt-4o-mini",
             messages=[
                 {
@@ -119,12 +132,19 @@ Text:
             temperature=0.3
         )
         
+        if response.choices[0].finish_reason == "length":
+            print("Warning: the corrected transcript hit the output token limit and is incomplete.")
+        
         corrected_text = response.choices[0].message.content.strip()
         return corrected_text
     
+    except TokenBudgetExceeded as e:
+        print(f"Skipping spelling check: {e}")
+        return None
     except Exception as e:
+        # Do not pass the original text off as a corrected transcript
         print(f"Error during spelling check: {e}")
-        return text  # 오류 발생 시 원본 텍스트 반환
+        return None
 
 
 def main():
@@ -230,7 +250,7 @@ def main():
         print("CORRECTED TRANSCRIPT")
         print("=" * 80)
         print()
-        print(corrected_text)
+        print(corrected_text if corrected_text is not None else "(Spelling check failed; no corrected transcript)")
         print()
         print("=" * 80)
         
@@ -245,12 +265,17 @@ def main():
             f.write(f"**Total Snippets:** {len(transcript_data.snippets)}\n\n")
             f.write(f"---\n\n")
             f.write(f"## Corrected Transcript\n\n")
-            f.write(corrected_text)
+            if corrected_text is not None:
+                f.write(corrected_text)
+            else:
+                f.write("_Spelling check failed; see the original transcript below._")
             f.write(f"\n\n---\n\n")
             f.write(f"## Original Transcript\n\n")
             f.write(full_text)
         
         print(f"\n✅ Transcript saved to: {output_filename}")
+        print()
+        print(usage_tracker.report())
         
     except Exception as e:
         print(f"Error extracting transcript: {e}")